@@ -0,0 +1,133 @@
+"""
+Compare the 'per_variant' and 'combined' adaptation strategies against a mocked provider.
+
+The mock answers like an OpenAI-compatible chat completion, with the same replies
+as benchmarks/llm_stub_server.py (one adapted object, or one per requested variant
+for combined prompts). It reports token usage from the prompt and reply sizes and
+sleeps for a simulated latency of ``--base-latency`` plus prefill and generation
+time. ``--malformed`` makes that share of replies unparseable. For each strategy
+the harness reports calls, prompt/completion tokens, wall time per document and
+how many variants fell back to the original content.
+
+    python benchmarks/bench_adaptation_strategies.py --documents 5 --items 20
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENAI_API_KEY', 'dummy-key-for-testing')
+# A scratch database: adaptations must never reach the real content database
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='cms-strategy-bench-'), 'bench.db')
+
+import cms_backend_v2 as cms  # noqa: E402
+from bench_json_path import hotel_payload, tour_payload  # noqa: E402
+from llm_stub_server import build_reply  # noqa: E402
+
+
+class MockCompletions:
+    """Stand-in for ``client.chat.completions`` with a simple latency and failure model"""
+
+    def __init__(self, base_latency: float, prefill_tps: float, output_tps: float, malformed: float, seed: int):
+        self.base_latency = base_latency
+        self.prefill_tps = prefill_tps
+        self.output_tps = output_tps
+        self.malformed = malformed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.malformed_replies = 0
+
+    def create(self, model, messages, max_tokens=None, temperature=None, **kwargs):
+        prompt = ''.join(message['content'] for message in messages)
+        text = '```json\n' + json.dumps(build_reply(prompt)) + '\n```'
+
+        with self.lock:
+            self.calls += 1
+            broken = self.random.random() < self.malformed
+            if broken:
+                self.malformed_replies += 1
+        if broken:
+            text = text[:len(text) // 2]
+
+        prompt_tokens = cms.estimate_tokens(prompt)
+        completion_tokens = cms.estimate_tokens(text)
+        time.sleep(self.base_latency + prompt_tokens / self.prefill_tps + completion_tokens / self.output_tps)
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text), finish_reason='stop')],
+            usage=types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                        total_tokens=prompt_tokens + completion_tokens)
+        )
+
+
+usage = {'prompt_tokens': 0, 'completion_tokens': 0}
+
+
+def count_tokens(event: str, details: dict):
+    if event == 'success':
+        for key in usage:
+            usage[key] += getattr(details['response'].usage, key)
+
+
+def run(strategy: str, documents, args) -> dict:
+    completions = MockCompletions(args.base_latency, args.prefill_tps, args.output_tps, args.malformed, args.seed)
+    cms.llm_gateway.client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    cms.app.config['ADAPTATION_STRATEGY'] = strategy
+
+    usage.update(prompt_tokens=0, completion_tokens=0)
+    fallbacks = 0
+    start = time.perf_counter()
+    with cms.app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        for model_class, payload in documents:
+            original = model_class(**payload)
+            variants = cms.ContentAdaptationService.generate_all_adaptive_content(original, model_class)
+            fallbacks += sum(1 for content in variants.values() if content == original.model_dump())
+    elapsed = time.perf_counter() - start
+    return {
+        'calls': completions.calls,
+        'malformed': completions.malformed_replies,
+        'fallbacks': fallbacks,
+        'ms_per_doc': elapsed / len(documents) * 1000,
+        **usage
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--documents', type=int, default=5, help='documents per content type')
+    parser.add_argument('--items', type=int, default=20, help='entries per dict/list field')
+    parser.add_argument('--base-latency', type=float, default=0.3, help='seconds per call before any tokens')
+    parser.add_argument('--prefill-tps', type=float, default=20000, help='prompt tokens processed per second')
+    parser.add_argument('--output-tps', type=float, default=2000, help='completion tokens generated per second')
+    parser.add_argument('--malformed', type=float, default=0.05, help='share of replies that are cut off')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Every document must reach the LLM: no whole-document or per-string reuse
+    cms.app.config['ADAPTATION_CACHE_ENABLED'] = False
+    cms.app.config['TRANSLATION_MEMORY_ENABLED'] = False
+    with cms.app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        cms.migrate_schema()
+    cms.llm_gateway.add_listener(count_tokens)
+    documents = [(cms.HotelContentModel, hotel_payload(args.items)) for _ in range(args.documents)]
+    documents += [(cms.TourContentModel, tour_payload(args.items)) for _ in range(args.documents)]
+    variants = len(documents) * len(cms.DisabilityType)
+
+    print(f"{len(documents)} documents x {len(cms.DisabilityType)} variants, {args.malformed:.0%} malformed replies")
+    print(f"{'strategy':<14}{'calls':>7}{'prompt tok':>12}{'compl tok':>11}{'ms/doc':>9}{'malformed':>11}{'fallbacks':>11}")
+    for strategy in ('per_variant', 'combined'):
+        result = run(strategy, documents, args)
+        print(f"{strategy:<14}{result['calls']:>7}{result['prompt_tokens']:>12}{result['completion_tokens']:>11}"
+              f"{result['ms_per_doc']:>9.0f}{result['malformed']:>11}{result['fallbacks']:>7}/{variants}")
+
+
+if __name__ == '__main__':
+    main()
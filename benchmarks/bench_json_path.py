@@ -0,0 +1,97 @@
+"""
+Benchmark the JSON request/response path of the CMS backend on large payloads.
+
+Compares the classic path (json.loads -> Model(**data) -> .dict() -> stdlib
+json.dumps, as Flask's default provider does) with the fast path used when
+JSON_FAST_PATH is on (Model.model_validate_json(raw bytes) -> model_dump ->
+native encoder), and reports CPU time per request for hotel and tour payloads.
+
+    python benchmarks/bench_json_path.py --items 300 --iterations 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENAI_API_KEY', 'dummy-key-for-testing')
+
+import cms_backend_v2 as cms  # noqa: E402
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def hotel_payload(items: int) -> dict:
+    return {
+        'name': 'Hotel Bellevue Palace',
+        'location': 'Kochergasse 3-5, 3011 Bern',
+        'coordinates': '46.9466,7.4446',
+        'prices': {f'room_{i}': 180 + i for i in range(items)},
+        'accessibility_features': {f'feature_{i}': f'Step-free access to area {i} with a 90 cm wide door' for i in range(items)},
+        'images': [f'https://example.com/hotel/{i}.jpg' for i in range(items)],
+        'cancellation_conditions': 'Free cancellation up to 48 hours before arrival. ' * 10,
+        'meal_times': {f'meal_{i}': '07:00-10:30' for i in range(items // 10 or 1)},
+        'parking': 'Accessible parking spaces next to the main entrance',
+        'amenities': {f'amenity_{i}': f'Amenity {i} available on the ground floor' for i in range(items)},
+        'nearby_accessible_places': [{'name': f'Place {i}', 'distance': f'{i * 50} m'} for i in range(items)],
+        'accessibility_notes': 'Staff trained in assisting guests with disabilities. ' * 10
+    }
+
+
+def tour_payload(items: int) -> dict:
+    return {
+        'name': 'Jungfraujoch accessible day trip',
+        'description': 'A barrier-free trip to the Top of Europe. ' * 20,
+        'destinations': [f'Stop {i}' for i in range(items)],
+        'activities': [{'name': f'Activity {i}', 'accessibility': 'Wheelchair accessible'} for i in range(items)],
+        'accessibility_features': {f'feature_{i}': 'Low-floor trains and lifts' for i in range(items)},
+        'photos': [f'https://example.com/tour/{i}.jpg' for i in range(items)],
+        'duration': '10 hours',
+        'itinerary': [{'time': f'{8 + i // 60:02d}:{i % 60:02d}', 'step': f'Step {i} of the journey'} for i in range(items)],
+        'support_services': [f'Support service {i}' for i in range(items // 10 or 1)]
+    }
+
+
+def classic_path(model_class, raw: bytes) -> bytes:
+    data = json.loads(raw)
+    content = model_class(**data)
+    return json.dumps({'success': True, 'validated_content': content.dict()}, sort_keys=True).encode('utf-8')
+
+
+def fast_path(model_class, raw: bytes) -> bytes:
+    content = model_class.model_validate_json(raw)
+    return cms.NativeJSONProvider._encode({'success': True, 'validated_content': content.model_dump()})
+
+
+def measure(path, model_class, raw: bytes, iterations: int) -> float:
+    path(model_class, raw)  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        path(model_class, raw)
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--items', type=int, default=300, help='entries per dict/list field')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    encoder = 'orjson' if cms.orjson is not None else 'pydantic-core'
+    print(f"Fast path encoder: {encoder}")
+    print(f"{'payload':<10}{'size':>10}{'classic ms':>14}{'fast ms':>12}{'saved':>10}")
+    for name, model_class, payload in [
+        ('hotel', cms.HotelContentModel, hotel_payload(args.items)),
+        ('tour', cms.TourContentModel, tour_payload(args.items)),
+    ]:
+        raw = json.dumps(payload).encode('utf-8')
+        assert json.loads(classic_path(model_class, raw)) == json.loads(fast_path(model_class, raw))
+        classic = measure(classic_path, model_class, raw, args.iterations)
+        fast = measure(fast_path, model_class, raw, args.iterations)
+        print(f"{name:<10}{len(raw) // 1024:>8}KB{classic:>14.3f}{fast:>12.3f}{(1 - fast / classic):>10.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Read throughput of the CMS backend while writes are happening, per serving profile.
+
+Starts reader and writer processes (like gunicorn workers) against one SQLite
+file. Readers alternate detail (with a random disability variant) and list
+requests; writers create hotels, which also writes variants and search index
+rows. Requests go through the Flask test client, so the numbers cover the app
+and the database without HTTP. Caches are disabled and no LLM is involved
+(adaptations fall back to the original content). Prints read/write
+throughput, latency percentiles and "database is locked" failures for the
+development and production profiles (CMS_ENV).
+
+    python benchmarks/bench_sqlite_concurrency.py --readers 4 --writers 2 --duration 10
+"""
+import argparse
+import contextlib
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+PROFILES = ('development', 'production')
+DISABILITY_TYPES = ('wheelchair_user', 'dyslexia', 'cognitive_impairment', 'anxiety_travel_fear', 'low_vision')
+
+
+def hotel_document(index: int) -> dict:
+    return {
+        'name': f'Benchmark hotel {index}',
+        'location': 'Bern',
+        'coordinates': '46.9480,7.4474',
+        'prices': {'single': 140, 'double': 190},
+        'accessibility_features': {f'feature_{i}': 'Step-free access with a 90 cm wide door' for i in range(20)},
+        'images': [],
+        'cancellation_conditions': 'Free cancellation up to 24 hours before arrival.',
+        'meal_times': {'breakfast': '07:00-10:00'},
+        'parking': 'Accessible parking in the courtyard',
+        'amenities': {f'amenity_{i}': 'Available on the ground floor' for i in range(20)},
+        'nearby_accessible_places': [{'name': 'Bundeshaus', 'distance': '400 m'}],
+        'accessibility_notes': 'Staff can assist with luggage.'
+    }
+
+
+def load_app(profile: str, database: str):
+    """Import the backend for ``profile`` in this (fresh, spawned) process"""
+    os.environ.update({
+        'CMS_ENV': profile,
+        'DATABASE_URL': f'sqlite:///{database}',
+        'OPENAI_API_KEY': 'dummy-key-for-testing',
+        'DETAIL_CACHE_MAX_BYTES': '0',
+        'ADAPTATION_CACHE_ENABLED': '0'
+    })
+    sys.path.insert(0, ROOT)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        import cms_backend_v2
+    return cms_backend_v2
+
+
+def setup(profile: str, database: str, records: int):
+    cms = load_app(profile, database)
+    with cms.app.app_context():
+        cms.migrate_schema()
+    client = cms.app.test_client()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for index in range(records):
+            assert client.post('/api/hotels', json=hotel_document(index)).status_code == 201
+
+
+def worker(role: str, number: int, profile: str, database: str, records: int, start_at: float, duration: float, results):
+    cms = load_app(profile, database)
+    client = cms.app.test_client()
+    rng = random.Random(number)
+    latencies, errors, locked = [], 0, 0
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.monotonic() + duration
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            if role == 'writer':
+                response = client.post('/api/hotels', json=hotel_document(rng.randrange(10 ** 6)))
+            elif rng.random() < 0.5:
+                response = client.get(f'/api/hotels/{rng.randint(1, records)}?disability_type={rng.choice(DISABILITY_TYPES)}')
+            else:
+                response = client.get(f'/api/hotels?limit=20&after_id={rng.randint(0, records)}')
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+                locked += b'database is locked' in response.get_data()
+    results.put((role, latencies, errors, locked))
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)] if sorted_values else 0.0
+
+
+def run_profile(profile: str, args) -> dict:
+    context = multiprocessing.get_context('spawn')
+    database = os.path.join(tempfile.mkdtemp(prefix='cms-sqlite-bench-'), 'bench.db')
+    process = context.Process(target=setup, args=(profile, database, args.records))
+    process.start()
+    process.join()
+
+    results = context.Queue()
+    start_at = time.time() + 3  # let every process finish importing first
+    processes = [
+        context.Process(target=worker, args=(role, number, profile, database, args.records, start_at, args.duration, results))
+        for number, role in enumerate(['reader'] * args.readers + ['writer'] * args.writers)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for role in ('reader', 'writer'):
+        latencies = sorted(value for r, values, _, _ in collected if r == role for value in values)
+        summary[role] = {
+            'rps': len(latencies) / args.duration,
+            'p50': percentile(latencies, 0.5),
+            'p99': percentile(latencies, 0.99),
+            'errors': sum(errors for r, _, errors, _ in collected if r == role),
+            'locked': sum(locked for r, _, _, locked in collected if r == role)
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=4, help='reader processes')
+    parser.add_argument('--writers', type=int, default=2, help='writer processes')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per profile')
+    parser.add_argument('--records', type=int, default=200, help='hotels created before the run')
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers + {args.writers} writers for {args.duration:g}s on {args.records} hotels")
+    print(f"{'profile':<13}{'reads/s':>9}{'read p50':>10}{'read p99':>10}{'writes/s':>10}{'write p99':>11}{'errors':>8}{'locked':>8}")
+    for profile in args.profiles:
+        result = run_profile(profile, args)
+        reads, writes = result['reader'], result['writer']
+        print(f"{profile:<13}{reads['rps']:>9.1f}{reads['p50']:>10.1f}{reads['p99']:>10.1f}{writes['rps']:>10.1f}"
+              f"{writes['p99']:>11.1f}{reads['errors'] + writes['errors']:>8}{reads['locked'] + writes['locked']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+Deterministic OpenAI-compatible stand-in for the LLM provider.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=True`` SSE) and answers
+every adaptation prompt by adapting the JSON found after "Original Content:":
+each string gets an " (adapted)" suffix, and combined prompts get one copy per
+requested variant key. Latency, error rate and reply formatting are
+configurable and drawn from a seeded RNG, so runs are repeatable:
+
+- latency: fixed, uniform, normal, lognormal or exponential around --latency-ms,
+  plus generation time at --tokens-per-second
+- --error-rate: share of requests answered with one of --error-statuses
+- --malformed-rate: share of replies cut off mid-JSON
+- --fenced-rate: share of replies wrapped in ```json fences (as models often do)
+- replies longer than the request's max_tokens are cut off with finish_reason 'length'
+
+``GET /stats`` returns request counters. Point the backend at it with
+``LLM_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub-key``.
+
+    python benchmarks/llm_stub_server.py --port 8089 --latency-ms 400 --latency-dist lognormal
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal', 'exponential')
+
+
+def adapt_value(value):
+    if isinstance(value, str):
+        return value + ' (adapted)'
+    if isinstance(value, list):
+        return [adapt_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: adapt_value(item) for key, item in value.items()}
+    return value
+
+
+def build_reply(prompt: str):
+    """The reply a well-behaved model would give to an adaptation prompt"""
+    match = re.search(r'Original Content:\s*(\{.*\})\s*Please return', prompt, re.S)
+    content = json.loads(match.group(1)) if match else {}
+    keys = re.search(r'keys are exactly (.*)\.\n', prompt)
+    if keys:
+        return {key: adapt_value(content) for key in json.loads(f'[{keys.group(1)}]')}
+    return adapt_value(content)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class StubBehaviour:
+    """Seeded latency / failure model shared by all request threads"""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'streamed': 0, 'errors': 0, 'malformed': 0, 'fenced': 0, 'truncated': 0}
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def draw(self):
+        """Return (latency seconds, error status or None, malformed, fenced) for one request"""
+        args = self.args
+        with self.lock:
+            mean = args.latency_ms / 1000
+            if args.latency_dist == 'uniform':
+                latency = self.random.uniform(mean * (1 - args.latency_spread), mean * (1 + args.latency_spread))
+            elif args.latency_dist == 'normal':
+                latency = self.random.gauss(mean, mean * args.latency_spread)
+            elif args.latency_dist == 'lognormal':
+                # --latency-ms is the median; sigma controls the tail
+                latency = self.random.lognormvariate(math.log(mean), args.latency_sigma) if mean > 0 else 0.0
+            elif args.latency_dist == 'exponential':
+                latency = self.random.expovariate(1 / mean) if mean > 0 else 0.0
+            else:
+                latency = mean
+            error = self.random.choice(args.error_statuses) if self.random.random() < args.error_rate else None
+            malformed = self.random.random() < args.malformed_rate
+            fenced = self.random.random() < args.fenced_rate
+        return max(0.0, latency), error, malformed, fenced
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    behaviour: StubBehaviour = None
+
+    def log_message(self, format, *args):
+        if not self.behaviour.args.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            with self.behaviour.lock:
+                self.send_json(200, dict(self.behaviour.stats))
+        elif self.path.rstrip('/').endswith('/models'):
+            self.send_json(200, {'object': 'list', 'data': [{'id': 'stub', 'object': 'model', 'owned_by': 'stub'}]})
+        else:
+            self.send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+            return
+
+        behaviour = self.behaviour
+        behaviour.count('requests')
+        latency, error, malformed, fenced = behaviour.draw()
+        if error is not None:
+            behaviour.count('errors')
+            time.sleep(latency / 2)
+            self.send_json(error, {'error': {'message': f'Stub error {error}', 'type': 'server_error', 'code': error}},
+                           {'Retry-After': '1'} if error == 429 else None)
+            return
+
+        prompt = ''.join(message.get('content') or '' for message in request.get('messages', []))
+        text = json.dumps(build_reply(prompt), indent=2)
+        if malformed:
+            behaviour.count('malformed')
+            text = text[:len(text) // 2]
+        if fenced:
+            behaviour.count('fenced')
+            text = f'```json\n{text}\n```'
+        finish_reason = 'stop'
+        max_tokens = request.get('max_tokens')
+        if max_tokens and estimate_tokens(text) > max_tokens:
+            behaviour.count('truncated')
+            text = text[:max_tokens * 4]
+            finish_reason = 'length'
+
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        tokens_per_second = behaviour.args.tokens_per_second
+        generation = completion_tokens / tokens_per_second if tokens_per_second else 0.0
+        envelope = {'id': f'chatcmpl-stub-{behaviour.stats["requests"]}', 'created': int(time.time()),
+                    'model': request.get('model', 'stub')}
+
+        if request.get('stream'):
+            behaviour.count('streamed')
+            self.stream(envelope, text, finish_reason, latency, generation)
+            return
+
+        time.sleep(latency + generation)
+        self.send_json(200, {
+            **envelope,
+            'object': 'chat.completion',
+            'choices': [{'index': 0, 'finish_reason': finish_reason,
+                         'message': {'role': 'assistant', 'content': text}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        })
+
+    def stream(self, envelope: dict, text: str, finish_reason: str, latency: float, generation: float):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta: dict, reason=None):
+            chunk = {**envelope, 'object': 'chat.completion.chunk',
+                     'choices': [{'index': 0, 'delta': delta, 'finish_reason': reason}]}
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+
+        time.sleep(latency)
+        pieces = [text[i:i + 16] for i in range(0, len(text), 16)] or ['']
+        send({'role': 'assistant', 'content': ''})
+        for piece in pieces:
+            if generation:
+                time.sleep(generation / len(pieces))
+            send({'content': piece})
+        send({}, finish_reason)
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=300, help='mean (median for lognormal) latency')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='lognormal shape')
+    parser.add_argument('--latency-spread', type=float, default=0.5, help='relative spread for uniform/normal')
+    parser.add_argument('--tokens-per-second', type=float, default=0, help='generation speed, 0 = instant')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-statuses', type=lambda value: [int(s) for s in value.split(',')], default=[429, 500, 503])
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--fenced-rate', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quiet', action='store_true', help='no per-request log lines')
+    return parser
+
+
+def serve(args) -> ThreadingHTTPServer:
+    """Create the server (the caller runs ``serve_forever``)"""
+    handler = type('BoundStubHandler', (StubHandler,), {'behaviour': StubBehaviour(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    args = build_parser().parse_args()
+    server = serve(args)
+    print(f"🤖 LLM stub listening on http://{args.host}:{server.server_port}/v1 "
+          f"({args.latency_dist} {args.latency_ms:g} ms, {args.error_rate:.0%} errors, {args.malformed_rate:.0%} malformed)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
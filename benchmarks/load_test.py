@@ -0,0 +1,324 @@
+"""
+End-to-end load test for the CMS backend.
+
+Drives the create, list, detail and regenerate routes with a weighted mix of
+requests at a fixed concurrency, then reports per-route latency percentiles
+and throughput. With ``--spawn`` it starts benchmarks/llm_stub_server.py and the
+backend (``flask run`` on a scratch SQLite database) itself, so no real LLM
+provider is involved. The spawned backend runs without the adaptation cache and
+translation memory unless ``--cache`` is given: the load test creates near-identical
+hotels, so most adaptations would be cache hits. Otherwise it targets ``--base-url``.
+
+Every run is appended to ``--results`` (JSON lines, with the git commit and an
+optional ``--label``), so numbers can be tracked across versions; ``--history``
+prints the recorded runs.
+
+    python benchmarks/load_test.py --spawn --concurrency 16 --duration 30
+    python benchmarks/load_test.py --spawn --stub-args="--latency-ms 800 --error-rate 0.05"
+    python benchmarks/load_test.py --history
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+OPERATIONS = ('create', 'list', 'detail', 'regenerate')
+DISABILITY_TYPES = ('wheelchair_user', 'dyslexia', 'cognitive_impairment', 'anxiety_travel_fear', 'low_vision')
+
+
+def hotel_document(index: int) -> dict:
+    return {
+        'name': f'Load test hotel {index}',
+        'location': 'Bern',
+        'coordinates': '46.9480,7.4474',
+        'prices': {'single': 140, 'double': 190},
+        'accessibility_features': {'entrance': 'Step-free entrance', 'rooms': 'Two wheelchair accessible rooms'},
+        'images': [],
+        'cancellation_conditions': 'Free cancellation up to 24 hours before arrival.',
+        'meal_times': {'breakfast': '07:00-10:00'},
+        'parking': 'Accessible parking in the courtyard',
+        'amenities': {'wifi': 'Free Wi-Fi', 'lift': 'Lift to all floors'},
+        'nearby_accessible_places': [{'name': 'Bundeshaus', 'distance': '400 m'}],
+        'accessibility_notes': 'Staff can assist with luggage.'
+    }
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class Client:
+    """One keep-alive connection per worker thread"""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method: str, path: str, body: dict = None):
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        for attempt in (0, 1):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError, socket.timeout):
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.ids = []
+        self.lock = threading.Lock()
+        self.samples = {operation: [] for operation in OPERATIONS}
+        self.errors = {operation: 0 for operation in OPERATIONS}
+        self.weights = [args.mix.get(operation, 0) for operation in OPERATIONS]
+        self.counter = 0
+
+    def create(self, client: Client, rng: random.Random):
+        with self.lock:
+            self.counter += 1
+            index = self.counter
+        status, body = client.request('POST', '/api/hotels', hotel_document(index))
+        if status == 201:
+            with self.lock:
+                self.ids.append(json.loads(body)['hotel_id'])
+        return status
+
+    def list(self, client: Client, rng: random.Random):
+        return client.request('GET', f'/api/hotels?limit={self.args.page_size}')[0]
+
+    def detail(self, client: Client, rng: random.Random):
+        variant = rng.choice((None,) + DISABILITY_TYPES)
+        query = f'?disability_type={variant}' if variant else ''
+        return client.request('GET', f'/api/hotels/{rng.choice(self.ids)}{query}')[0]
+
+    def regenerate(self, client: Client, rng: random.Random):
+        return client.request('POST', f'/api/regenerate-content/hotel/{rng.choice(self.ids)}',
+                              {'disability_type': rng.choice(DISABILITY_TYPES)})[0]
+
+    def seed(self):
+        client = Client(self.args.base_url, self.args.timeout)
+        for _ in range(self.args.seed_records):
+            if self.create(client, None) != 201:
+                raise SystemExit('❌ Could not create seed records, is the backend up?')
+
+    def worker(self, number: int, deadline: float, budget: list):
+        rng = random.Random(self.args.seed + number)
+        client = Client(self.args.base_url, self.args.timeout)
+        while time.monotonic() < deadline:
+            with self.lock:
+                if budget[0] is not None:
+                    if budget[0] <= 0:
+                        return
+                    budget[0] -= 1
+            operation = rng.choices(OPERATIONS, weights=self.weights)[0]
+            start = time.perf_counter()
+            try:
+                status = getattr(self, operation)(client, rng)
+            except Exception:
+                status = None
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self.samples[operation].append(elapsed)
+                if status is None or status >= 400:
+                    self.errors[operation] += 1
+
+    def run(self) -> dict:
+        self.seed()
+        budget = [self.args.requests]
+        deadline = time.monotonic() + (self.args.duration if self.args.requests is None else 24 * 3600)
+        threads = [threading.Thread(target=self.worker, args=(i, deadline, budget), daemon=True)
+                   for i in range(self.args.concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+        routes = {}
+        for operation, samples in self.samples.items():
+            if not samples:
+                continue
+            samples.sort()
+            routes[operation] = {
+                'count': len(samples),
+                'errors': self.errors[operation],
+                'rps': round(len(samples) / wall, 2),
+                'mean_ms': round(sum(samples) / len(samples), 2),
+                **{f'p{int(q * 100)}_ms': round(percentile(samples, q), 2) for q in (0.5, 0.9, 0.95, 0.99)},
+                'max_ms': round(samples[-1], 2)
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            'routes': routes,
+            'total': {'count': total, 'errors': sum(self.errors.values()), 'rps': round(total / wall, 2),
+                      'seconds': round(wall, 2)}
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30):
+    client = Client(url, 2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'❌ Backend exited with status {process.returncode} before serving {url}')
+        try:
+            client.request('GET', '/api/disability-types')
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f'❌ {url} did not come up within {timeout}s')
+
+
+def spawn(args) -> list:
+    """Start the LLM stub and the backend on a scratch database; returns the processes"""
+    stub_port, cms_port = free_port(), free_port()
+    database = os.path.join(tempfile.mkdtemp(prefix='cms-load-'), 'load_test.db')
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'benchmarks', 'llm_stub_server.py'), '--quiet',
+         '--port', str(stub_port), *shlex.split(args.stub_args)]
+    )
+    env = {
+        **os.environ,
+        'DATABASE_URL': f'sqlite:///{database}',
+        'LLM_BASE_URL': f'http://127.0.0.1:{stub_port}/v1',
+        'OPENAI_API_KEY': 'stub-key',
+        'FLASK_APP': 'cms_backend_v2',
+        **({} if args.cache else {'ADAPTATION_CACHE_ENABLED': '0', 'TRANSLATION_MEMORY_ENABLED': '0'})
+    }
+    subprocess.run([sys.executable, '-m', 'flask', 'init-db'], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    backend = subprocess.Popen(
+        [sys.executable, '-m', 'flask', 'run', '--no-reload', '--with-threads', '--port', str(cms_port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    args.base_url = f'http://127.0.0.1:{cms_port}'
+    wait_until_up(args.base_url, backend)
+    return [backend, stub]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_report(result: dict):
+    print(f"{'route':<12}{'count':>7}{'errors':>8}{'rps':>8}{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for operation, stats in result['routes'].items():
+        print(f"{operation:<12}{stats['count']:>7}{stats['errors']:>8}{stats['rps']:>8.1f}{stats['p50_ms']:>9.1f}"
+              f"{stats['p90_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+    total = result['total']
+    print(f"{'total':<12}{total['count']:>7}{total['errors']:>8}{total['rps']:>8.1f}   in {total['seconds']}s")
+
+
+def print_history(path: str):
+    if not os.path.exists(path):
+        print(f"No recorded runs in {path}")
+        return
+    print(f"{'recorded':<22}{'revision':<18}{'label':<16}{'conc':>5}{'rps':>8}" +
+          ''.join(f'{operation + " p99":>16}' for operation in OPERATIONS))
+    with open(path) as results:
+        for line in results:
+            run = json.loads(line)
+            p99 = ''.join(f"{run['routes'].get(operation, {}).get('p99_ms', float('nan')):>16.1f}" for operation in OPERATIONS)
+            print(f"{run['recorded_at'][:19]:<22}{run['revision']:<18}{run.get('label') or '':<16}"
+                  f"{run['config']['concurrency']:>5}{run['total']['rps']:>8.1f}{p99}")
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(','):
+        operation, _, weight = part.partition('=')
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'unknown operation {operation!r}, expected one of {OPERATIONS}')
+        mix[operation] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:5001')
+    parser.add_argument('--spawn', action='store_true', help='start the LLM stub and a backend on a scratch database')
+    parser.add_argument('--stub-args', default='--latency-ms 300', help='extra llm_stub_server.py arguments')
+    parser.add_argument('--cache', action='store_true',
+                        help='keep the adaptation cache and translation memory on in the spawned backend')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20, help='seconds to run (ignored with --requests)')
+    parser.add_argument('--requests', type=int, default=None, help='stop after this many requests')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('create=1,list=4,detail=10,regenerate=1'))
+    parser.add_argument('--seed-records', type=int, default=10, help='hotels created before the run starts')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--label', default=None, help='stored with the results, e.g. a branch or config name')
+    parser.add_argument('--results', default=os.path.join(ROOT, 'benchmarks', 'results', 'load_test.jsonl'))
+    parser.add_argument('--no-record', action='store_true', help="don't append this run to --results")
+    parser.add_argument('--history', action='store_true', help='print recorded runs and exit')
+    args = parser.parse_args()
+
+    if args.history:
+        print_history(args.results)
+        return
+
+    processes = spawn(args) if args.spawn else []
+    try:
+        print(f"🚀 {args.concurrency} workers against {args.base_url}, mix {args.mix}")
+        result = LoadTest(args).run()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    print_report(result)
+    if not args.no_record:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        record = {
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'revision': git_revision(),
+            'label': args.label,
+            'config': {'concurrency': args.concurrency, 'duration': args.duration, 'requests': args.requests,
+                       'mix': args.mix, 'spawned': args.spawn, 'stub_args': args.stub_args if args.spawn else None,
+                       'cache': args.cache if args.spawn else None},
+            **result
+        }
+        with open(args.results, 'a') as results:
+            results.write(json.dumps(record) + '\n')
+        print(f"📝 Recorded in {args.results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,50 +1,401 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as SQLAlchemySession
 from flask_cors import CORS
-from datetime import datetime
+import click
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait as wait_futures
+import copy
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional, Union
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field, validator
+import pydantic_core
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # optional, pydantic-core's encoder is used instead
+    orjson = None
+
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'inclusive-content-craft', 'accessible_cms.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'inclusive-content-craft', 'accessible_cms.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
+# Serving profile: 'production' switches SQLite to WAL with tuned pragmas and sizes the
+# connection pool for multi-threaded, multi-process serving (see wsgi.py / gunicorn.conf.py)
+app.config['CMS_ENV'] = os.getenv('CMS_ENV', 'development')
+production = app.config['CMS_ENV'] == 'production'
+
+# Applied to every new SQLite connection; an empty value keeps SQLite's default
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL' if production else ''),
+    'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL' if production else ''),
+    'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024) if production else ''),
+    'cache_size': os.getenv('SQLITE_CACHE_SIZE', '-65536' if production else ''),  # negative = KiB
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY' if production else '')
+}
+
+# Per-process connection pool (in-memory SQLite databases keep SQLAlchemy's single-connection pool)
+if ':memory:' not in app.config['SQLALCHEMY_DATABASE_URI'] and app.config['SQLALCHEMY_DATABASE_URI'] != 'sqlite://':
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10' if production else '5')),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', '20' if production else '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '3600'))
+    }
+
+# Fast JSON path: validate request bytes with Pydantic directly and encode responses
+# with a native encoder (orjson if installed, otherwise pydantic-core)
+app.config['JSON_FAST_PATH'] = os.getenv('JSON_FAST_PATH', '1').lower() in ('1', 'true', 'yes')
+app.config['LLM_MODEL'] = os.getenv('LLM_MODEL', 'openai/gpt-4o-mini')
+
+# Adaptation fan-out: how many disability variants are generated at once (1 = serial)
+# and how long each variant may take before it falls back to the original content
+app.config['ADAPTATION_CONCURRENCY'] = int(os.getenv('ADAPTATION_CONCURRENCY', '5'))
+app.config['ADAPTATION_VARIANT_TIMEOUT'] = float(os.getenv('ADAPTATION_VARIANT_TIMEOUT', '60'))
+
+# Adaptation strategy: 'per_variant' sends one request per disability type; 'combined' asks for
+# all variants in one reply (input tokens paid once) and adapts the ones it misses one by one
+app.config['ADAPTATION_STRATEGY'] = os.getenv('ADAPTATION_STRATEGY', 'per_variant')
+app.config['ADAPTATION_COMBINED_MAX_TOKENS'] = int(os.getenv('ADAPTATION_COMBINED_MAX_TOKENS', '16000'))
+
+# Chunked adaptation: documents estimated above ADAPTATION_CHUNK_TOKENS are split into field
+# groups / list slices that are adapted in parallel and reassembled, so replies fit max_tokens
+app.config['ADAPTATION_CHUNKING'] = os.getenv('ADAPTATION_CHUNKING', '1').lower() in ('1', 'true', 'yes')
+app.config['ADAPTATION_CHUNK_TOKENS'] = int(os.getenv('ADAPTATION_CHUNK_TOKENS', '1500'))
+app.config['ADAPTATION_CHUNK_CONCURRENCY'] = int(os.getenv('ADAPTATION_CHUNK_CONCURRENCY', '4'))
+
+# Single-flight: concurrent identical adaptations share one LLM call ('thread': within a process).
+# 'sqlite' also takes a lease row, so other worker processes wait for the cached result; 'off' disables
+app.config['ADAPTATION_SINGLE_FLIGHT'] = os.getenv('ADAPTATION_SINGLE_FLIGHT', 'sqlite' if production else 'thread')
+app.config['ADAPTATION_LEASE_SECONDS'] = int(os.getenv('ADAPTATION_LEASE_SECONDS', '120'))
+app.config['ADAPTATION_LEASE_POLL_INTERVAL'] = float(os.getenv('ADAPTATION_LEASE_POLL_INTERVAL', '0.25'))
+
+# Background adaptation jobs: when async, create/regenerate return 202 and a worker pool
+# fills in the adaptive content. The queue lives in the same SQLite database.
+app.config['ADAPTATION_ASYNC'] = os.getenv('ADAPTATION_ASYNC', '0').lower() in ('1', 'true', 'yes')
+app.config['ADAPTATION_JOB_WORKERS'] = int(os.getenv('ADAPTATION_JOB_WORKERS', '2'))
+app.config['ADAPTATION_JOB_POLL_INTERVAL'] = float(os.getenv('ADAPTATION_JOB_POLL_INTERVAL', '2'))
+app.config['ADAPTATION_JOB_LEASE_SECONDS'] = int(os.getenv('ADAPTATION_JOB_LEASE_SECONDS', '300'))
+app.config['ADAPTATION_JOB_MAX_ATTEMPTS'] = int(os.getenv('ADAPTATION_JOB_MAX_ATTEMPTS', '3'))
+
+# Bulk NDJSON import: lines per transaction and concurrent LLM calls across a chunk
+app.config['IMPORT_CHUNK_SIZE'] = int(os.getenv('IMPORT_CHUNK_SIZE', '100'))
+app.config['IMPORT_CONCURRENCY'] = int(os.getenv('IMPORT_CONCURRENCY', '8'))
+
+# List endpoints: keyset page size (?limit=) default and upper bound
+app.config['LIST_DEFAULT_LIMIT'] = int(os.getenv('LIST_DEFAULT_LIMIT', '100'))
+app.config['LIST_MAX_LIMIT'] = int(os.getenv('LIST_MAX_LIMIT', '500'))
+
+# Full-text search (SQLite FTS5) over original content and, optionally, adaptive variants
+app.config['SEARCH_INDEX_ENABLED'] = os.getenv('SEARCH_INDEX_ENABLED', '1').lower() in ('1', 'true', 'yes')
+app.config['SEARCH_INDEX_VARIANTS'] = os.getenv('SEARCH_INDEX_VARIANTS', '1').lower() in ('1', 'true', 'yes')
+
+# Detail response cache: serialized bodies per (type, id, disability_type), bounded by
+# total size; the TTL bounds staleness when several worker processes share the database
+app.config['DETAIL_CACHE_MAX_BYTES'] = int(os.getenv('DETAIL_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+app.config['DETAIL_CACHE_TTL'] = int(os.getenv('DETAIL_CACHE_TTL', '300'))
+
+# Adaptation cache: in-process LRU in front of a persistent SQLite table (TTL in seconds, 0 = never expire)
+app.config['ADAPTATION_CACHE_ENABLED'] = os.getenv('ADAPTATION_CACHE_ENABLED', '1').lower() in ('1', 'true', 'yes')
+app.config['ADAPTATION_CACHE_MEMORY_ENTRIES'] = int(os.getenv('ADAPTATION_CACHE_MEMORY_ENTRIES', '512'))
+app.config['ADAPTATION_CACHE_MAX_ROWS'] = int(os.getenv('ADAPTATION_CACHE_MAX_ROWS', '20000'))
+app.config['ADAPTATION_CACHE_TTL'] = int(os.getenv('ADAPTATION_CACHE_TTL', str(30 * 24 * 3600)))
+# Seconds between eviction passes over the table (counting it on every store costs a scan)
+app.config['ADAPTATION_CACHE_EVICTION_INTERVAL'] = float(os.getenv('ADAPTATION_CACHE_EVICTION_INTERVAL', '60'))
+
+# Translation memory: adapted strings of repetitive fields (amenities, accessibility features,
+# meal times, cancellation conditions) are reused across records; only novel strings go to the LLM
+app.config['TRANSLATION_MEMORY_ENABLED'] = os.getenv('TRANSLATION_MEMORY_ENABLED', '1').lower() in ('1', 'true', 'yes')
+app.config['TRANSLATION_MEMORY_MEMORY_ENTRIES'] = int(os.getenv('TRANSLATION_MEMORY_MEMORY_ENTRIES', '4096'))
+app.config['TRANSLATION_MEMORY_MAX_ROWS'] = int(os.getenv('TRANSLATION_MEMORY_MAX_ROWS', '200000'))
+app.config['TRANSLATION_MEMORY_EVICTION_INTERVAL'] = float(os.getenv('TRANSLATION_MEMORY_EVICTION_INTERVAL', '60'))
+
+# Custom disability profiles: a free-text ?disability_type= on the detail endpoints is normalized and
+# hashed into a 'custom:<hash>' variant, generated on first request by the job queue
+app.config['CUSTOM_PROFILES_ENABLED'] = os.getenv('CUSTOM_PROFILES_ENABLED', '1').lower() in ('1', 'true', 'yes')
+app.config['CUSTOM_PROFILE_MAX_CHARS'] = int(os.getenv('CUSTOM_PROFILE_MAX_CHARS', '500'))
+# Custom profile jobs queued per hour across all records; further new profiles get 429 (0 = unlimited)
+app.config['CUSTOM_PROFILE_JOBS_PER_HOUR'] = int(os.getenv('CUSTOM_PROFILE_JOBS_PER_HOUR', '200'))
+
+class NativeJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, or pydantic-core's Rust encoder when orjson is missing"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return pydantic_core.from_json(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype='application/json')
+
+    @staticmethod
+    def _encode(obj) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return pydantic_core.to_json(obj, fallback=str)
+
+if app.config['JSON_FAST_PATH']:
+    app.json = NativeJSONProvider(app)
+
 db = SQLAlchemy(app)
 CORS(app)
 
+@db.event.listens_for(Engine, 'connect')
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in app.config['SQLITE_PRAGMAS'].items():
+        if value:
+            if not re.fullmatch(r'-?\w+', str(value)):
+                raise ValueError(f'Invalid value for PRAGMA {name}: {value!r}')
+            cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
 
-from openai import OpenAI
 
-# Initialize OpenAI client with proper error handling
-try:
-    # Try to get API key from environment first, then fallback to hardcoded
-    api_key = os.getenv('OPENAI_API_KEY')
-    
-    if not api_key:
-        # Fallback to hardcoded API key
-        api_key = "sk-or-v1-ab3df1cef88f344f15e673778151efd30a2d3e09f82221e112806bd5c0847ff87"
-        print("🔑 Using hardcoded API key from code")
-    
-    if api_key and api_key != 'dummy-key-for-testing':
-        # Use real API key
-        client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
-        print("✅ OpenAI client initialized with real API key")
-    else:
-        # Use dummy client for testing
-        client = None
-        print("⚠️  Using dummy OpenAI client for testing")
-        
-except Exception as e:
-    print(f"⚠️  OpenAI client initialization failed: {e}")
-    print("   Continuing with dummy client for testing")
-    client = None
+from cms_metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from cms_profiling import RequestProfiler, profiled_thread
+from llm_gateway import CircuitOpenError, LLMGateway, LLMUnavailableError
+from llm_router import HedgeCancelled, ModelRouter, parse_models
+from llm_scheduler import (PRIORITIES as LLM_PRIORITIES, LLMScheduler, RateLimitedError, SharedRateLimiter,
+                           current_scheduling, in_current_context, iterate_in_current_context, scheduling)
+
+# LLM gateway: one pooled client with per-call deadlines, jittered retries and a circuit breaker
+app.config['LLM_BASE_URL'] = os.getenv('LLM_BASE_URL', 'https://openrouter.ai/api/v1')
+app.config['LLM_REQUEST_TIMEOUT'] = float(os.getenv('LLM_REQUEST_TIMEOUT', '60'))
+app.config['LLM_CONNECT_TIMEOUT'] = float(os.getenv('LLM_CONNECT_TIMEOUT', '5'))
+app.config['LLM_MAX_RETRIES'] = int(os.getenv('LLM_MAX_RETRIES', '3'))
+app.config['LLM_BACKOFF_BASE'] = float(os.getenv('LLM_BACKOFF_BASE', '0.5'))
+app.config['LLM_BACKOFF_MAX'] = float(os.getenv('LLM_BACKOFF_MAX', '8'))
+app.config['LLM_POOL_MAX_CONNECTIONS'] = int(os.getenv('LLM_POOL_MAX_CONNECTIONS', '20'))
+app.config['LLM_POOL_MAX_KEEPALIVE'] = int(os.getenv('LLM_POOL_MAX_KEEPALIVE', '10'))
+app.config['LLM_CIRCUIT_FAILURE_THRESHOLD'] = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', '5'))
+app.config['LLM_CIRCUIT_RESET_TIMEOUT'] = float(os.getenv('LLM_CIRCUIT_RESET_TIMEOUT', '30'))
+
+# LLM scheduler: provider rate limits (requests / estimated tokens per minute, 0 = unlimited) shared by
+# every worker process on the host through a small SQLite file. Calls queue for budget by priority class
+# (interactive > create > backfill) and round-robin across tenants (X-Tenant-ID header, else client address).
+app.config['LLM_RATE_LIMIT_RPM'] = float(os.getenv('LLM_RATE_LIMIT_RPM', '0'))
+app.config['LLM_RATE_LIMIT_TPM'] = float(os.getenv('LLM_RATE_LIMIT_TPM', '0'))
+app.config['LLM_RATE_LIMIT_PATH'] = os.getenv('LLM_RATE_LIMIT_PATH', os.path.join(app.instance_path, 'llm_rate_limits.db'))
+
+# Model routing: LLM_MODELS lists the candidate models in preference order (default: LLM_MODEL alone),
+# each optionally with the largest call in estimated tokens it should get, e.g.
+# "openai/gpt-4o-mini@30000,google/gemini-flash-1.5". Calls go to the suitable model with the lowest
+# recent latency for their size. With hedging, a call still unanswered at the LLM_HEDGE_PERCENTILE
+# latency of its model gets a backup request to the next model; the first reply that validates is used
+# and the other request is cancelled. Cached adaptations stay keyed by LLM_MODEL whichever model wrote them.
+app.config['LLM_MODELS'] = os.getenv('LLM_MODELS', app.config['LLM_MODEL'])
+app.config['LLM_HEDGING_ENABLED'] = os.getenv('LLM_HEDGING_ENABLED', '1').lower() in ('1', 'true', 'yes')
+app.config['LLM_HEDGE_PERCENTILE'] = float(os.getenv('LLM_HEDGE_PERCENTILE', '0.95'))
+app.config['LLM_HEDGE_MIN_DELAY'] = float(os.getenv('LLM_HEDGE_MIN_DELAY', '2'))
+app.config['LLM_HEDGE_DEFAULT_DELAY'] = float(os.getenv('LLM_HEDGE_DEFAULT_DELAY', '15'))
+# Threads for hedged attempts (two per hedged call at most)
+app.config['LLM_HEDGE_MAX_WORKERS'] = int(os.getenv('LLM_HEDGE_MAX_WORKERS', '32'))
+app.config['LLM_ROUTING_WINDOW'] = int(os.getenv('LLM_ROUTING_WINDOW', '200'))
+app.config['LLM_ROUTING_MIN_SAMPLES'] = int(os.getenv('LLM_ROUTING_MIN_SAMPLES', '10'))
+app.config['LLM_ROUTING_EXPLORE'] = float(os.getenv('LLM_ROUTING_EXPLORE', '0.05'))
+
+# Try to get API key from environment first, then fallback to hardcoded. The openai package
+# is only imported, and the client built, when the first adaptation needs it.
+api_key = os.getenv('OPENAI_API_KEY') or "sk-or-v1-ab3df1cef88f344f15e673778151efd30a2d3e09f82221e112806bd5c0847ff87"
+
+if api_key == 'dummy-key-for-testing':
+    # No real provider: adaptations fall back to the original content
+    api_key = None
+
+llm_scheduler = LLMScheduler(SharedRateLimiter(
+    app.config['LLM_RATE_LIMIT_PATH'],
+    requests_per_minute=app.config['LLM_RATE_LIMIT_RPM'],
+    tokens_per_minute=app.config['LLM_RATE_LIMIT_TPM']
+))
+
+llm_gateway = LLMGateway(
+    app.config['LLM_BASE_URL'],
+    api_key,
+    request_timeout=app.config['LLM_REQUEST_TIMEOUT'],
+    connect_timeout=app.config['LLM_CONNECT_TIMEOUT'],
+    max_retries=app.config['LLM_MAX_RETRIES'],
+    backoff_base=app.config['LLM_BACKOFF_BASE'],
+    backoff_max=app.config['LLM_BACKOFF_MAX'],
+    max_connections=app.config['LLM_POOL_MAX_CONNECTIONS'],
+    max_keepalive_connections=app.config['LLM_POOL_MAX_KEEPALIVE'],
+    failure_threshold=app.config['LLM_CIRCUIT_FAILURE_THRESHOLD'],
+    reset_timeout=app.config['LLM_CIRCUIT_RESET_TIMEOUT'],
+    scheduler=llm_scheduler
+)
+
+llm_router = ModelRouter(
+    parse_models(app.config['LLM_MODELS']),
+    hedging=app.config['LLM_HEDGING_ENABLED'],
+    hedge_percentile=app.config['LLM_HEDGE_PERCENTILE'],
+    hedge_min_delay=app.config['LLM_HEDGE_MIN_DELAY'],
+    hedge_default_delay=app.config['LLM_HEDGE_DEFAULT_DELAY'],
+    window=app.config['LLM_ROUTING_WINDOW'],
+    min_samples=app.config['LLM_ROUTING_MIN_SAMPLES'],
+    explore=app.config['LLM_ROUTING_EXPLORE'],
+    max_workers=app.config['LLM_HEDGE_MAX_WORKERS']
+)
+
+
+# Metrics: Prometheus text format at GET /metrics (per process)
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+metrics = MetricsRegistry()
+http_request_seconds = metrics.histogram(
+    'cms_http_request_duration_seconds', 'HTTP request latency by route and status', ('method', 'route', 'status'))
+http_requests_in_flight = metrics.gauge(
+    'cms_http_requests_in_flight', 'HTTP requests currently being served', ('method', 'route'))
+llm_request_seconds = metrics.histogram(
+    'cms_llm_request_duration_seconds', 'LLM call latency including retries', ('model', 'outcome'))
+llm_retries = metrics.counter('cms_llm_retries_total', 'LLM attempts that were retried', ('model',))
+llm_circuit_rejections = metrics.counter('cms_llm_circuit_rejections_total', 'LLM calls rejected by the open circuit')
+llm_tokens = metrics.counter(
+    'cms_llm_tokens_total', 'LLM tokens used by disability type', ('disability_type', 'kind'))
+adaptation_fallbacks = metrics.counter(
+    'cms_adaptation_fallbacks_total', 'Adaptations that fell back, by disability type and reason', ('disability_type', 'reason'))
+translation_memory_served = metrics.histogram(
+    'cms_translation_memory_document_share', 'Share of each adapted document served from translation memory',
+    ('disability_type',), buckets=(0, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0))
+llm_queue_wait_seconds = metrics.histogram(
+    'cms_llm_queue_wait_seconds', 'Time LLM calls waited for rate-limit budget by priority', ('priority',),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+llm_rate_limited = metrics.counter(
+    'cms_llm_rate_limited_total', 'LLM calls that got no rate-limit budget before their deadline', ('priority',))
+db_query_seconds = metrics.histogram(
+    'cms_db_query_duration_seconds', 'Database statement latency by operation and table', ('operation', 'table'),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+SQL_OPERATION = re.compile(r'\s*(\w+)')
+SQL_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)', re.IGNORECASE)
+
+def record_llm_usage(response, label: str):
+    """Add a completion's token usage (if reported) to ``cms_llm_tokens_total``"""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return
+    llm_tokens.inc(getattr(usage, 'prompt_tokens', 0) or 0, disability_type=label, kind='prompt')
+    llm_tokens.inc(getattr(usage, 'completion_tokens', 0) or 0, disability_type=label, kind='completion')
+
+def _record_llm_event(event: str, details: Dict):
+    model = details.get('model') or 'unknown'
+    if event in ('success', 'failure'):
+        llm_request_seconds.observe(details['latency'], model=model, outcome=event)
+    elif event == 'retry':
+        llm_retries.inc(model=model)
+    elif event == 'rejected':
+        llm_circuit_rejections.inc()
+
+llm_gateway.add_listener(_record_llm_event)
+
+def _record_scheduler_event(event: str, details: Dict):
+    if event == 'admitted':
+        llm_queue_wait_seconds.observe(details['waited'], priority=details['priority'])
+    elif event == 'rate_limited':
+        llm_rate_limited.inc(priority=details['priority'])
+
+llm_scheduler.add_listener(_record_scheduler_event)
+
+@db.event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+@db.event.listens_for(Engine, 'after_cursor_execute')
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is None:
+        return
+    operation = SQL_OPERATION.match(statement)
+    table = SQL_TABLE.search(statement)
+    db_query_seconds.observe(
+        time.perf_counter() - started,
+        operation=operation.group(1).upper() if operation else 'OTHER',
+        table=table.group(1) if table else ''
+    )
+
+@app.before_request
+def _start_request_metrics():
+    if not app.config['METRICS_ENABLED']:
+        return
+    g.metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.metrics_started = time.perf_counter()
+    http_requests_in_flight.inc(method=request.method, route=g.metrics_route)
+
+@app.after_request
+def _remember_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def _finish_request_metrics(error=None):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return
+    http_requests_in_flight.dec(method=request.method, route=g.metrics_route)
+    http_request_seconds.observe(
+        time.perf_counter() - started,
+        method=request.method, route=g.metrics_route, status=str(g.get('metrics_status', 500))
+    )
+
+
+# LLM scheduling class of the calls a request makes, directly or through the jobs it queues;
+# other endpoints (regenerate, on-demand custom profiles) are interactive
+LLM_ENDPOINT_PRIORITIES = {
+    'create_hotel': 'create', 'create_tour': 'create', 'create_care_service': 'create',
+    'update_hotel': 'create', 'update_tour': 'create', 'update_care_service': 'create',
+    'bulk_import': 'backfill'
+}
+
+@app.before_request
+def _enter_llm_scheduling():
+    tenant = request.headers.get('X-Tenant-ID') or request.remote_addr or 'default'
+    g.llm_scheduling = scheduling(LLM_ENDPOINT_PRIORITIES.get(request.endpoint, 'interactive'), tenant[:64])
+    g.llm_scheduling.__enter__()
+
+@app.teardown_request
+def _exit_llm_scheduling(error=None):
+    entered = g.pop('llm_scheduling', None)
+    if entered is not None:
+        entered.__exit__(None, None, None)
+
+
+# Per-request profiling: requests flagged with ?profile=1 or an X-Profile: 1 header are profiled
+# and reports written to PROFILING_DIR. The middleware is only installed when enabled.
+app.config['PROFILING_ENABLED'] = os.getenv('PROFILING_ENABLED', '0').lower() in ('1', 'true', 'yes')
+app.config['PROFILING_DIR'] = os.getenv('PROFILING_DIR', os.path.join(app.instance_path, 'profiles'))
+app.config['PROFILING_MODE'] = os.getenv('PROFILING_MODE', 'sampling')
+app.config['PROFILING_INTERVAL_MS'] = float(os.getenv('PROFILING_INTERVAL_MS', '2'))
+app.config['PROFILING_TOP_N'] = int(os.getenv('PROFILING_TOP_N', '30'))
+
+if app.config['PROFILING_ENABLED']:
+    app.wsgi_app = RequestProfiler(
+        app.wsgi_app,
+        app.config['PROFILING_DIR'],
+        mode=app.config['PROFILING_MODE'],
+        interval=app.config['PROFILING_INTERVAL_MS'] / 1000,
+        top=app.config['PROFILING_TOP_N']
+    )
+    print(f"🔬 Request profiling enabled ({app.config['PROFILING_MODE']}), reports in {app.config['PROFILING_DIR']}")
 
 
 # Enums for disability types
@@ -55,6 +406,10 @@ class DisabilityType(str, Enum):
     ANXIETY_TRAVEL_FEAR = "anxiety_travel_fear"
     LOW_VISION = "low_vision"
 
+    @property
+    def variant_key(self) -> str:
+        return self.value
+
 # Pydantic Models for Input Validation and Content Structure
 
 class HotelContentModel(BaseModel):
@@ -167,6 +522,18 @@ ADAPTATION_PROMPTS = {
     """
 }
 
+CUSTOM_PROFILE_PROMPT = """
+    Adapt this content for a traveller who describes their needs in their own words as:
+    "{description}"
+    1. Put the information that matters most for these needs first
+    2. Use language and detail suited to these needs
+    3. Highlight relevant accessibility features, support services and contacts
+    4. Do not invent features or services the original content does not mention
+    Return the same JSON structure maintaining all information but adapted to these needs.
+    """
+
+ADAPTATION_SYSTEM_PROMPT = "You are an accessibility expert who adapts content for people with disabilities. Always return valid JSON with the exact same structure as input."
+
 # Database Models - storing JSON content using Pydantic models
 class Hotel(db.Model):
     __tablename__ = 'hotels'
@@ -178,12 +545,8 @@ class Hotel(db.Model):
     # Original content as JSON (follows HotelContentModel structure)
     original_content = db.Column(db.JSON, nullable=False)
     
-    # Adaptive content for each disability type (all follow HotelContentModel structure)
-    wheelchair_user_content = db.Column(db.JSON)
-    dyslexia_content = db.Column(db.JSON)
-    cognitive_impairment_content = db.Column(db.JSON)
-    anxiety_travel_fear_content = db.Column(db.JSON)
-    low_vision_content = db.Column(db.JSON)
+    # Adaptive content (also HotelContentModel structure) lives in content_variants
+    entity_type = 'hotel'
 
 class Tour(db.Model):
     __tablename__ = 'tours'
@@ -195,12 +558,8 @@ class Tour(db.Model):
     # Original content as JSON (follows TourContentModel structure)
     original_content = db.Column(db.JSON, nullable=False)
     
-    # Adaptive content for each disability type (all follow TourContentModel structure)
-    wheelchair_user_content = db.Column(db.JSON)
-    dyslexia_content = db.Column(db.JSON)
-    cognitive_impairment_content = db.Column(db.JSON)
-    anxiety_travel_fear_content = db.Column(db.JSON)
-    low_vision_content = db.Column(db.JSON)
+    # Adaptive content (also TourContentModel structure) lives in content_variants
+    entity_type = 'tour'
 
 class CareService(db.Model):
     __tablename__ = 'care_services'
@@ -212,35 +571,991 @@ class CareService(db.Model):
     # Original content as JSON (follows CareServiceContentModel structure)
     original_content = db.Column(db.JSON, nullable=False)
     
-    # Adaptive content for each disability type (all follow CareServiceContentModel structure)
-    wheelchair_user_content = db.Column(db.JSON)
-    dyslexia_content = db.Column(db.JSON)
-    cognitive_impairment_content = db.Column(db.JSON)
-    anxiety_travel_fear_content = db.Column(db.JSON)
-    low_vision_content = db.Column(db.JSON)
+    # Adaptive content (also CareServiceContentModel structure) lives in content_variants
+    entity_type = 'care-service'
+
+class ContentVariant(db.Model):
+    """One adaptive version of a hotel, tour or care service, keyed by variant (e.g. a disability type)"""
+    __tablename__ = 'content_variants'
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', 'variant_key', name='uq_content_variants_entity_variant'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Owning record: entity_type is the CONTENT_TYPES key ('hotel', 'tour', 'care-service')
+    entity_type = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    variant_key = db.Column(db.String(128), nullable=False)
+    
+    # Adapted content, same structure as the owner's original_content
+    content = db.Column(db.JSON, nullable=False)
+
+class AdaptationJob(db.Model):
+    """Queued adaptation work for one content record, processed by AdaptationJobQueue"""
+    __tablename__ = 'adaptation_jobs'
+    __table_args__ = (
+        # At most one pending job per record and custom profile, however many requests ask for it
+        db.Index('uq_adaptation_jobs_pending_custom', 'content_type', 'content_id', 'custom_variant', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running') AND custom_variant IS NOT NULL")),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Target record ('hotel', 'tour' or 'care-service', see CONTENT_TYPES)
+    content_type = db.Column(db.String(32), nullable=False)
+    content_id = db.Column(db.Integer, nullable=False)
+    
+    # queued -> running -> completed | failed
+    status = db.Column(db.String(16), nullable=False, default='queued', index=True)
+    # Per-variant progress: {disability_type: 'pending' | 'completed'}
+    progress = db.Column(db.JSON, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    
+    # LLM scheduling class and tenant of the request that queued the job (see llm_scheduler)
+    priority = db.Column(db.String(16), nullable=False, default='backfill', server_default='backfill')
+    tenant = db.Column(db.String(64))
+    
+    # Variant key of the custom profile the job adapts (see request_custom_adaptation)
+    custom_variant = db.Column(db.String(128))
+    
+    # A running job whose lease has expired belongs to a dead worker and is picked up again
+    lease_expires_at = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'content_type': self.content_type,
+            'content_id': self.content_id,
+            'status': self.status,
+            'progress': self.progress,
+            'completed_variants': sum(1 for state in self.progress.values() if state == 'completed'),
+            'total_variants': len(self.progress),
+            'attempts': self.attempts,
+            'priority': self.priority,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class AdaptationCacheEntry(db.Model):
+    """Persistent tier of the adaptation cache, keyed on a hash of model, prompts and input"""
+    __tablename__ = 'adaptation_cache'
+    
+    key = db.Column(db.String(64), primary_key=True)
+    disability_type = db.Column(db.String(64), nullable=False)
+    model = db.Column(db.String(128), nullable=False)
+    content = db.Column(db.JSON, nullable=False)
+    # Indexed for the TTL sweep
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    hits = db.Column(db.Integer, nullable=False, default=0)
+
+class AdaptationLease(db.Model):
+    """Cross-process single-flight lease: ``owner`` (a process id) is calling the LLM for ``key``"""
+    __tablename__ = 'adaptation_leases'
+    
+    key = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(64), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class TranslationMemoryEntry(db.Model):
+    """Persistent tier of the translation memory: one adapted string per source string and prompt"""
+    __tablename__ = 'translation_memory'
+    # Clustered on the 16-byte key, so the table is its own index
+    __table_args__ = {'sqlite_with_rowid': False}
+    
+    key = db.Column(db.LargeBinary(16), primary_key=True)
+    adapted = db.Column(db.Text, nullable=False)
+    hits = db.Column(db.Integer, nullable=False, default=0)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class CustomProfileEntry(db.Model):
+    """Normalized text of a custom disability profile, so queued jobs can rebuild its prompt"""
+    __tablename__ = 'custom_profiles'
+    
+    variant_key = db.Column(db.String(128), primary_key=True)
+    description = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SearchDocument(db.Model):
+    """Maps rows of the content_search FTS5 index (by rowid) to the content they were built from"""
+    __tablename__ = 'search_documents'
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', 'variant_key', name='uq_search_documents_entity_variant'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    # 'original' or an adaptive variant key
+    variant_key = db.Column(db.String(128), nullable=False)
+
+# Indexed text columns of content_search, filled from the content fields of the same name
+SEARCH_FIELDS = ['name', 'location', 'description', 'amenities', 'accessibility_features', 'itinerary']
+
+SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS content_search USING fts5("
+    f"{', '.join(SEARCH_FIELDS)}, tokenize = 'porter unicode61 remove_diacritics 2')"
+)
+db.event.listen(db.metadata, 'after_create', db.DDL(SEARCH_INDEX_DDL))
+db.event.listen(db.metadata, 'before_drop', db.DDL("DROP TABLE IF EXISTS content_search"))
+
+# Content types addressable by the generic endpoints: (record model, content model)
+CONTENT_TYPES = {
+    'hotel': (Hotel, HotelContentModel),
+    'tour': (Tour, TourContentModel),
+    'care-service': (CareService, CareServiceContentModel)
+}
+
+# Variant keys of custom profiles: CUSTOM_VARIANT_PREFIX + hash of the normalized description
+CUSTOM_VARIANT_PREFIX = 'custom:'
+
+# Normalized free text that names a built-in type: "low vision", "Low_Vision", "LOW-VISION"
+BUILTIN_PROFILE_NAMES = {disability_type.value.replace('_', ' '): disability_type for disability_type in DisabilityType}
+
+class CustomProfileLimitError(RuntimeError):
+    """Raised when CUSTOM_PROFILE_JOBS_PER_HOUR custom profile jobs have been queued in the last hour"""
+
+class CustomProfile:
+    """
+    A free-text disability description, adapted like a DisabilityType. ``value`` is
+    the shared label used for metrics and cache rows; the variant is stored under
+    ``variant_key``. Descriptions that normalize to the same text share one variant.
+    """
+    value = 'custom'
+
+    def __init__(self, description: str):
+        self.description = description
+        digest = hashlib.sha256(description.encode('utf-8')).hexdigest()[:20]
+        self.variant_key = f'{CUSTOM_VARIANT_PREFIX}{digest}'
+
+    def __str__(self) -> str:
+        return self.variant_key
 
-# Content Adaptation Service
-class ContentAdaptationService:
     @staticmethod
-    def adapt_content_for_disability(content_model: BaseModel, disability_type: DisabilityType, model_class: BaseModel) -> Dict:
+    def normalize(text: str) -> str:
+        """Case-folded NFKC words; punctuation and runs of whitespace collapse to one space"""
+        return ' '.join(re.findall(r'\w+', unicodedata.normalize('NFKC', text).casefold()))
+
+    @classmethod
+    def from_text(cls, text: str) -> Optional[Union[DisabilityType, 'CustomProfile']]:
         """
-        Use AI to adapt content for specific disability type while maintaining the same model structure
+        Profile for user input, or None if it has no words; raises ValueError if too long.
+        Text naming a built-in type (e.g. "Low vision") gives that DisabilityType.
         """
+        if len(text) > app.config['CUSTOM_PROFILE_MAX_CHARS']:
+            raise ValueError(f"Custom disability profile is longer than {app.config['CUSTOM_PROFILE_MAX_CHARS']} characters")
+        description = cls.normalize(text)
+        builtin = BUILTIN_PROFILE_NAMES.get(description.replace('_', ' '))
+        if builtin is not None:
+            return builtin
+        return cls(description) if description else None
+
+    @classmethod
+    def load(cls, variant_key: str) -> Optional['CustomProfile']:
+        description = db.session.query(CustomProfileEntry.description).filter_by(variant_key=variant_key).scalar()
+        return cls(description) if description is not None else None
+
+def adaptation_instructions(disability_type) -> str:
+    """The adaptation prompt of a DisabilityType or CustomProfile"""
+    if isinstance(disability_type, CustomProfile):
+        return CUSTOM_PROFILE_PROMPT.format(description=disability_type.description)
+    return ADAPTATION_PROMPTS.get(disability_type, "")
+
+class AdaptationParseError(ValueError):
+    """Raised when an LLM reply cannot be parsed or validated"""
+
+def diff_content_fields(old: Dict, new: Dict) -> Dict[str, Optional[List[int]]]:
+    """
+    Compare two content dicts field by field. Returns ``{field: None}`` for fields that
+    changed as a whole and ``{field: [indices]}`` for list fields where only some items
+    were edited or appended (an empty list means items were only removed).
+    """
+    changes = {}
+    for field, value in new.items():
+        previous = old.get(field)
+        if previous == value:
+            continue
+        if isinstance(previous, list) and isinstance(value, list):
+            changes[field] = [
+                index for index, item in enumerate(value)
+                if index >= len(previous) or previous[index] != item
+            ]
+        else:
+            changes[field] = None
+    return changes
+
+def estimate_tokens(value) -> int:
+    """Rough token count of a JSON value (about four characters per token)"""
+    return len(json.dumps(value, ensure_ascii=False)) // 4 + 1
+
+def split_content(content_dict: Dict, max_tokens: int) -> Tuple[List[Dict], Dict[str, type]]:
+    """
+    Split a content dict into partial dicts of at most ``max_tokens`` (estimated).
+    Small fields are packed together in order; a list or dict field that is too big
+    on its own is cut into slices of consecutive items. Returns the chunks and
+    ``{field: list | dict}`` for the fields that were sliced. A single value that is
+    still too big (e.g. one very long string) becomes a chunk of its own.
+    """
+    chunks, sliced = [], {}
+    group, group_tokens = {}, 0
+    for field, value in content_dict.items():
+        tokens = estimate_tokens({field: value})
+        if tokens > max_tokens and isinstance(value, (list, dict)) and len(value) > 1:
+            sliced[field] = type(value)
+            items = list(value.items()) if isinstance(value, dict) else value
+            piece, piece_tokens = [], 0
+            for item in items:
+                item_tokens = estimate_tokens(item)
+                if piece and piece_tokens + item_tokens > max_tokens:
+                    chunks.append({field: dict(piece) if isinstance(value, dict) else piece})
+                    piece, piece_tokens = [], 0
+                piece.append(item)
+                piece_tokens += item_tokens
+            chunks.append({field: dict(piece) if isinstance(value, dict) else piece})
+            continue
+        if group and group_tokens + tokens > max_tokens:
+            chunks.append(group)
+            group, group_tokens = {}, 0
+        group[field] = value
+        group_tokens += tokens
+    if group:
+        chunks.append(group)
+    return chunks, sliced
+
+def same_fields(expected: Dict) -> Callable[[Dict], Dict]:
+    """Validator for partial adaptations: the reply must have exactly the fields of ``expected``"""
+    def validate(adapted: Dict) -> Dict:
+        if set(adapted) != set(expected):
+            raise ValueError(f'expected fields {sorted(expected)}, got {sorted(adapted)}')
+        return adapted
+    return validate
+
+def merge_content_chunks(content_dict: Dict, chunks: List[Dict], sliced: Dict[str, type]) -> Dict:
+    """Reassemble adapted chunks from ``split_content`` in the field order of ``content_dict``"""
+    merged = {}
+    for chunk in chunks:
+        for field, value in chunk.items():
+            if sliced.get(field) is list:
+                merged.setdefault(field, []).extend(value)
+            elif sliced.get(field) is dict:
+                merged.setdefault(field, {}).update(value)
+            else:
+                merged[field] = value
+    return {field: merged[field] for field in content_dict if field in merged}
+
+class JsonFieldProgress:
+    """
+    Incrementally scans a streamed JSON object and reports each top-level field
+    as soon as its value is complete. Anything before the first '{' (such as a
+    markdown fence) is ignored.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.completed = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string = []
+        self._last_string = None
+        self._current_key = None
+
+    def feed(self, text: str) -> List[str]:
+        finished = []
+        for char in text:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = ''.join(self._string)
+                    continue
+                if self._depth == 1:
+                    self._string.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0 and self._current_key is not None:
+                    finished.append(self._current_key)
+                    self._current_key = None
+            elif self._depth == 1 and char == ':':
+                self._current_key = self._last_string
+            elif self._depth == 1 and char == ',' and self._current_key is not None:
+                finished.append(self._current_key)
+                self._current_key = None
+        self.completed += len(finished)
+        return finished
+
+def sse_event(event: str, data: Dict) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+# Full-Text Search
+def search_text(value) -> str:
+    """Flatten a content value (string, dict or list) into plain text for indexing"""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return '\n'.join(f'{key}: {search_text(item)}' for key, item in value.items())
+    if isinstance(value, list):
+        return '\n'.join(search_text(item) for item in value)
+    return str(value)
+
+def index_search_document(connection, entity_type: str, entity_id: int, variant_key: str, content: Optional[Dict]):
+    """Insert or replace one document in the content_search index, on the caller's connection"""
+    documents = SearchDocument.__table__
+    document_id = connection.execute(db.select(documents.c.id).where(
+        documents.c.entity_type == entity_type,
+        documents.c.entity_id == entity_id,
+        documents.c.variant_key == variant_key
+    )).scalar()
+    if document_id is None:
+        document_id = connection.execute(documents.insert().values(
+            entity_type=entity_type, entity_id=entity_id, variant_key=variant_key
+        )).inserted_primary_key[0]
+    else:
+        connection.execute(db.text("DELETE FROM content_search WHERE rowid = :rowid"), {'rowid': document_id})
+    
+    if content:
+        connection.execute(
+            db.text(f"INSERT INTO content_search (rowid, {', '.join(SEARCH_FIELDS)}) "
+                    f"VALUES (:rowid, {', '.join(':' + field for field in SEARCH_FIELDS)})"),
+            {'rowid': document_id, **{field: search_text(content.get(field)) for field in SEARCH_FIELDS}}
+        )
+
+def fts_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every term must match, the last one as a prefix"""
+    terms = [term for term in re.findall(r'\w+', text.lower()) if term]
+    if not terms:
+        return ''
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + (' ' if len(terms) > 1 else '') + f'"{terms[-1]}"*'
+
+def _index_record_original(mapper, connection, record):
+    if not app.config['SEARCH_INDEX_ENABLED']:
+        return
+    if db.inspect(record).attrs.original_content.history.has_changes():
+        index_search_document(connection, record.entity_type, record.id, 'original', record.original_content)
+
+def _index_content_variant(mapper, connection, variant):
+    if not (app.config['SEARCH_INDEX_ENABLED'] and app.config['SEARCH_INDEX_VARIANTS']):
+        return
+    # Custom profile variants are per-user and short-lived; search covers the shared variants
+    if variant.variant_key.startswith(CUSTOM_VARIANT_PREFIX):
+        return
+    if db.inspect(variant).attrs.content.history.has_changes():
+        index_search_document(connection, variant.entity_type, variant.entity_id, variant.variant_key, variant.content)
+
+# Keep the index in step with every write path (create, PATCH, regenerate, jobs, import)
+for _model in (Hotel, Tour, CareService):
+    db.event.listen(_model, 'after_insert', _index_record_original)
+    db.event.listen(_model, 'after_update', _index_record_original)
+db.event.listen(ContentVariant, 'after_insert', _index_content_variant)
+db.event.listen(ContentVariant, 'after_update', _index_content_variant)
+
+# Adaptation Cache
+class AdaptationCache:
+    """Two-tier cache for validated LLM adaptations.
+
+    An in-process LRU (``ADAPTATION_CACHE_MEMORY_ENTRIES``) sits in front of the
+    ``adaptation_cache`` table, which is bounded to ``ADAPTATION_CACHE_MAX_ROWS``
+    by evicting the least recently used rows at most once per
+    ``ADAPTATION_CACHE_EVICTION_INTERVAL``, so it may briefly overshoot. Both tiers
+    honour ``ADAPTATION_CACHE_TTL``. Safe to call from adaptation worker threads.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                       'memory_evictions': 0, 'disk_evictions': 0, 'expired': 0}
+        self._next_eviction = 0.0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.app.config['ADAPTATION_CACHE_ENABLED']
+
+    def _is_expired(self, stored_at: datetime) -> bool:
+        ttl = self.app.config['ADAPTATION_CACHE_TTL']
+        return bool(ttl) and stored_at < datetime.utcnow() - timedelta(seconds=ttl)
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    def _remember(self, key: str, stored_at: datetime, content: Dict):
+        with self._lock:
+            self._memory[key] = (stored_at, content)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.app.config['ADAPTATION_CACHE_MEMORY_ENTRIES']:
+                self._memory.popitem(last=False)
+                self._stats['memory_evictions'] += 1
+
+    def get(self, key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            if not self._is_expired(entry[0]):
+                self._count('memory_hits')
+                return copy.deepcopy(entry[1])
+            with self._lock:
+                self._memory.pop(key, None)
+
         try:
-            # Check if OpenAI client is available
-            if client is None:
-                print(f"⚠️  OpenAI client not available, returning original content for {disability_type}")
-                return content_model.model_dump()
-            
-            # Convert pydantic model to dict for AI processing
-            content_dict = content_model.model_dump()
-            content_str = json.dumps(content_dict, indent=2)
-            
-            # Get the appropriate prompt
-            prompt = ADAPTATION_PROMPTS.get(disability_type, "")
-            
-            # Create the full prompt
-            full_prompt = f"""
+            with self.app.app_context():
+                row = db.session.get(AdaptationCacheEntry, key)
+                if row is None:
+                    self._count('misses')
+                    return None
+                if self._is_expired(row.created_at):
+                    db.session.delete(row)
+                    db.session.commit()
+                    self._count('expired')
+                    self._count('misses')
+                    return None
+                row.hits += 1
+                row.last_used_at = datetime.utcnow()
+                stored_at, content = row.created_at, row.content
+                db.session.commit()
+        except Exception as e:
+            print(f"⚠️  Adaptation cache lookup failed: {e}")
+            self._count('misses')
+            return None
+
+        self._count('disk_hits')
+        self._remember(key, stored_at, content)
+        return copy.deepcopy(content)
+
+    def put(self, key: str, disability_type: str, model: str, content: Dict):
+        if not self.enabled:
+            return
+
+        now = datetime.utcnow()
+        self._remember(key, now, copy.deepcopy(content))
+        self._count('stores')
+        try:
+            with self.app.app_context():
+                db.session.merge(AdaptationCacheEntry(
+                    key=key, disability_type=disability_type, model=model,
+                    content=content, created_at=now, last_used_at=now
+                ))
+                db.session.commit()
+                if self._eviction_due():
+                    self._evict_rows()
+        except Exception as e:
+            print(f"⚠️  Adaptation cache store failed: {e}")
+
+    def _eviction_due(self) -> bool:
+        """True for the first store of each ADAPTATION_CACHE_EVICTION_INTERVAL"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_eviction:
+                return False
+            self._next_eviction = now + self.app.config['ADAPTATION_CACHE_EVICTION_INTERVAL']
+            return True
+
+    def _evict_rows(self):
+        """Drop expired rows and the least recently used rows above the size bound"""
+        ttl = self.app.config['ADAPTATION_CACHE_TTL']
+        evicted = 0
+        if ttl:
+            cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+            evicted += AdaptationCacheEntry.query.filter(AdaptationCacheEntry.created_at < cutoff).delete()
+        overflow = AdaptationCacheEntry.query.count() - self.app.config['ADAPTATION_CACHE_MAX_ROWS']
+        if overflow > 0:
+            oldest = db.session.query(AdaptationCacheEntry.key).order_by(AdaptationCacheEntry.last_used_at).limit(overflow)
+            evicted += AdaptationCacheEntry.query.filter(AdaptationCacheEntry.key.in_(oldest.scalar_subquery())).delete(synchronize_session=False)
+        if evicted:
+            db.session.commit()
+            self._count('disk_evictions', evicted)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        stats['disk_entries'] = AdaptationCacheEntry.query.count()
+        return stats
+
+adaptation_cache = AdaptationCache(app)
+
+# Single-flight Coalescing
+class Flight:
+    """One in-flight computation that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one computation.
+
+    In ``thread`` mode the first caller of ``run`` for a key computes, and callers
+    arriving while it runs wait and get (a copy of) its result or its exception.
+    In ``sqlite`` mode the computing thread also holds a row in ``adaptation_leases``;
+    a process that finds the lease taken waits until it is released (or expires)
+    and then asks ``lookup`` for the shared result, e.g. from the adaptation cache,
+    computing itself only if there is none.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {'leaders': 0, 'followers': 0, 'lease_waits': 0, 'lease_hits': 0}
+
+    @property
+    def mode(self) -> str:
+        return self.app.config['ADAPTATION_SINGLE_FLIGHT']
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def run(self, key: str, compute: Callable[[], Any], lookup: Optional[Callable[[], Any]] = None,
+            timeout: Optional[float] = None):
+        """Return ``compute()``, shared with concurrent callers for ``key``; followers wait up to ``timeout``"""
+        if self.mode not in ('thread', 'sqlite'):
+            return compute()
+        
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            self._stats['leaders' if leader else 'followers'] += 1
+        
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f'Timed out after {timeout}s waiting for an identical adaptation in flight')
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        
+        try:
+            if self.mode == 'sqlite' and lookup is not None:
+                flight.result = self._run_leased(key, compute, lookup, timeout)
+            else:
+                flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _run_leased(self, key: str, compute: Callable[[], Any], lookup: Callable[[], Any], timeout: Optional[float]):
+        deadline = time.monotonic() + timeout if timeout else None
+        if not self._acquire(key):
+            self._count('lease_waits')
+            while True:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f'Timed out after {timeout}s waiting for another worker\'s identical adaptation')
+                time.sleep(self.app.config['ADAPTATION_LEASE_POLL_INTERVAL'])
+                if not self._is_held(key) and self._acquire(key):
+                    break
+            # The previous holder finished: use its result unless it failed
+            result = lookup()
+            if result is not None:
+                self._count('lease_hits')
+                self._release(key)
+                return result
+        try:
+            return compute()
+        finally:
+            self._release(key)
+
+    def _acquire(self, key: str) -> bool:
+        now = datetime.utcnow()
+        leases = AdaptationLease.__table__
+        statement = sqlite_insert(leases).values(
+            key=key, owner=str(os.getpid()),
+            expires_at=now + timedelta(seconds=self.app.config['ADAPTATION_LEASE_SECONDS'])
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[leases.c.key],
+            set_={'owner': statement.excluded.owner, 'expires_at': statement.excluded.expires_at},
+            where=leases.c.expires_at < now
+        )
+        with self.app.app_context(), db.engine.begin() as connection:
+            return connection.execute(statement).rowcount == 1
+
+    def _is_held(self, key: str) -> bool:
+        leases = AdaptationLease.__table__
+        with self.app.app_context(), db.engine.connect() as connection:
+            expires_at = connection.execute(db.select(leases.c.expires_at).where(leases.c.key == key)).scalar()
+        return expires_at is not None and expires_at >= datetime.utcnow()
+
+    def _release(self, key: str):
+        leases = AdaptationLease.__table__
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(leases.delete().where(leases.c.key == key, leases.c.owner == str(os.getpid())))
+        except Exception as e:
+            # The lease expires on its own
+            print(f"⚠️  Releasing adaptation lease failed: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._flights)
+        stats['mode'] = self.mode
+        return stats
+
+single_flight = SingleFlight(app)
+
+# Translation Memory
+# Fields whose strings repeat almost word for word across records (e.g. hotels of a chain)
+TRANSLATION_MEMORY_FIELDS = ('amenities', 'accessibility_features', 'meal_times', 'cancellation_conditions')
+
+# Where a string sits in a content dict: (field, key within a dict field or None for a string field)
+MemoryUnit = Tuple[str, Optional[str]]
+
+class TranslationMemory:
+    """Per-string adaptations of the fields in ``TRANSLATION_MEMORY_FIELDS``.
+
+    Adapted strings are keyed by a 16-byte digest of the model, the prompts of the
+    disability type and the normalized source text. An in-process LRU
+    (``TRANSLATION_MEMORY_MEMORY_ENTRIES``) sits in front of the ``translation_memory``
+    table, which is bounded to ``TRANSLATION_MEMORY_MAX_ROWS`` by evicting the least
+    recently used rows at most once per ``TRANSLATION_MEMORY_EVICTION_INTERVAL``.
+    Safe to call from adaptation worker threads.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._memory: 'OrderedDict[bytes, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'documents': 0, 'strings': 0, 'string_hits': 0, 'document_chars': 0, 'served_chars': 0,
+                       'stores': 0, 'disk_evictions': 0}
+        self._next_eviction = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.app.config['TRANSLATION_MEMORY_ENABLED']
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Case-folded NFKC text with runs of whitespace collapsed"""
+        return ' '.join(unicodedata.normalize('NFKC', text).split()).casefold()
+
+    def make_key(self, disability_type: DisabilityType, text: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.app.config['LLM_MODEL'], ADAPTATION_SYSTEM_PROMPT,
+                     adaptation_instructions(disability_type), self.normalize(text)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.digest()
+
+    @staticmethod
+    def strings(content_dict: Dict) -> Dict[MemoryUnit, str]:
+        """The non-empty strings of the memory fields in a (possibly partial) content dict"""
+        strings = {}
+        for field in TRANSLATION_MEMORY_FIELDS:
+            value = content_dict.get(field)
+            if isinstance(value, str) and value.strip():
+                strings[(field, None)] = value
+            elif isinstance(value, dict):
+                for name, text in value.items():
+                    if isinstance(text, str) and text.strip():
+                        strings[(field, name)] = text
+        return strings
+
+    def _remember(self, key: bytes, adapted: str):
+        with self._lock:
+            self._memory[key] = adapted
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.app.config['TRANSLATION_MEMORY_MEMORY_ENTRIES']:
+                self._memory.popitem(last=False)
+
+    def recall(self, content_dict: Dict, disability_type: DisabilityType) -> Dict[MemoryUnit, str]:
+        """Return the remembered adaptations of the strings in ``content_dict``, and count the hit rate"""
+        strings = self.strings(content_dict) if self.enabled else {}
+        if not strings:
+            return {}
+        
+        keys = {unit: self.make_key(disability_type, text) for unit, text in strings.items()}
+        found = {}
+        with self._lock:
+            for key in set(keys.values()):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+        missing = set(keys.values()) - set(found)
+        if missing:
+            try:
+                with self.app.app_context():
+                    rows = db.session.execute(
+                        db.select(TranslationMemoryEntry.key, TranslationMemoryEntry.adapted)
+                        .where(TranslationMemoryEntry.key.in_(missing))
+                    ).all()
+                    if rows:
+                        db.session.execute(
+                            db.update(TranslationMemoryEntry)
+                            .where(TranslationMemoryEntry.key.in_([key for key, _ in rows]))
+                            .values(hits=TranslationMemoryEntry.hits + 1, last_used_at=datetime.utcnow())
+                        )
+                        db.session.commit()
+            except Exception as e:
+                print(f"⚠️  Translation memory lookup failed: {e}")
+                rows = []
+            for key, adapted in rows:
+                found[key] = adapted
+                self._remember(key, adapted)
+        
+        recalled = {unit: found[key] for unit, key in keys.items() if key in found}
+        document_chars = len(json.dumps(content_dict, ensure_ascii=False))
+        served_chars = sum(len(strings[unit]) for unit in recalled)
+        with self._lock:
+            self._stats['documents'] += 1
+            self._stats['strings'] += len(strings)
+            self._stats['string_hits'] += len(recalled)
+            self._stats['document_chars'] += document_chars
+            self._stats['served_chars'] += served_chars
+        translation_memory_served.observe(served_chars / document_chars, disability_type=disability_type.value)
+        return recalled
+
+    @staticmethod
+    def without(content_dict: Dict, recalled: Dict[MemoryUnit, str]) -> Dict:
+        """``content_dict`` minus the recalled strings; dict fields left empty are dropped"""
+        document = dict(content_dict)
+        for field, name in recalled:
+            if name is None:
+                document.pop(field, None)
+                continue
+            if document.get(field) is content_dict[field]:
+                document[field] = dict(content_dict[field])
+            document[field].pop(name, None)
+            if not document[field]:
+                del document[field]
+        return document
+
+    @staticmethod
+    def fill(adapted: Dict, content_dict: Dict, recalled: Dict[MemoryUnit, str]) -> Dict:
+        """Put the recalled strings back into an adaptation of ``without(content_dict, recalled)``"""
+        filled = dict(adapted)
+        for field in dict.fromkeys(field for field, _ in recalled):
+            if not isinstance(content_dict[field], dict):
+                filled[field] = recalled[(field, None)]
+                continue
+            adapted_items = adapted.get(field, {})
+            if not isinstance(adapted_items, dict):
+                raise ValueError(f'expected an object for {field}')
+            # Source order, with entries the LLM added or renamed at the end
+            items = {}
+            for name in content_dict[field]:
+                if (field, name) in recalled:
+                    items[name] = recalled[(field, name)]
+                elif name in adapted_items:
+                    items[name] = adapted_items[name]
+            for name, value in adapted_items.items():
+                items.setdefault(name, value)
+            filled[field] = items
+        return filled
+
+    def learn(self, source: Dict, adapted: Dict, disability_type: DisabilityType):
+        """Remember each memory string of ``source`` whose adaptation sits at the same place in ``adapted``"""
+        if not self.enabled:
+            return
+        
+        pairs = {}
+        for (field, name), text in self.strings(source).items():
+            value = adapted.get(field)
+            if name is not None:
+                value = value.get(name) if isinstance(value, dict) else None
+            if isinstance(value, str) and value.strip():
+                pairs[self.make_key(disability_type, text)] = value
+        if not pairs:
+            return
+        
+        for key, value in pairs.items():
+            self._remember(key, value)
+        with self._lock:
+            self._stats['stores'] += len(pairs)
+        now = datetime.utcnow()
+        try:
+            with self.app.app_context():
+                db.session.execute(
+                    db.insert(TranslationMemoryEntry).prefix_with('OR IGNORE'),
+                    [{'key': key, 'adapted': value, 'hits': 0, 'last_used_at': now} for key, value in pairs.items()]
+                )
+                db.session.commit()
+                if self._eviction_due():
+                    self._evict_rows()
+        except Exception as e:
+            print(f"⚠️  Translation memory store failed: {e}")
+
+    def _eviction_due(self) -> bool:
+        """True for the first store of each TRANSLATION_MEMORY_EVICTION_INTERVAL"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_eviction:
+                return False
+            self._next_eviction = now + self.app.config['TRANSLATION_MEMORY_EVICTION_INTERVAL']
+            return True
+
+    def _evict_rows(self):
+        overflow = TranslationMemoryEntry.query.count() - self.app.config['TRANSLATION_MEMORY_MAX_ROWS']
+        if overflow > 0:
+            oldest = db.session.query(TranslationMemoryEntry.key).order_by(TranslationMemoryEntry.last_used_at).limit(overflow)
+            evicted = TranslationMemoryEntry.query.filter(TranslationMemoryEntry.key.in_(oldest.scalar_subquery())).delete(synchronize_session=False)
+            db.session.commit()
+            with self._lock:
+                self._stats['disk_evictions'] += evicted
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        stats['string_hit_rate'] = round(stats['string_hits'] / stats['strings'], 4) if stats['strings'] else 0.0
+        # Share of all looked-up document text that did not have to be sent to the LLM
+        stats['served_share'] = round(stats['served_chars'] / stats['document_chars'], 4) if stats['document_chars'] else 0.0
+        stats['disk_entries'] = TranslationMemoryEntry.query.count()
+        return stats
+
+translation_memory = TranslationMemory(app)
+
+# Detail Response Cache
+class ResponseCache:
+    """
+    LRU cache of serialized responses ``(body, etag, last_modified)`` keyed by
+    ``(content_type, id, variant)``,
+    bounded by total size (``DETAIL_CACHE_MAX_BYTES``) and ``DETAIL_CACHE_TTL``.
+    Entries of a record are dropped whenever a flush or commit touches the record
+    or one of its variants.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._keys_by_record: Dict[tuple, set] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, key: tuple) -> Optional[Tuple[bytes, str, Optional[datetime]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            ttl = self.app.config['DETAIL_CACHE_TTL']
+            if entry is not None and ttl and time.monotonic() - entry[0] > ttl:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key: tuple, body: bytes, etag: str, last_modified: Optional[datetime] = None):
+        max_bytes = self.app.config['DETAIL_CACHE_MAX_BYTES']
+        if len(body) > max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic(), (body, etag, last_modified))
+            self._keys_by_record.setdefault(key[:2], set()).add(key)
+            self._size += len(body)
+            while self._size > max_bytes:
+                self._discard(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def invalidate(self, content_type: str, record_id: int):
+        with self._lock:
+            for key in list(self._keys_by_record.get((content_type, record_id), ())):
+                self._discard(key)
+                self._stats['invalidations'] += 1
+
+    def _discard(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(entry[1][0])
+        keys = self._keys_by_record.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_record[key[:2]]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries), 'bytes': self._size}
+
+detail_cache = ResponseCache(app)
+
+def _touched_records(session) -> set:
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ContentVariant):
+            touched.add((obj.entity_type, obj.entity_id))
+        elif isinstance(obj, (Hotel, Tour, CareService)) and obj.id is not None:
+            touched.add((obj.entity_type, obj.id))
+    return touched
+
+@db.event.listens_for(SQLAlchemySession, 'after_flush')
+def _invalidate_detail_cache_on_flush(session, flush_context):
+    # Drop entries now and again after commit, so a read racing the commit cannot leave stale data
+    touched = _touched_records(session)
+    session.info.setdefault('detail_cache_touched', set()).update(touched)
+    for content_type, record_id in touched:
+        detail_cache.invalidate(content_type, record_id)
+
+@db.event.listens_for(SQLAlchemySession, 'after_commit')
+def _invalidate_detail_cache_on_commit(session):
+    for content_type, record_id in session.info.pop('detail_cache_touched', ()):
+        detail_cache.invalidate(content_type, record_id)
+
+@db.event.listens_for(SQLAlchemySession, 'after_rollback')
+def _forget_detail_cache_touches(session):
+    session.info.pop('detail_cache_touched', None)
+
+# Content Adaptation Service
+class ContentAdaptationService:
+    @staticmethod
+    def build_adaptation_prompt(content_dict: Dict, disability_type: DisabilityType) -> str:
+        """Build the user prompt asking the LLM to adapt a content document"""
+        content_str = json.dumps(content_dict, indent=2)
+        
+        # Get the appropriate prompt
+        prompt = adaptation_instructions(disability_type)
+        
+        # Create the full prompt
+        return f"""
             {prompt}
             
             IMPORTANT: You must return content that follows the exact same structure as the input.
@@ -251,111 +1566,949 @@ class ContentAdaptationService:
             
             Please return only valid JSON with the adapted content using the same field structure.
             """
+
+    @staticmethod
+    def build_combined_prompt(content_dict: Dict, disability_types: List[DisabilityType]) -> str:
+        """Build the user prompt asking for several adaptations of one document in a single reply"""
+        content_str = json.dumps(content_dict, indent=2)
+        keys = ', '.join(f'"{disability_type.value}"' for disability_type in disability_types)
+        instructions = '\n'.join(
+            f'Variant "{disability_type.value}":\n{adaptation_instructions(disability_type)}'
+            for disability_type in disability_types
+        )
+        
+        return f"""
+            Produce one adapted version of the content below for each of these variants:
             
-            # Call OpenAI API
-            response = client.chat.completions.create(
-                model="openai/gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an accessibility expert who adapts content for people with disabilities. Always return valid JSON with the exact same structure as input."},
-                    {"role": "user", "content": full_prompt}
-                ],
-                max_tokens=4096,
-                temperature=0.3
-            )
+            {instructions}
             
-            # Parse the response
-            adapted_content = response.choices[0].message.content.strip()
+            IMPORTANT: Return a single JSON object whose keys are exactly {keys}.
+            Each value must follow the exact same structure as the input.
+            All field names must remain identical. Only modify the content/values, not the structure.
             
-            # Clean up the response (remove any markdown formatting)
-            if adapted_content.startswith('```json'):
-                adapted_content = adapted_content[7:]
-            if adapted_content.endswith('```'):
-                adapted_content = adapted_content[:-3]
-            adapted_content = adapted_content.strip()
+            Original Content:
+            {content_str}
             
-            # Try to parse and validate as JSON
+            Please return only valid JSON with one adapted copy of the content per variant key.
+            """
+
+    @staticmethod
+    def cache_key(content_dict: Dict, disability_type: DisabilityType) -> str:
+        """Adaptation cache key of a single-variant adaptation of ``content_dict``"""
+        full_prompt = ContentAdaptationService.build_adaptation_prompt(content_dict, disability_type)
+        return AdaptationCache.make_key(app.config['LLM_MODEL'], ADAPTATION_SYSTEM_PROMPT, full_prompt)
+
+    @staticmethod
+    def parse_adaptation_response(adapted_content: str) -> Dict:
+        """Parse the LLM reply into a dict, tolerating markdown code fences"""
+        adapted_content = adapted_content.strip()
+        
+        # Clean up the response (remove any markdown formatting)
+        if adapted_content.startswith('```json'):
+            adapted_content = adapted_content[7:]
+        if adapted_content.endswith('```'):
+            adapted_content = adapted_content[:-3]
+        adapted_content = adapted_content.strip()
+        
+        return json.loads(adapted_content)
+
+    @staticmethod
+    def routed_completion(prompt: str, label: str, reply_tokens: int, max_tokens: int, timeout: Optional[float],
+                          accept: Callable[[str], Any]) -> Tuple[Any, str]:
+        """
+        Send ``prompt`` to the model picked by ``llm_router`` (hedged with a second model when
+        it is slow) and return ``(accept(reply_text), model)`` for the first reply that
+        ``accept`` takes. ``reply_tokens`` is the expected reply size, used for routing.
+        """
+        messages = [
+            {"role": "system", "content": ADAPTATION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        
+        def attempt(model: str, cancelled: Optional[threading.Event]):
+            if cancelled is None:
+                response = llm_gateway.chat_completion(
+                    model=model, messages=messages, max_tokens=max_tokens, temperature=0.3, deadline=timeout
+                )
+                record_llm_usage(response, label)
+                reply, finish_reason = response.choices[0].message.content, getattr(response.choices[0], 'finish_reason', None)
+            else:
+                # Streamed, so the losing request of a hedged pair is cut off mid-reply
+                stream = llm_gateway.chat_completion(
+                    model=model, messages=messages, max_tokens=max_tokens, temperature=0.3,
+                    stream=True, stream_options={'include_usage': True}, deadline=timeout
+                )
+                parts, finish_reason = [], None
+                try:
+                    for chunk in stream:
+                        if cancelled.is_set():
+                            raise HedgeCancelled(f'{model} lost the hedged race')
+                        record_llm_usage(chunk, label)
+                        if chunk.choices:
+                            parts.append(chunk.choices[0].delta.content or '')
+                            finish_reason = getattr(chunk.choices[0], 'finish_reason', None) or finish_reason
+                finally:
+                    # Closing the stream drops the connection, which stops generation upstream
+                    if hasattr(stream, 'close'):
+                        stream.close()
+                reply = ''.join(parts)
+            
+            # A reply cut off at max_tokens can never parse; say so instead of a JSON error
+            if finish_reason == 'length':
+                raise AdaptationParseError('LLM reply truncated at max_tokens')
+            return accept(reply)
+        
+        # Hedged attempts run on threads of their own
+        return llm_router.run(len(prompt) // 4 + reply_tokens, profiled_thread(attempt), timeout)
+
+    @staticmethod
+    def adapt_dict(content_dict: Dict, disability_type: DisabilityType, validate: Callable[[Dict], Dict],
+                   timeout: Optional[float] = None) -> Dict:
+        """
+        Adapt a (possibly partial) content dict with the LLM and return the validated result.
+        ``validate`` turns the parsed reply into the final dict or raises. Replies are
+        cached only once they validate, but the cache holds the parsed reply, not the
+        caller's result: ``validate`` may be record-specific (PATCH merges the reply into
+        one record's variant), so it runs on every hit. Raises LLMUnavailableError,
+        AdaptationParseError or the client's own exceptions instead of falling back.
+        """
+        full_prompt = ContentAdaptationService.build_adaptation_prompt(content_dict, disability_type)
+        model_name = app.config['LLM_MODEL']
+        
+        # Identical input, prompt and model always give an equivalent adaptation
+        cache_key = AdaptationCache.make_key(model_name, ADAPTATION_SYSTEM_PROMPT, full_prompt)
+        cached = adaptation_cache.get(cache_key)
+        if cached is not None:
             try:
-                adapted_dict = json.loads(adapted_content)
-                
-                # Validate using the same pydantic model
-                validated_content = model_class(**adapted_dict)
-                return validated_content.dict()
-                
-            except (json.JSONDecodeError, Exception) as parse_error:
-                print(f"Failed to parse/validate AI response for {disability_type}: {str(parse_error)}")
-                return content_dict
-                
+                return validate(cached)
+            except Exception as parse_error:
+                raise AdaptationParseError(str(parse_error)) from parse_error
+        
+        # Check if OpenAI client is available
+        if not llm_gateway.available:
+            raise LLMUnavailableError('OpenAI client not available')
+        
+        leader = {}
+        
+        def accept(reply: str) -> Tuple[Dict, Dict]:
+            # Try to parse and validate as JSON
+            try:
+                adapted_dict = ContentAdaptationService.parse_adaptation_response(reply)
+                return adapted_dict, validate(adapted_dict)
+            except Exception as parse_error:
+                raise AdaptationParseError(str(parse_error)) from parse_error
+        
+        def complete() -> Dict:
+            # Call the routed model(s) through the gateway (retries, deadline, circuit breaker)
+            (adapted_dict, leader['content']), adapted_by = ContentAdaptationService.routed_completion(
+                full_prompt, disability_type.value, estimate_tokens(content_dict), 4096, timeout, accept
+            )
+            
+            # Only replies that validated are cached, never fallbacks. This happens before
+            # the single-flight lease is released, so waiting workers find the result.
+            adaptation_cache.put(cache_key, disability_type.value, adapted_by, adapted_dict)
+            return adapted_dict
+        
+        # Identical adaptations in flight (other editors, duplicate documents) share the call
+        adapted_dict = single_flight.run(
+            cache_key, complete,
+            lookup=(lambda: adaptation_cache.get(cache_key)) if adaptation_cache.enabled else None,
+            timeout=timeout
+        )
+        if 'content' in leader:
+            return leader['content']
+        
+        # Shared reply (or another worker's cached result): validate it for this caller
+        try:
+            return validate(adapted_dict)
+        except Exception as parse_error:
+            raise AdaptationParseError(str(parse_error)) from parse_error
+
+    @staticmethod
+    def needs_chunking(content_dict: Dict) -> bool:
+        return app.config['ADAPTATION_CHUNKING'] and estimate_tokens(content_dict) > app.config['ADAPTATION_CHUNK_TOKENS']
+
+    @staticmethod
+    def adapt_document(content_dict: Dict, disability_type: DisabilityType, validate: Callable[[Dict], Dict],
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Like ``adapt_chunked``, but strings already in the translation memory are filled in
+        locally and left out of the request. The novel strings are remembered once the
+        whole document validates.
+        """
+        recalled = translation_memory.recall(content_dict, disability_type)
+        if not recalled:
+            validated_content = ContentAdaptationService.adapt_chunked(content_dict, disability_type, validate, timeout)
+            translation_memory.learn(content_dict, validated_content, disability_type)
+            return validated_content
+        
+        # The whole document may have been cached before its strings were remembered
+        # (as a reply, which ``validate`` still has to turn into this caller's result)
+        cache_key = ContentAdaptationService.cache_key(content_dict, disability_type)
+        filled = adaptation_cache.get(cache_key)
+        if filled is None:
+            document = TranslationMemory.without(content_dict, recalled)
+            # Nothing left to send when every field is a remembered string
+            adapted = ContentAdaptationService.adapt_chunked(document, disability_type, same_fields(document), timeout) if document else {}
+            filled = TranslationMemory.fill(adapted, content_dict, recalled)
+        else:
+            document = None
+        try:
+            validated_content = validate(filled)
+        except Exception as parse_error:
+            raise AdaptationParseError(str(parse_error)) from parse_error
+        
+        if document is not None:
+            translation_memory.learn(document, adapted, disability_type)
+            adaptation_cache.put(cache_key, disability_type.value, app.config['LLM_MODEL'], filled)
+        return validated_content
+
+    @staticmethod
+    def adapt_chunked(content_dict: Dict, disability_type: DisabilityType, validate: Callable[[Dict], Dict],
+                      timeout: Optional[float] = None) -> Dict:
+        """
+        Like ``adapt_dict``, but documents above ``ADAPTATION_CHUNK_TOKENS`` are split with
+        ``split_content``, the chunks adapted in parallel (each cached on its own) and the
+        reassembled document passed to ``validate``. Any failed chunk fails the whole document.
+        """
+        if not ContentAdaptationService.needs_chunking(content_dict):
+            return ContentAdaptationService.adapt_dict(content_dict, disability_type, validate, timeout)
+        
+        chunks, sliced = split_content(content_dict, app.config['ADAPTATION_CHUNK_TOKENS'])
+        
+        def adapt_chunk(chunk: Dict) -> Dict:
+            return ContentAdaptationService.adapt_dict(chunk, disability_type, same_fields(chunk), timeout)
+        
+        workers = max(1, min(app.config['ADAPTATION_CHUNK_CONCURRENCY'], len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='adaptation-chunk') as executor:
+            adapted_chunks = list(executor.map(in_current_context(profiled_thread(adapt_chunk)), chunks))
+        
+        try:
+            return validate(merge_content_chunks(content_dict, adapted_chunks, sliced))
+        except Exception as parse_error:
+            raise AdaptationParseError(str(parse_error)) from parse_error
+
+    @staticmethod
+    def stream_adaptation(content_dict: Dict, disability_type: DisabilityType, validate: Callable[[Dict], Dict],
+                          timeout: Optional[float] = None) -> Iterator[Tuple[str, Union[str, Dict]]]:
+        """
+        Streaming variant of ``adapt_dict``: yields ``('token', text)`` for each completion
+        delta and finally ``('result', validated_dict)``. A cache hit yields only the result,
+        as do documents big enough to need chunking (see ``adapt_document``).
+        """
+        if ContentAdaptationService.needs_chunking(content_dict):
+            yield 'result', ContentAdaptationService.adapt_document(content_dict, disability_type, validate, timeout)
+            return
+        
+        full_prompt = ContentAdaptationService.build_adaptation_prompt(content_dict, disability_type)
+        model_name = app.config['LLM_MODEL']
+        
+        cache_key = AdaptationCache.make_key(model_name, ADAPTATION_SYSTEM_PROMPT, full_prompt)
+        cached = adaptation_cache.get(cache_key)
+        if cached is not None:
+            try:
+                yield 'result', validate(cached)
+            except Exception as parse_error:
+                raise AdaptationParseError(str(parse_error)) from parse_error
+            return
+        
+        if not llm_gateway.available:
+            raise LLMUnavailableError('OpenAI client not available')
+        
+        # Routed like other calls, but never hedged: the client already sees this reply's tokens
+        size = len(full_prompt) // 4 + estimate_tokens(content_dict)
+        routed_model = llm_router.candidates(size)[0]
+        started = time.monotonic()
+        try:
+            stream = llm_gateway.chat_completion(
+                model=routed_model,
+                messages=[
+                    {"role": "system", "content": ADAPTATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": full_prompt}
+                ],
+                max_tokens=4096,
+                temperature=0.3,
+                stream=True,
+                stream_options={'include_usage': True},
+                deadline=timeout
+            )
+            
+            parts = []
+            for chunk in stream:
+                # With include_usage the last chunk carries token usage and no choices
+                record_llm_usage(chunk, disability_type.value)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield 'token', delta
+            
+            try:
+                adapted_dict = ContentAdaptationService.parse_adaptation_response(''.join(parts))
+                validated_content = validate(adapted_dict)
+            except Exception as parse_error:
+                raise AdaptationParseError(str(parse_error)) from parse_error
+        except Exception:
+            llm_router.observe(routed_model, size, None, 'error')
+            raise
+        llm_router.observe(routed_model, size, time.monotonic() - started, 'success')
+        
+        adaptation_cache.put(cache_key, disability_type.value, routed_model, adapted_dict)
+        translation_memory.learn(content_dict, validated_content, disability_type)
+        yield 'result', validated_content
+
+    @staticmethod
+    def adapt_content_for_disability(content_model: BaseModel, disability_type: DisabilityType, model_class: BaseModel, timeout: Optional[float] = None) -> Dict:
+        """
+        Use AI to adapt content for specific disability type while maintaining the same model structure
+        """
+        # Convert pydantic model to dict for AI processing
+        content_dict = content_model.model_dump()
+        try:
+            return ContentAdaptationService.adapt_document(
+                content_dict, disability_type,
+                lambda adapted_dict: model_class(**adapted_dict).model_dump(),
+                timeout
+            )
+        except LLMUnavailableError:
+            print(f"⚠️  OpenAI client not available, returning original content for {disability_type}")
+            adaptation_fallbacks.inc(disability_type=disability_type.value, reason='unavailable')
+            return content_dict
+        except CircuitOpenError:
+            print(f"⚠️  LLM provider circuit open, returning original content for {disability_type}")
+            adaptation_fallbacks.inc(disability_type=disability_type.value, reason='circuit_open')
+            return content_dict
+        except RateLimitedError as rate_limited:
+            print(f"⚠️  {rate_limited}, returning original content for {disability_type}")
+            adaptation_fallbacks.inc(disability_type=disability_type.value, reason='rate_limited')
+            return content_dict
+        except AdaptationParseError as parse_error:
+            print(f"Failed to parse/validate AI response for {disability_type}: {str(parse_error)}")
+            adaptation_fallbacks.inc(disability_type=disability_type.value, reason='parse_error')
+            return content_dict
         except Exception as e:
             print(f"Error adapting content for {disability_type}: {str(e)}")
-            return content_model.dict()
+            adaptation_fallbacks.inc(disability_type=disability_type.value, reason='error')
+            return content_dict
 
     @staticmethod
-    def generate_all_adaptive_content(original_content: BaseModel, model_class: BaseModel) -> Dict:
-        """Generate adaptive content for all disability types"""
+    def fan_out(task: Callable[[DisabilityType], Dict], fallback: Callable[[DisabilityType], Dict],
+                disability_types: List[DisabilityType],
+                on_variant: Optional[Callable[[DisabilityType, Dict], None]] = None) -> Dict:
+        """
+        Run ``task`` for each disability type on a bounded thread pool (``ADAPTATION_CONCURRENCY``)
+        and return ``{disability_type_value: result}``. A task that raises or runs longer than
+        ``ADAPTATION_VARIANT_TIMEOUT`` (counted from its start) gets ``fallback(disability_type)``
+        instead.
+        ``on_variant`` is called in the calling thread as each variant finishes.
+        """
+        concurrency = max(1, app.config['ADAPTATION_CONCURRENCY'])
+        timeout = app.config['ADAPTATION_VARIANT_TIMEOUT']
         adaptive_content = {}
+
+        def record(disability_type: DisabilityType, content: Dict):
+            adaptive_content[disability_type.value] = content
+            if on_variant:
+                on_variant(disability_type, content)
+
+        # Up to ``concurrency`` variants run at once. A variant that timed out gives up its slot
+        # and its thread finishes in the background, so the pool has room for one thread per variant.
+        executor = ThreadPoolExecutor(max_workers=max(1, len(disability_types)), thread_name_prefix='adaptation')
+        queued = deque(disability_types)
+        running: Dict[Any, Tuple[DisabilityType, float]] = {}
+        try:
+            # Worker threads don't inherit the caller's LLM priority and tenant (or profile) on their own
+            task = in_current_context(profiled_thread(task))
+            while queued or running:
+                while queued and len(running) < concurrency:
+                    disability_type = queued.popleft()
+                    running[executor.submit(task, disability_type)] = (disability_type, time.monotonic() + timeout)
+                next_deadline = min(deadline for _, deadline in running.values())
+                done, _ = wait_futures(running, timeout=max(0.0, next_deadline - time.monotonic()),
+                                       return_when=FIRST_COMPLETED)
+                for future in done:
+                    disability_type, _ = running.pop(future)
+                    if future.exception():
+                        print(f"Error adapting content for {disability_type}: {future.exception()}")
+                        adaptation_fallbacks.inc(disability_type=disability_type.value, reason='error')
+                        record(disability_type, fallback(disability_type))
+                    else:
+                        record(disability_type, future.result())
+                now = time.monotonic()
+                for future, (disability_type, deadline) in list(running.items()):
+                    if deadline <= now:
+                        del running[future]
+                        print(f"⏱️  Adaptation for {disability_type} timed out after {timeout}s, using fallback content")
+                        adaptation_fallbacks.inc(disability_type=disability_type.value, reason='timeout')
+                        record(disability_type, fallback(disability_type))
+            return adaptive_content
+        finally:
+            # Don't block the request on stragglers; they finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def adapt_combined(original_content: BaseModel, model_class: BaseModel, disability_types: List[DisabilityType],
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Single-call strategy: ask for all ``disability_types`` in one reply keyed by
+        DisabilityType value and validate each variant on its own. Validated variants are
+        cached under their single-call keys. Returns only the variants that are cached or
+        validated; the caller adapts the rest one by one. Never raises.
+        """
+        content_dict = original_content.model_dump()
+        model_name = app.config['LLM_MODEL']
+        results, cache_keys = {}, {}
+        for disability_type in disability_types:
+            cache_key = ContentAdaptationService.cache_key(content_dict, disability_type)
+            cached = adaptation_cache.get(cache_key)
+            if cached is not None:
+                # Cached entries are replies; validate them like fresh ones
+                try:
+                    results[disability_type.value] = model_class(**cached).model_dump()
+                    continue
+                except Exception:
+                    pass
+            cache_keys[disability_type] = cache_key
         
-        for disability_type in DisabilityType:
-            field_name = f'{disability_type.value}_content'
-            adaptive_content[field_name] = ContentAdaptationService.adapt_content_for_disability(
-                original_content, disability_type, model_class
+        # One call only pays off for two or more variants, and the reply must fit max_tokens
+        # with room for adaptations that lengthen the text
+        max_tokens = app.config['ADAPTATION_COMBINED_MAX_TOKENS']
+        if len(cache_keys) < 2 or not llm_gateway.available or estimate_tokens(content_dict) * len(cache_keys) > max_tokens // 2:
+            return results
+        
+        combined_prompt = ContentAdaptationService.build_combined_prompt(content_dict, list(cache_keys))
+        
+        def complete() -> Dict:
+            reply, _ = ContentAdaptationService.routed_completion(
+                combined_prompt, 'combined', estimate_tokens(content_dict) * len(cache_keys), max_tokens, timeout,
+                ContentAdaptationService.parse_adaptation_response
             )
+            return reply
+        
+        try:
+            # Duplicate documents in flight share the call (within this process)
+            reply = single_flight.run(
+                AdaptationCache.make_key(model_name, ADAPTATION_SYSTEM_PROMPT, combined_prompt), complete, timeout=timeout
+            )
+        except Exception as e:
+            print(f"Combined adaptation failed, adapting variants one by one: {str(e)}")
+            for disability_type in cache_keys:
+                adaptation_fallbacks.inc(disability_type=disability_type.value, reason='combined_retry')
+            return results
+        
+        for disability_type, cache_key in cache_keys.items():
+            try:
+                validated_content = model_class(**reply[disability_type.value]).model_dump()
+            except Exception as e:
+                print(f"Combined reply has no valid {disability_type.value} variant: {str(e)}")
+                adaptation_fallbacks.inc(disability_type=disability_type.value, reason='combined_retry')
+                continue
+            adaptation_cache.put(cache_key, disability_type.value, model_name, validated_content)
+            translation_memory.learn(content_dict, validated_content, disability_type)
+            results[disability_type.value] = validated_content
+        return results
+
+    @staticmethod
+    def generate_all_adaptive_content(original_content: BaseModel, model_class: BaseModel,
+                                      disability_types: Optional[List[DisabilityType]] = None,
+                                      on_variant: Optional[Callable[[DisabilityType, Dict], None]] = None) -> Dict:
+        """Generate adaptive content for all (or the given) disability types.
+
+        Variants are generated concurrently (see ``fan_out``); a variant that
+        fails or times out falls back to the original content. With the 'combined'
+        strategy one call is tried first (see ``adapt_combined``) and only the
+        variants it could not deliver are generated one by one.
+        """
+        timeout = app.config['ADAPTATION_VARIANT_TIMEOUT']
+        disability_types = list(disability_types or DisabilityType)
+        adaptive_content = {}
+        if app.config['ADAPTATION_STRATEGY'] == 'combined':
+            adaptive_content = ContentAdaptationService.adapt_combined(original_content, model_class, disability_types, timeout)
+            if on_variant:
+                for disability_type in disability_types:
+                    if disability_type.value in adaptive_content:
+                        on_variant(disability_type, adaptive_content[disability_type.value])
         
+        remaining = [disability_type for disability_type in disability_types if disability_type.value not in adaptive_content]
+        if remaining:
+            adaptive_content.update(ContentAdaptationService.fan_out(
+                lambda disability_type: ContentAdaptationService.adapt_content_for_disability(
+                    original_content, disability_type, model_class, timeout
+                ),
+                lambda disability_type: original_content.model_dump(),
+                remaining,
+                on_variant
+            ))
         return adaptive_content
 
+    @staticmethod
+    def update_adaptive_content(old_original: Dict, new_original: BaseModel, variants: Dict[str, Optional[Dict]],
+                                model_class: BaseModel) -> Dict:
+        """
+        Bring existing adaptive variants up to date after an edit of the original content.
+
+        Only the fields that changed (or, for lists whose variant still lines up with the
+        original, only the changed items) are sent to the LLM and merged into each stored
+        variant. Variants that do not exist yet are generated in full. If a partial
+        adaptation fails, the changed fields are copied over unadapted.
+        """
+        new_dict = new_original.model_dump()
+        changes = diff_content_fields(old_original, new_dict)
+        if not changes:
+            return {}
+        timeout = app.config['ADAPTATION_VARIANT_TIMEOUT']
+
+        def merge(variant: Dict, adapted: Dict, plan: Dict[str, Optional[List[int]]]) -> Dict:
+            merged = copy.deepcopy(variant)
+            for field, indices in plan.items():
+                if indices is None:
+                    merged[field] = adapted[field]
+                    continue
+                items = (merged.get(field) or [])[:len(new_dict[field])]
+                items += new_dict[field][len(items):]
+                adapted_items = adapted.get(field, [])
+                if len(adapted_items) != len(indices):
+                    raise ValueError(f'expected {len(indices)} items for {field}, got {len(adapted_items)}')
+                for index, item in zip(indices, adapted_items):
+                    items[index] = item
+                merged[field] = items
+            return model_class(**merged).model_dump()
+
+        def plan_for(variant: Dict) -> Dict[str, Optional[List[int]]]:
+            # Item-level updates only work while the variant list still lines up with the original
+            return {
+                field: indices if indices is not None and len(variant.get(field) or []) == len(old_original.get(field) or []) else None
+                for field, indices in changes.items()
+            }
+
+        def partial_document(plan: Dict[str, Optional[List[int]]]) -> Dict:
+            return {
+                field: new_dict[field] if indices is None else [new_dict[field][i] for i in indices]
+                for field, indices in plan.items()
+                if indices is None or indices
+            }
+
+        def readapt(disability_type: DisabilityType) -> Dict:
+            variant = variants.get(disability_type.value)
+            if not variant:
+                return ContentAdaptationService.adapt_content_for_disability(new_original, disability_type, model_class, timeout)
+            plan = plan_for(variant)
+            document = partial_document(plan)
+            try:
+                if not document:
+                    # Only removals, e.g. a trimmed itinerary: nothing to send to the LLM
+                    return merge(variant, {}, plan)
+                return ContentAdaptationService.adapt_document(
+                    document, disability_type, lambda adapted: merge(variant, adapted, plan), timeout
+                )
+            except Exception as e:
+                print(f"Failed to re-adapt changed fields {list(document)} for {disability_type}: {e}")
+                adaptation_fallbacks.inc(disability_type=disability_type.value, reason='partial_error')
+                return unadapted(disability_type)
+
+        def unadapted(disability_type: DisabilityType) -> Dict:
+            variant = variants.get(disability_type.value)
+            if not variant:
+                return new_dict
+            plan = plan_for(variant)
+            return merge(variant, partial_document(plan), plan)
+
+        return ContentAdaptationService.fan_out(readapt, unadapted, list(DisabilityType))
+
+# Background Adaptation Jobs
+class AdaptationJobQueue:
+    """SQLite-backed job queue with an in-process worker pool.
+
+    Jobs are rows in ``adaptation_jobs``, so pending work survives restarts and
+    several processes can share one queue: a worker claims a job with a
+    conditional UPDATE and holds it under a lease that it renews after every
+    variant. Progress is committed per variant, so a resumed job only
+    regenerates the variants that are still pending.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.app = flask_app
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def enqueue(self, content_type: str, content_id: int,
+                disability_types: Optional[List[Union[DisabilityType, CustomProfile]]] = None) -> AdaptationJob:
+        """
+        Add a job to the current session; it becomes visible to workers on commit. The job
+        keeps the caller's LLM priority and tenant, and workers claim higher priorities first.
+        """
+        priority, tenant = current_scheduling()
+        job = AdaptationJob(
+            content_type=content_type,
+            content_id=content_id,
+            progress={dt.variant_key: 'pending' for dt in (disability_types or DisabilityType)},
+            priority=priority,
+            tenant=tenant
+        )
+        db.session.add(job)
+        return job
+
+    def notify(self):
+        """Wake idle workers after committing new jobs (starting the pool if needed)"""
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.app.config['ADAPTATION_JOB_WORKERS']):
+                thread = threading.Thread(target=self._worker_loop, name=f'adaptation-job-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            if self._threads:
+                print(f"👷 Started {len(self._threads)} adaptation job workers")
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            job_id = None
+            try:
+                with self.app.app_context():
+                    job_id = self._claim_next()
+                    if job_id is not None:
+                        self._run(job_id)
+            except Exception as e:
+                print(f"⚠️  Adaptation job {job_id} crashed: {e}")
+            if job_id is None:
+                self._wakeup.wait(self.app.config['ADAPTATION_JOB_POLL_INTERVAL'])
+                self._wakeup.clear()
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.app.config['ADAPTATION_JOB_LEASE_SECONDS'])
+
+    def _claim_next(self) -> Optional[int]:
+        """Atomically move the oldest runnable job of the highest priority to 'running' and return its id"""
+        now = datetime.utcnow()
+        runnable = db.or_(
+            AdaptationJob.status == 'queued',
+            db.and_(AdaptationJob.status == 'running', AdaptationJob.lease_expires_at < now)
+        )
+        priority_rank = db.case({priority: rank for rank, priority in enumerate(LLM_PRIORITIES)},
+                                value=AdaptationJob.priority, else_=len(LLM_PRIORITIES))
+        candidate = db.session.query(AdaptationJob.id).filter(runnable).order_by(priority_rank, AdaptationJob.id).first()
+        if candidate is None:
+            db.session.rollback()
+            return None
+
+        claimed = AdaptationJob.query.filter(AdaptationJob.id == candidate.id, runnable).update({
+            'status': 'running',
+            'attempts': AdaptationJob.attempts + 1,
+            'lease_expires_at': self._lease_deadline(),
+            'started_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        return candidate.id if claimed else None
+
+    def _run(self, job_id: int):
+        job = db.session.get(AdaptationJob, job_id)
+        with scheduling(job.priority if job.priority in LLM_PRIORITIES else 'backfill', job.tenant):
+            self._run_job(job)
+
+    def _run_job(self, job: AdaptationJob):
+        if job.attempts > self.app.config['ADAPTATION_JOB_MAX_ATTEMPTS']:
+            self._finish(job, 'failed', 'Maximum attempts exceeded')
+            return
+
+        model, content_model_class = CONTENT_TYPES[job.content_type]
+        record = db.session.get(model, job.content_id)
+        if record is None:
+            self._finish(job, 'failed', f'{job.content_type} {job.content_id} no longer exists')
+            return
+
+        original_content_model = content_model_class(**record.original_content)
+        pending = [key for key, state in job.progress.items() if state != 'completed']
+        custom_keys = [key for key in pending if key.startswith(CUSTOM_VARIANT_PREFIX)]
+
+        def save_variant(disability_type: Union[DisabilityType, CustomProfile], content: Dict):
+            save_adaptive_content(record, disability_type.variant_key, content)
+            job.progress = {**job.progress, disability_type.variant_key: 'completed'}
+            job.lease_expires_at = self._lease_deadline()
+            db.session.commit()
+
+        disability_types = [DisabilityType(key) for key in pending if key not in custom_keys]
+        if disability_types:
+            ContentAdaptationService.generate_all_adaptive_content(
+                original_content_model, content_model_class, disability_types, on_variant=save_variant
+            )
+        # Custom profiles are requested one at a time, each by its own detail request
+        for variant_key in custom_keys:
+            profile = CustomProfile.load(variant_key)
+            if profile is None:
+                self._finish(job, 'failed', f'Unknown custom profile {variant_key}')
+                return
+            # No fallback to the original here: a stored variant is served as ready for good,
+            # while a failed job leaves it pending and the next request queues it again
+            try:
+                content = ContentAdaptationService.adapt_document(
+                    original_content_model.model_dump(), profile,
+                    lambda adapted_dict: content_model_class(**adapted_dict).model_dump(),
+                    self.app.config['ADAPTATION_VARIANT_TIMEOUT']
+                )
+            except Exception as e:
+                self._finish(job, 'failed', f'Adapting for custom profile {variant_key} failed: {e}')
+                return
+            save_variant(profile, content)
+        self._finish(job, 'completed')
+
+    def _finish(self, job: AdaptationJob, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.lease_expires_at = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        if error:
+            print(f"❌ Adaptation job {job.id} failed: {error}")
+
+adaptation_jobs = AdaptationJobQueue(app)
+
+# Bulk Import
+IMPORT_ADAPT_MODES = ('sync', 'async', 'none')
+
+def import_ndjson(content_type: str, lines: Iterable[bytes], adapt: str = 'sync',
+                  chunk_size: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Import newline-delimited JSON documents of one content type.
+
+    Lines are consumed lazily and processed in chunks of ``IMPORT_CHUNK_SIZE``:
+    each chunk is validated, adapted (``adapt='sync'``, all documents x variants on
+    one pool of ``IMPORT_CONCURRENCY`` workers), and inserted in a single
+    transaction. With ``adapt='async'`` the originals are inserted together with
+    adaptation jobs (the caller decides whether to wake workers); ``adapt='none'``
+    stores originals only. Yields one result per
+    non-blank line, in order, followed by a final ``{'summary': ...}``.
+    Must be called inside an app context.
+    """
+    model, content_model_class = CONTENT_TYPES[content_type]
+    chunk_size = chunk_size or app.config['IMPORT_CHUNK_SIZE']
+    summary = {'lines': 0, 'imported': 0, 'failed': 0}
+
+    def flush(chunk: List[Tuple[int, Optional[BaseModel], Optional[str]]]) -> Iterator[Dict]:
+        documents = [(line_no, content) for line_no, content, _ in chunk if content is not None]
+        adaptations: Dict[int, Dict] = {}
+        if adapt == 'sync' and documents:
+            adaptations = adapt_documents(documents)
+
+        records = {}
+        try:
+            for line_no, content in documents:
+                records[line_no] = model(original_content=content.model_dump())
+            db.session.add_all(records.values())
+            db.session.flush()
+            for line_no, record in records.items():
+                add_adaptive_contents(record, adaptations.get(line_no, {}))
+            if adapt == 'async':
+                for record in records.values():
+                    adaptation_jobs.enqueue(content_type, record.id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Import chunk failed: {e}")
+            records = {}
+            chunk = [(line_no, None, error or f'Chunk insert failed: {e}') for line_no, _, error in chunk]
+
+        for line_no, content, error in chunk:
+            if line_no in records:
+                summary['imported'] += 1
+                yield {'line': line_no, 'success': True, 'id': records[line_no].id}
+            else:
+                summary['failed'] += 1
+                yield {'line': line_no, 'success': False, 'error': error}
+
+    def adapt_documents(documents: List[Tuple[int, BaseModel]]) -> Dict[int, Dict]:
+        timeout = app.config['ADAPTATION_VARIANT_TIMEOUT']
+        adaptations = {line_no: {} for line_no, _ in documents}
+        adapt_combined = in_current_context(profiled_thread(ContentAdaptationService.adapt_combined))
+        adapt_content = in_current_context(profiled_thread(ContentAdaptationService.adapt_content_for_disability))
+        with ThreadPoolExecutor(max_workers=max(1, app.config['IMPORT_CONCURRENCY']),
+                                thread_name_prefix='import-adaptation') as executor:
+            if app.config['ADAPTATION_STRATEGY'] == 'combined':
+                combined = {
+                    executor.submit(adapt_combined,
+                                    content, content_model_class, list(DisabilityType), timeout): line_no
+                    for line_no, content in documents
+                }
+                for future in as_completed(combined):
+                    if not future.exception():
+                        adaptations[combined[future]].update(future.result())
+            
+            futures = {
+                executor.submit(adapt_content,
+                                content, disability_type, content_model_class, timeout): (line_no, content, disability_type)
+                for line_no, content in documents
+                for disability_type in DisabilityType
+                if disability_type.value not in adaptations[line_no]
+            }
+            for future in as_completed(futures):
+                line_no, content, disability_type = futures[future]
+                # adapt_content_for_disability already falls back on its own errors
+                adaptations[line_no][disability_type.value] = (
+                    content.model_dump() if future.exception() else future.result()
+                )
+        return adaptations
+
+    chunk = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        summary['lines'] += 1
+        try:
+            chunk.append((line_no, content_model_class.model_validate_json(line), None))
+        except Exception as e:
+            chunk.append((line_no, None, f'Validation error: {str(e)}'))
+        if len(chunk) >= chunk_size:
+            yield from flush(chunk)
+            chunk = []
+    if chunk:
+        yield from flush(chunk)
+
+    yield {'summary': summary}
+
 # Helper Functions
-def validate_and_create_hotel_content(data: dict) -> HotelContentModel:
-    """Validate and create hotel content using Pydantic model"""
-    try:
-        return HotelContentModel(**data)
-    except Exception as e:
-        raise ValueError(f"Invalid hotel data: {str(e)}")
+def set_adaptive_content(record: db.Model, variant_key: str, content: Dict):
+    """Store (insert or replace) one adaptive variant of a Hotel/Tour/CareService record"""
+    if record.id is None:
+        db.session.flush()
+    variant = ContentVariant.query.filter_by(
+        entity_type=record.entity_type, entity_id=record.id, variant_key=variant_key
+    ).first()
+    if variant is None:
+        db.session.add(ContentVariant(
+            entity_type=record.entity_type, entity_id=record.id, variant_key=variant_key, content=content
+        ))
+    else:
+        variant.content = content
+    record.updated_at = datetime.utcnow()
 
-def validate_and_create_tour_content(data: dict) -> TourContentModel:
-    """Validate and create tour content using Pydantic model"""
+def save_adaptive_content(record: db.Model, variant_key: str, content: Dict):
+    """
+    ``set_adaptive_content`` and commit. If another request or worker inserted the same
+    variant first, the unique constraint fails and the variant is updated instead.
+    """
     try:
-        return TourContentModel(**data)
-    except Exception as e:
-        raise ValueError(f"Invalid tour data: {str(e)}")
+        set_adaptive_content(record, variant_key, content)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        set_adaptive_content(record, variant_key, content)
+        db.session.commit()
 
-def validate_and_create_care_service_content(data: dict) -> CareServiceContentModel:
-    """Validate and create care service content using Pydantic model"""
-    try:
-        return CareServiceContentModel(**data)
-    except Exception as e:
-        raise ValueError(f"Invalid care service data: {str(e)}")
+def add_adaptive_contents(record: db.Model, contents: Dict[str, Dict]):
+    """Add the variants of a record that has none yet (e.g. right after creating it)"""
+    if record.id is None:
+        db.session.flush()
+    db.session.add_all([
+        ContentVariant(entity_type=record.entity_type, entity_id=record.id, variant_key=variant_key, content=content)
+        for variant_key, content in contents.items()
+    ])
 
-# API Routes
+def get_adaptive_content(record: db.Model, variant_key: str) -> Optional[Dict]:
+    """Load exactly one adaptive variant of a record"""
+    return db.session.query(ContentVariant.content).filter_by(
+        entity_type=record.entity_type, entity_id=record.id, variant_key=variant_key
+    ).scalar()
 
-# Hotel Management APIs
-@app.route('/api/hotels', methods=['POST'])
-def create_hotel():
-    """Create a new hotel with adaptive content using Pydantic validation"""
+def get_adaptive_contents(record: db.Model) -> Dict[str, Dict]:
+    """Load all adaptive variants of a record, keyed by variant"""
+    rows = db.session.query(ContentVariant.variant_key, ContentVariant.content).filter_by(
+        entity_type=record.entity_type, entity_id=record.id
+    )
+    return {variant_key: content for variant_key, content in rows}
+
+def request_custom_adaptation(content_type: str, record: db.Model, profile: CustomProfile) -> Optional[AdaptationJob]:
+    """
+    Queue the adaptation of ``record`` for ``profile``, unless a job for it is already pending.
+    Concurrent requests share one job (a unique index allows one pending job per record and
+    profile). Raises CustomProfileLimitError once CUSTOM_PROFILE_JOBS_PER_HOUR jobs were queued.
+    """
+    def pending_job() -> Optional[AdaptationJob]:
+        return AdaptationJob.query.filter(
+            AdaptationJob.content_type == content_type,
+            AdaptationJob.content_id == record.id,
+            AdaptationJob.custom_variant == profile.variant_key,
+            AdaptationJob.status.in_(('queued', 'running'))
+        ).first()
+    
+    limit = app.config['CUSTOM_PROFILE_JOBS_PER_HOUR']
+    # Two tries: the first may lose the insert race on the job or the profile row
+    for _ in range(2):
+        job = pending_job()
+        if job is not None:
+            return job
+        if limit and AdaptationJob.query.filter(
+            AdaptationJob.custom_variant.isnot(None),
+            AdaptationJob.created_at >= datetime.utcnow() - timedelta(hours=1)
+        ).count() >= limit:
+            raise CustomProfileLimitError('Too many custom disability profiles requested, try again later')
+        try:
+            db.session.merge(CustomProfileEntry(variant_key=profile.variant_key, description=profile.description))
+            job = adaptation_jobs.enqueue(content_type, record.id, [profile])
+            job.custom_variant = profile.variant_key
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            continue
+        adaptation_jobs.notify()
+        return job
+    return pending_job()
+
+def update_content_record(content_type: str, content_id: int, id_key: str):
+    """
+    Apply a partial update to a record's original content and re-adapt only what changed.
+    Shared by the PATCH endpoints.
+    """
     try:
-        data = request.json
-        
-        # Validate input using Pydantic model
-        hotel_content = validate_and_create_hotel_content(data)
-        
-        # Generate adaptive content for all disability types
-        adaptive_content = ContentAdaptationService.generate_all_adaptive_content(
-            hotel_content, HotelContentModel
-        )
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise ValueError('Request body must be a JSON object of fields to change')
+        model, content_model_class = CONTENT_TYPES[content_type]
+        record = db.session.get(model, content_id)
+        if record is None:
+            return jsonify({
+                'success': False,
+                'error': f'{content_type} {content_id} not found'
+            }), 404
         
-        # Create hotel record
-        hotel = Hotel(
-            original_content=hotel_content.model_dump(),
-            **adaptive_content
-        )
+        # Fields not present in the request keep their stored values
+        old_original = record.original_content
+        try:
+            new_content = content_model_class(**{**old_original, **data})
+        except Exception as e:
+            raise ValueError(f"Invalid {content_type} data: {str(e)}")
         
-        db.session.add(hotel)
-        db.session.commit()
+        changed_fields = sorted(diff_content_fields(old_original, new_content.model_dump()))
+        if changed_fields:
+            variants = get_adaptive_contents(record)
+            adaptive_content = ContentAdaptationService.update_adaptive_content(
+                old_original, new_content, variants, content_model_class
+            )
+            record.original_content = new_content.model_dump()
+            for variant_key, content in adaptive_content.items():
+                set_adaptive_content(record, variant_key, content)
+            # Custom profile variants are generated again on their next request
+            ContentVariant.query.filter(
+                ContentVariant.entity_type == record.entity_type,
+                ContentVariant.entity_id == record.id,
+                ContentVariant.variant_key.like(f'{CUSTOM_VARIANT_PREFIX}%')
+            ).delete(synchronize_session=False)
+            db.session.commit()
         
         return jsonify({
             'success': True,
-            'message': 'Hotel created successfully',
-            'hotel_id': hotel.id,
-            'content_structure': 'HotelContentModel'
-        }), 201
+            'message': 'Content updated successfully' if changed_fields else 'No changes detected',
+            id_key: record.id,
+            'changed_fields': changed_fields,
+            'content_structure': content_model_class.__name__
+        })
         
     except ValueError as ve:
         return jsonify({
@@ -369,115 +2522,396 @@ def create_hotel():
             'error': str(e)
         }), 500
 
-@app.route('/api/hotels', methods=['GET'])
-def get_hotels():
-    """Get all hotels with basic info"""
+def response_etag(body: bytes) -> str:
+    """Strong ETag for a serialized response body"""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+def conditional_response(body: bytes, etag: Optional[str] = None, last_modified: Optional[datetime] = None,
+                         cache_control: str = 'public, no-cache') -> Response:
+    """
+    JSON response with validators for conditional requests: answers If-None-Match /
+    If-Modified-Since with 304. The variant is selected by the disability_type query
+    parameter, which is part of the cache key of every HTTP cache already, so
+    only Accept-Encoding needs to be listed in Vary.
+    """
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag or response_etag(body))
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+_static_responses: Dict[str, Tuple[bytes, str]] = {}
+
+def static_json_response(name: str, build: Callable[[], Dict]) -> Response:
+    """Serve a payload that cannot change while the process runs; it is built and hashed once"""
+    if name not in _static_responses:
+        body = jsonify(build()).get_data()
+        _static_responses[name] = (body, response_etag(body))
+    body, etag = _static_responses[name]
+    return conditional_response(body, etag, cache_control='public, max-age=3600')
+
+def content_detail_response(content_type: str, record_id: int, response_key: str):
+    """
+    Detail view of one record, optionally as an adaptive variant (?disability_type=).
+    Shared by the detail endpoints. Serialized bodies are kept in ``detail_cache``,
+    so a hit skips the ORM, Pydantic validation and JSON encoding, and responses
+    carry an ETag and Last-Modified so repeat requests can be answered with 304.
+    
+    Any other ?disability_type= text is a custom profile (see ``CustomProfile``).
+    Until its variant exists, the original is returned right away with
+    ``adaptation.status == 'pending'`` and the variant is generated by the job queue.
+    """
     try:
-        hotels = Hotel.query.all()
-        hotels_list = []
-        
-        for hotel in hotels:
-            # Extract basic info from original_content
-            original = hotel.original_content
-            hotels_list.append({
-                'id': hotel.id,
-                'name': original.get('name', ''),
-                'location': original.get('location', ''),
-                'coordinates': original.get('coordinates', ''),
-                'created_at': hotel.created_at.isoformat(),
-                'updated_at': hotel.updated_at.isoformat()
-            })
+        disability_type = request.args.get('disability_type')
+        profile = None
+        if disability_type not in [dt.value for dt in DisabilityType]:
+            if disability_type and app.config['CUSTOM_PROFILES_ENABLED']:
+                profile = CustomProfile.from_text(disability_type)
+            if isinstance(profile, DisabilityType):
+                profile, disability_type = None, profile.value
+            else:
+                disability_type = profile.variant_key if profile else None
+        
+        cache_key = (content_type, record_id, disability_type)
+        cached = detail_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(*cached)
+        
+        model, content_model_class = CONTENT_TYPES[content_type]
+        record = model.query.get_or_404(record_id)
+        
+        # Determine which content to return
+        adaptation = None
+        if disability_type:
+            content = get_adaptive_content(record, disability_type)
+            content_kind = f'adaptive_{disability_type}'
+            if profile:
+                adaptation = {'status': 'ready', 'variant_key': profile.variant_key}
+            if not content and profile:
+                job = request_custom_adaptation(content_type, record, profile)
+                adaptation = {'status': 'pending', 'variant_key': profile.variant_key, 'job_id': job.id if job else None}
+                content_kind = 'original'
+            if not content:
+                content = record.original_content
+        else:
+            content = record.original_content
+            content_kind = 'original'
+        
+        # Validate content structure
+        try:
+            content_dict = content_model_class.model_validate(content).model_dump()
+        except Exception:
+            content_dict = content
+        
+        body = jsonify({
+            'success': True,
+            response_key: {
+                'id': record.id,
+                'content_type': content_kind,
+                'created_at': record.created_at.isoformat(),
+                'updated_at': record.updated_at.isoformat(),
+                **content_dict
+            },
+            **({'adaptation': adaptation} if adaptation else {})
+        }).get_data()
+        if adaptation and adaptation['status'] == 'pending':
+            # Served until the variant is ready, so neither cached here nor by clients
+            return conditional_response(body, cache_control='no-store')
+        etag = response_etag(body)
+        detail_cache.put(cache_key, body, etag, record.updated_at)
+        return conditional_response(body, etag, record.updated_at)
         
+    except CustomProfileLimitError as limited:
+        return jsonify({
+            'success': False,
+            'error': str(limited)
+        }), 429, {'Retry-After': '3600'}
+    except ValueError as ve:
+        return jsonify({
+            'success': False,
+            'error': str(ve)
+        }), 400
+    except Exception as e:
         return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def list_content_summaries(content_type: str, response_key: str, default_fields: List[str]):
+    """
+    Keyset-paginated summary listing shared by the list endpoints.
+
+    ``?limit=`` and ``?after_id=`` page through records in id order and ``?fields=``
+    picks which original_content attributes to return. Attributes are extracted
+    with SQLite's json_extract, so neither the content blobs nor the adaptive
+    variants are ever loaded into Python.
+    """
+    try:
+        model, content_model_class = CONTENT_TYPES[content_type]
+        
+        limit = request.args.get('limit', app.config['LIST_DEFAULT_LIMIT'], type=int)
+        if limit < 1 or limit > app.config['LIST_MAX_LIMIT']:
+            raise ValueError(f"limit must be between 1 and {app.config['LIST_MAX_LIMIT']}")
+        after_id = request.args.get('after_id', type=int)
+        
+        fields = request.args.get('fields')
+        fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else default_fields
+        unknown_fields = [field for field in fields if field not in content_model_class.model_fields]
+        if unknown_fields:
+            raise ValueError(f"Unknown fields: {unknown_fields}")
+        
+        columns = [model.id, model.created_at, model.updated_at] + [
+            db.func.json_extract(model.original_content, f'$.{field}').label(field) for field in fields
+        ]
+        query = db.session.query(*columns).order_by(model.id)
+        if after_id is not None:
+            query = query.filter(model.id > after_id)
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        # json_extract returns nested objects/arrays as JSON text
+        text_fields = {
+            field for field in fields
+            if content_model_class.model_fields[field].annotation in (str, Optional[str])
+        }
+        items = []
+        for row in rows:
+            item = {'id': row.id}
+            for field in fields:
+                value = getattr(row, field)
+                if field in text_fields:
+                    item[field] = value if value is not None else ''
+                else:
+                    item[field] = json.loads(value) if isinstance(value, str) else value
+            item['created_at'] = row.created_at.isoformat()
+            item['updated_at'] = row.updated_at.isoformat()
+            items.append(item)
+        
+        return conditional_response(jsonify({
             'success': True,
-            'hotels': hotels_list
-        })
+            response_key: items,
+            'has_more': has_more,
+            'next_after_id': rows[-1].id if has_more else None
+        }).get_data())
         
+    except ValueError as ve:
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(ve)}'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/hotels/<int:hotel_id>', methods=['GET'])
-def get_hotel(hotel_id):
-    """Get hotel details with optional adaptive content"""
+def wants_async_adaptation() -> bool:
+    """Whether this request should queue adaptation instead of waiting for it (?async= overrides config)"""
+    flag = request.args.get('async')
+    if flag is None:
+        return app.config['ADAPTATION_ASYNC']
+    return flag.lower() in ('1', 'true', 'yes')
+
+def wants_event_stream() -> bool:
+    """Whether the client asked for a Server-Sent Events response (?stream=1 or Accept header)"""
+    flag = request.args.get('stream')
+    if flag is not None:
+        return flag.lower() in ('1', 'true', 'yes')
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def stream_regeneration(record: db.Model, original_content_model: BaseModel, disability_type: DisabilityType,
+                        content_model_class: BaseModel) -> Response:
+    """
+    Regenerate one variant, streaming completion tokens and per-field progress as SSE.
+    The record is only updated after the full reply has been parsed and validated;
+    the final 'result' event carries the validated content.
+    """
+    def events():
+        yield sse_event('start', {
+            'content_id': record.id,
+            'disability_type': disability_type.value,
+            'content_structure': content_model_class.__name__
+        })
+        progress = JsonFieldProgress(total=len(content_model_class.model_fields))
+        new_content = None
+        try:
+            for kind, payload in ContentAdaptationService.stream_adaptation(
+                original_content_model.model_dump(), disability_type,
+                lambda adapted_dict: content_model_class(**adapted_dict).model_dump(),
+                app.config['ADAPTATION_VARIANT_TIMEOUT']
+            ):
+                if kind == 'result':
+                    new_content = payload
+                    continue
+                yield sse_event('token', {'text': payload})
+                for field in progress.feed(payload):
+                    yield sse_event('field', {'field': field, 'completed': progress.completed, 'total': progress.total})
+            
+            save_adaptive_content(record, disability_type.value, new_content)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Streaming regeneration failed for {disability_type}: {str(e)}")
+            yield sse_event('error', {'success': False, 'error': str(e)})
+            return
+        
+        yield sse_event('result', {
+            'success': True,
+            'message': f'Adaptive content regenerated for {disability_type.value}',
+            'content': new_content,
+            'content_structure': content_model_class.__name__
+        })
+    
+    return Response(stream_with_context(iterate_in_current_context(events())), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def job_accepted_response(job: AdaptationJob, **extra):
+    """202 response pointing the client at the job status endpoint"""
+    return jsonify({
+        'success': True,
+        'message': 'Adaptive content generation queued',
+        'job_id': job.id,
+        'job_status_url': f'/api/jobs/{job.id}',
+        **extra
+    }), 202
+
+def request_content() -> Union[dict, bytes]:
+    """Request body for content validation: raw bytes on the fast JSON path, else the parsed dict"""
+    if app.config['JSON_FAST_PATH']:
+        return request.get_data()
+    return request.json
+
+def validate_and_create_hotel_content(data: Union[dict, bytes]) -> HotelContentModel:
+    """Validate and create hotel content using Pydantic model (raw JSON bytes are validated directly)"""
     try:
-        disability_type = request.args.get('disability_type')
+        if isinstance(data, (bytes, str)):
+            return HotelContentModel.model_validate_json(data)
+        return HotelContentModel.model_validate(data)
+    except Exception as e:
+        raise ValueError(f"Invalid hotel data: {str(e)}")
+
+def validate_and_create_tour_content(data: Union[dict, bytes]) -> TourContentModel:
+    """Validate and create tour content using Pydantic model (raw JSON bytes are validated directly)"""
+    try:
+        if isinstance(data, (bytes, str)):
+            return TourContentModel.model_validate_json(data)
+        return TourContentModel.model_validate(data)
+    except Exception as e:
+        raise ValueError(f"Invalid tour data: {str(e)}")
+
+def validate_and_create_care_service_content(data: Union[dict, bytes]) -> CareServiceContentModel:
+    """Validate and create care service content using Pydantic model (raw JSON bytes are validated directly)"""
+    try:
+        if isinstance(data, (bytes, str)):
+            return CareServiceContentModel.model_validate_json(data)
+        return CareServiceContentModel.model_validate(data)
+    except Exception as e:
+        raise ValueError(f"Invalid care service data: {str(e)}")
+
+# API Routes
+
+# Hotel Management APIs
+@app.route('/api/hotels', methods=['POST'])
+def create_hotel():
+    """Create a new hotel with adaptive content using Pydantic validation"""
+    try:
+        data = request_content()
+        
+        # Validate input using Pydantic model
+        hotel_content = validate_and_create_hotel_content(data)
+        
+        if wants_async_adaptation():
+            # Persist the original now and let the job workers fill in the variants
+            hotel = Hotel(original_content=hotel_content.model_dump())
+            db.session.add(hotel)
+            db.session.flush()
+            job = adaptation_jobs.enqueue('hotel', hotel.id)
+            db.session.commit()
+            adaptation_jobs.notify()
+            return job_accepted_response(job, hotel_id=hotel.id, content_structure='HotelContentModel')
         
-        hotel = Hotel.query.get_or_404(hotel_id)
+        # Generate adaptive content for all disability types
+        adaptive_content = ContentAdaptationService.generate_all_adaptive_content(
+            hotel_content, HotelContentModel
+        )
         
-        # Determine which content to return
-        if disability_type and disability_type in [dt.value for dt in DisabilityType]:
-            # Map the disability type to the correct field name
-            field_mapping = {
-                'wheelchair_user': 'wheelchair_user_content',
-                'dyslexia': 'dyslexia_content',
-                'cognitive_impairment': 'cognitive_impairment_content',
-                'anxiety_travel_fear': 'anxiety_travel_fear_content',
-                'low_vision': 'low_vision_content'
-            }
-            content_field = field_mapping.get(disability_type)
-            if content_field:
-                content = getattr(hotel, content_field)
-                if not content:
-                    content = hotel.original_content
-                content_type = f'adaptive_{disability_type}'
-            else:
-                content = hotel.original_content
-                content_type = 'original'
-        else:
-            content = hotel.original_content
-            content_type = 'original'
+        # Create hotel record
+        hotel = Hotel(original_content=hotel_content.model_dump())
         
-        # Validate content structure
-        try:
-            validated_content = HotelContentModel(**content)
-            content_dict = validated_content.dict()
-        except:
-            content_dict = content
+        db.session.add(hotel)
+        add_adaptive_contents(hotel, adaptive_content)
+        db.session.commit()
         
-        response_data = {
+        return jsonify({
             'success': True,
-            'hotel': {
-                'id': hotel.id,
-                'content_type': content_type,
-                'created_at': hotel.created_at.isoformat(),
-                'updated_at': hotel.updated_at.isoformat(),
-                **content_dict
-            }
-        }
-        
-        return jsonify(response_data)
+            'message': 'Hotel created successfully',
+            'hotel_id': hotel.id,
+            'content_structure': 'HotelContentModel'
+        }), 201
         
+    except ValueError as ve:
+        return jsonify({
+            'success': False,
+            'error': f'Validation error: {str(ve)}'
+        }), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/hotels', methods=['GET'])
+def get_hotels():
+    """Get a page of hotels with basic info"""
+    return list_content_summaries('hotel', 'hotels', ['name', 'location', 'coordinates'])
+
+
+@app.route('/api/hotels/<int:hotel_id>', methods=['GET'])
+def get_hotel(hotel_id):
+    """Get hotel details with optional adaptive content"""
+    return content_detail_response('hotel', hotel_id, 'hotel')
+
+
+@app.route('/api/hotels/<int:hotel_id>', methods=['PATCH'])
+def update_hotel(hotel_id):
+    """Update hotel content, re-adapting only the changed fields"""
+    return update_content_record('hotel', hotel_id, 'hotel_id')
+
 # Tour Management APIs
 @app.route('/api/tours', methods=['POST'])
 def create_tour():
     """Create a new tour with adaptive content using Pydantic validation"""
     try:
-        data = request.json
+        data = request_content()
         
         # Validate input using Pydantic model
         tour_content = validate_and_create_tour_content(data)
         
+        if wants_async_adaptation():
+            # Persist the original now and let the job workers fill in the variants
+            tour = Tour(original_content=tour_content.model_dump())
+            db.session.add(tour)
+            db.session.flush()
+            job = adaptation_jobs.enqueue('tour', tour.id)
+            db.session.commit()
+            adaptation_jobs.notify()
+            return job_accepted_response(job, tour_id=tour.id, content_structure='TourContentModel')
+        
         # Generate adaptive content for all disability types
         adaptive_content = ContentAdaptationService.generate_all_adaptive_content(
             tour_content, TourContentModel
         )
         
         # Create tour record
-        tour = Tour(
-            original_content=tour_content.model_dump(),
-            **adaptive_content
-        )
+        tour = Tour(original_content=tour_content.model_dump())
         
         db.session.add(tour)
+        add_adaptive_contents(tour, adaptive_content)
         db.session.commit()
         
         return jsonify({
@@ -501,101 +2935,51 @@ def create_tour():
 
 @app.route('/api/tours', methods=['GET'])
 def get_tours():
-    """Get all tours with basic info"""
-    try:
-        tours = Tour.query.all()
-        tours_list = []
-        
-        for tour in tours:
-            # Extract basic info from original_content
-            original = tour.original_content
-            tours_list.append({
-                'id': tour.id,
-                'name': original.get('name', ''),
-                'description': original.get('description', ''),
-                'duration': original.get('duration', ''),
-                'created_at': tour.created_at.isoformat(),
-                'updated_at': tour.updated_at.isoformat()
-            })
-        
-        return jsonify({
-            'success': True,
-            'tours': tours_list
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """Get a page of tours with basic info"""
+    return list_content_summaries('tour', 'tours', ['name', 'description', 'duration'])
+
 
 @app.route('/api/tours/<int:tour_id>', methods=['GET'])
 def get_tour(tour_id):
     """Get tour details with optional adaptive content"""
-    try:
-        disability_type = request.args.get('disability_type')
-        
-        tour = Tour.query.get_or_404(tour_id)
-        
-        # Determine which content to return
-        if disability_type and disability_type in [dt.value for dt in DisabilityType]:
-            content_field = f'{disability_type}_content'
-            content = getattr(tour, content_field)
-            if not content:
-                content = tour.original_content
-            content_type = f'adaptive_{disability_type}'
-        else:
-            content = tour.original_content
-            content_type = 'original'
-        
-        # Validate content structure
-        try:
-            validated_content = TourContentModel(**content)
-            content_dict = validated_content.dict()
-        except:
-            content_dict = content
-        
-        response_data = {
-            'success': True,
-            'tour': {
-                'id': tour.id,
-                'content_type': content_type,
-                'created_at': tour.created_at.isoformat(),
-                'updated_at': tour.updated_at.isoformat(),
-                **content_dict
-            }
-        }
-        
-        return jsonify(response_data)
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return content_detail_response('tour', tour_id, 'tour')
+
+
+@app.route('/api/tours/<int:tour_id>', methods=['PATCH'])
+def update_tour(tour_id):
+    """Update tour content, re-adapting only the changed fields"""
+    return update_content_record('tour', tour_id, 'tour_id')
 
 # Care Service Management APIs
 @app.route('/api/care-services', methods=['POST'])
 def create_care_service():
     """Create a new care service with adaptive content using Pydantic validation"""
     try:
-        data = request.json
+        data = request_content()
         
         # Validate input using Pydantic model
         service_content = validate_and_create_care_service_content(data)
         
+        if wants_async_adaptation():
+            # Persist the original now and let the job workers fill in the variants
+            service = CareService(original_content=service_content.model_dump())
+            db.session.add(service)
+            db.session.flush()
+            job = adaptation_jobs.enqueue('care-service', service.id)
+            db.session.commit()
+            adaptation_jobs.notify()
+            return job_accepted_response(job, service_id=service.id, content_structure='CareServiceContentModel')
+        
         # Generate adaptive content for all disability types
         adaptive_content = ContentAdaptationService.generate_all_adaptive_content(
             service_content, CareServiceContentModel
         )
         
         # Create care service record
-        service = CareService(
-            original_content=service_content.model_dump(),
-            **adaptive_content
-        )
+        service = CareService(original_content=service_content.model_dump())
         
         db.session.add(service)
+        add_adaptive_contents(service, adaptive_content)
         db.session.commit()
         
         return jsonify({
@@ -619,96 +3003,39 @@ def create_care_service():
 
 @app.route('/api/care-services', methods=['GET'])
 def get_care_services():
-    """Get all care services with basic info"""
-    try:
-        services = CareService.query.all()
-        services_list = []
-        
-        for service in services:
-            # Extract basic info from original_content
-            original = service.original_content
-            services_list.append({
-                'id': service.id,
-                'name': original.get('name', ''),
-                'description': original.get('description', ''),
-                'created_at': service.created_at.isoformat(),
-                'updated_at': service.updated_at.isoformat()
-            })
-        
-        return jsonify({
-            'success': True,
-            'care_services': services_list
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    """Get a page of care services with basic info"""
+    return list_content_summaries('care-service', 'care_services', ['name', 'description'])
+
 
 @app.route('/api/care-services/<int:service_id>', methods=['GET'])
 def get_care_service(service_id):
     """Get care service details with optional adaptive content"""
-    try:
-        disability_type = request.args.get('disability_type')
-        
-        service = CareService.query.get_or_404(service_id)
-        
-        # Determine which content to return
-        if disability_type and disability_type in [dt.value for dt in DisabilityType]:
-            content_field = f'{disability_type}_content'
-            content = getattr(service, content_field)
-            if not content:
-                content = service.original_content
-            content_type = f'adaptive_{disability_type}'
-        else:
-            content = service.original_content
-            content_type = 'original'
-        
-        # Validate content structure
-        try:
-            validated_content = CareServiceContentModel(**content)
-            content_dict = validated_content.dict()
-        except:
-            content_dict = content
-        
-        response_data = {
-            'success': True,
-            'service': {
-                'id': service.id,
-                'content_type': content_type,
-                'created_at': service.created_at.isoformat(),
-                'updated_at': service.updated_at.isoformat(),
-                **content_dict
-            }
-        }
-        
-        return jsonify(response_data)
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return content_detail_response('care-service', service_id, 'service')
+
+
+@app.route('/api/care-services/<int:service_id>', methods=['PATCH'])
+def update_care_service(service_id):
+    """Update care service content, re-adapting only the changed fields"""
+    return update_content_record('care-service', service_id, 'service_id')
 
 # Content Model APIs
 @app.route('/api/content-models', methods=['GET'])
 def get_content_models():
     """Get available content models and their schemas"""
-    return jsonify({
+    return static_json_response('content-models', lambda: {
         'success': True,
         'content_models': {
             'hotel': {
                 'model': 'HotelContentModel',
-                'schema': HotelContentModel.schema()
+                'schema': HotelContentModel.model_json_schema()
             },
             'tour': {
                 'model': 'TourContentModel', 
-                'schema': TourContentModel.schema()
+                'schema': TourContentModel.model_json_schema()
             },
             'care_service': {
                 'model': 'CareServiceContentModel',
-                'schema': CareServiceContentModel.schema()
+                'schema': CareServiceContentModel.model_json_schema()
             }
         }
     })
@@ -717,7 +3044,7 @@ def get_content_models():
 @app.route('/api/disability-types', methods=['GET'])
 def get_disability_types():
     """Get available disability types"""
-    return jsonify({
+    return static_json_response('disability-types', lambda: {
         'success': True,
         'disability_types': [dt.value for dt in DisabilityType],
         'descriptions': {
@@ -743,39 +3070,38 @@ def regenerate_adaptive_content(content_type, content_id):
             }), 400
         
         # Get the appropriate model and content class
-        if content_type == 'hotel':
-            model = Hotel
-            content_model_class = HotelContentModel
-        elif content_type == 'tour':
-            model = Tour
-            content_model_class = TourContentModel
-        elif content_type == 'care-service':
-            model = CareService
-            content_model_class = CareServiceContentModel
-        else:
+        if content_type not in CONTENT_TYPES:
             return jsonify({
                 'success': False,
                 'error': 'Invalid content type'
             }), 400
+        model, content_model_class = CONTENT_TYPES[content_type]
         
         # Get the record
         record = model.query.get_or_404(content_id)
         
+        disability_enum = DisabilityType(disability_type)
+        # An explicit stream request wins over ADAPTATION_ASYNC: the client is waiting for SSE frames
+        if wants_event_stream():
+            original_content_model = content_model_class(**record.original_content)
+            return stream_regeneration(record, original_content_model, disability_enum, content_model_class)
+        
+        if wants_async_adaptation():
+            job = adaptation_jobs.enqueue(content_type, record.id, [disability_enum])
+            db.session.commit()
+            adaptation_jobs.notify()
+            return job_accepted_response(job, content_structure=content_model_class.__name__)
+        
         # Create content model from original content
         original_content_model = content_model_class(**record.original_content)
         
         # Generate new adaptive content
-        disability_enum = DisabilityType(disability_type)
         new_content = ContentAdaptationService.adapt_content_for_disability(
             original_content_model, disability_enum, content_model_class
         )
         
         # Update the record
-        content_field = f'{disability_type}_content'
-        setattr(record, content_field, new_content)
-        record.updated_at = datetime.utcnow()
-        
-        db.session.commit()
+        save_adaptive_content(record, disability_type, new_content)
         
         return jsonify({
             'success': True,
@@ -791,12 +3117,235 @@ def regenerate_adaptive_content(content_type, content_id):
             'error': str(e)
         }), 500
 
+# Bulk import API
+@app.route('/api/import/<string:content_type>', methods=['POST'])
+def bulk_import(content_type):
+    """Import NDJSON documents, streaming back one NDJSON result per input line"""
+    if content_type not in CONTENT_TYPES:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid content type'
+        }), 400
+    
+    adapt = request.args.get('adapt', 'async' if app.config['ADAPTATION_ASYNC'] else 'sync')
+    if adapt not in IMPORT_ADAPT_MODES:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid adapt mode, expected one of {list(IMPORT_ADAPT_MODES)}'
+        }), 400
+    chunk_size = request.args.get('chunk_size', type=int)
+    
+    def results():
+        for result in import_ndjson(content_type, request.stream, adapt, chunk_size):
+            yield app.json.dumps(result) + '\n'
+        if adapt == 'async':
+            adaptation_jobs.notify()
+    
+    return Response(stream_with_context(iterate_in_current_context(results())), mimetype='application/x-ndjson')
+
+# Search API
+@app.route('/api/search', methods=['GET'])
+def search_content():
+    """Ranked full-text search over hotels, tours and care services"""
+    try:
+        query = fts_query(request.args.get('q', ''))
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': 'Missing search query (q)'
+            }), 400
+        
+        content_type = request.args.get('type')
+        if content_type and content_type not in CONTENT_TYPES:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid content type'
+            }), 400
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        
+        # Search the requested variant's wording, falling back to the original text
+        disability_type = request.args.get('disability_type')
+        variant_keys = ['original']
+        if disability_type in [dt.value for dt in DisabilityType]:
+            variant_keys.insert(0, disability_type)
+        
+        sql = f"""
+            SELECT d.entity_type, d.entity_id, d.variant_key, s.name,
+                   snippet(content_search, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+                   bm25(content_search) AS score
+            FROM content_search AS s
+            JOIN search_documents AS d ON d.id = s.rowid
+            WHERE content_search MATCH :query
+              AND d.variant_key IN ({', '.join(f':variant_{i}' for i in range(len(variant_keys)))})
+              {'AND d.entity_type = :content_type' if content_type else ''}
+            ORDER BY score
+            LIMIT :limit
+        """
+        params = {
+            'query': query,
+            'content_type': content_type,
+            'limit': limit * len(variant_keys),
+            **{f'variant_{i}': key for i, key in enumerate(variant_keys)}
+        }
+        
+        results, seen = [], set()
+        for row in db.session.execute(db.text(sql), params):
+            # One hit per record: the best-ranked of its variant and original
+            if (row.entity_type, row.entity_id) in seen:
+                continue
+            seen.add((row.entity_type, row.entity_id))
+            results.append({
+                'content_type': row.entity_type,
+                'id': row.entity_id,
+                'matched_variant': row.variant_key,
+                'name': row.name,
+                'snippet': row.snippet,
+                'score': round(-row.score, 4)
+            })
+            if len(results) == limit:
+                break
+        
+        return jsonify({
+            'success': True,
+            'query': request.args.get('q'),
+            'results': results
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Background job APIs
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status and per-variant progress of an adaptation job"""
+    try:
+        job = db.session.get(AdaptationJob, job_id)
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': f'Adaptation job {job_id} not found'
+            }), 404
+        return jsonify({
+            'success': True,
+            'job': job.to_dict()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/adaptation-cache/stats', methods=['GET'])
+def get_adaptation_cache_stats():
+    """Get hit/miss counters and sizes of the adaptation cache"""
+    try:
+        return jsonify({
+            'success': True,
+            'cache': adaptation_cache.stats(),
+            'single_flight': single_flight.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/translation-memory/stats', methods=['GET'])
+def get_translation_memory_stats():
+    """Get string hit rate, share of document text served and sizes of the translation memory"""
+    try:
+        return jsonify({
+            'success': True,
+            'translation_memory': translation_memory.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/llm/stats', methods=['GET'])
+def get_llm_stats():
+    """Get retry, timeout, circuit breaker and latency counters of the LLM gateway, and per-model routing figures"""
+    try:
+        return jsonify({
+            'success': True,
+            'llm': llm_gateway.stats(),
+            'routing': llm_router.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@metrics.collector
+def _collect_component_stats():
+    """Cache and LLM gateway figures that are kept by the components themselves"""
+    cache = adaptation_cache.stats()
+    details = detail_cache.stats()
+    memory = translation_memory.stats()
+    flights = single_flight.stats()
+    llm = llm_gateway.stats()
+    queued = llm_scheduler.queue_depth()
+    routing = llm_router.stats()
+    return [
+        ('cms_adaptation_cache_events_total', 'counter', 'Adaptation cache lookups and maintenance by event',
+         [({'event': event}, cache[event]) for event in
+          ('memory_hits', 'disk_hits', 'misses', 'stores', 'memory_evictions', 'disk_evictions', 'expired')]),
+        ('cms_adaptation_cache_entries', 'gauge', 'Adaptation cache entries by tier',
+         [({'tier': 'memory'}, cache['memory_entries']), ({'tier': 'disk'}, cache.get('disk_entries', 0))]),
+        ('cms_translation_memory_strings_total', 'counter', 'Translation memory string lookups by result',
+         [({'result': 'hit'}, memory['string_hits']), ({'result': 'miss'}, memory['strings'] - memory['string_hits'])]),
+        ('cms_translation_memory_entries', 'gauge', 'Translation memory entries by tier',
+         [({'tier': 'memory'}, memory['memory_entries']), ({'tier': 'disk'}, memory['disk_entries'])]),
+        ('cms_adaptation_single_flight_total', 'counter', 'Adaptation calls that led, joined an identical call or waited on a lease',
+         [({'event': event}, flights[event]) for event in ('leaders', 'followers', 'lease_waits', 'lease_hits')]),
+        ('cms_detail_cache_events_total', 'counter', 'Detail response cache events',
+         [({'event': event}, details[event]) for event in ('hits', 'misses', 'evictions', 'invalidations')]),
+        ('cms_detail_cache_bytes', 'gauge', 'Bytes held by the detail response cache', [({}, details['bytes'])]),
+        ('cms_llm_circuit_open', 'gauge', '1 while the LLM circuit breaker rejects calls',
+         [({}, 0 if llm['circuit_state'] == 'closed' else 1)]),
+        ('cms_llm_queue_depth', 'gauge', 'LLM calls waiting for rate-limit budget by priority',
+         [({'priority': priority}, queued[priority]) for priority in LLM_PRIORITIES]),
+        ('cms_llm_model_calls_total', 'counter', 'Routed LLM calls by model and outcome (cancelled = lost a hedged race)',
+         [({'model': model, 'outcome': outcome}, figures[key]) for model, figures in routing['models'].items()
+          for outcome, key in (('success', 'successes'), ('error', 'errors'), ('cancelled', 'cancelled'))]),
+        ('cms_llm_hedges_total', 'counter', 'Backup requests sent for slow LLM calls', [({}, routing['hedges'])]),
+        ('cms_llm_failovers_total', 'counter', 'Backup requests sent early because the first model failed',
+         [({}, routing['failovers'])]),
+        ('cms_llm_model_latency_seconds', 'gauge', 'Recent LLM call latency percentiles by model',
+         [({'model': model, 'quantile': quantile}, figures[f'latency_p{quantile[2:]}'])
+          for model, figures in routing['models'].items() if figures['latency_samples']
+          for quantile in ('0.50', '0.95', '0.99')]),
+        ('cms_llm_model_hedge_win_rate', 'gauge', 'Share of hedged races won by model',
+         [({'model': model}, figures['win_rate']) for model, figures in routing['models'].items()
+          if figures['win_rate'] is not None])
+    ]
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({
+            'success': False,
+            'error': 'Metrics are disabled'
+        }), 404
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
 # Content validation endpoint
 @app.route('/api/validate-content/<string:content_type>', methods=['POST'])
 def validate_content(content_type):
     """Validate content against Pydantic models"""
     try:
-        data = request.json
+        data = request_content()
         
         if content_type == 'hotel':
             content_model = validate_and_create_hotel_content(data)
@@ -813,7 +3362,7 @@ def validate_content(content_type):
         return jsonify({
             'success': True,
             'message': 'Content validation successful',
-            'validated_content': content_model.dict(),
+            'validated_content': content_model.model_dump(),
             'model_used': content_model.__class__.__name__
         })
         
@@ -828,36 +3377,143 @@ def validate_content(content_type):
             'error': str(e)
         }), 500
 
+# Schema Migrations
+def rebuild_search_documents(connection) -> int:
+    """Re-index all originals (and variants, if enabled) into content_search; returns the document count"""
+    connection.execute(db.text(SEARCH_INDEX_DDL))
+    connection.execute(db.text("DELETE FROM content_search"))
+    connection.execute(SearchDocument.__table__.delete())
+    
+    count = 0
+    for content_type, (model, _) in CONTENT_TYPES.items():
+        for record_id, original_content in connection.execute(db.select(model.id, model.original_content)):
+            index_search_document(connection, content_type, record_id, 'original', original_content)
+            count += 1
+    if app.config['SEARCH_INDEX_VARIANTS']:
+        variants = ContentVariant.__table__
+        shared = db.select(variants.c.entity_type, variants.c.entity_id, variants.c.variant_key, variants.c.content).where(
+            variants.c.variant_key.not_like(f'{CUSTOM_VARIANT_PREFIX}%')
+        )
+        for row in connection.execute(shared):
+            index_search_document(connection, *row)
+            count += 1
+    return count
+
+def _create_missing_tables(connection):
+    db.metadata.create_all(bind=connection)
+
+def _create_table(model: db.Model) -> Callable:
+    """Migration creating ``model``'s table and its indexes, unless migration 1 already did"""
+    def create(connection):
+        model.__table__.create(bind=connection, checkfirst=True)
+    return create
+
+def _move_legacy_variant_columns(connection):
+    # Before content_variants existed, each record had one JSON column per disability type.
+    # The old columns are left in place (unmapped) so the migration never loses data.
+    inspector = db.inspect(connection)
+    for content_type, (model, _) in CONTENT_TYPES.items():
+        columns = {column['name'] for column in inspector.get_columns(model.__tablename__)}
+        for disability_type in DisabilityType:
+            column = f'{disability_type.value}_content'
+            if column not in columns:
+                continue
+            connection.execute(db.text(
+                f"INSERT OR IGNORE INTO content_variants (entity_type, entity_id, variant_key, content, created_at, updated_at) "
+                f"SELECT :entity_type, id, :variant_key, {column}, created_at, updated_at "
+                f"FROM {model.__tablename__} WHERE {column} IS NOT NULL AND {column} != 'null'"
+            ), {'entity_type': content_type, 'variant_key': disability_type.value})
+
+def _add_job_scheduling_columns(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('adaptation_jobs')}
+    if 'priority' not in columns:
+        connection.execute(db.text("ALTER TABLE adaptation_jobs ADD COLUMN priority VARCHAR(16) NOT NULL DEFAULT 'backfill'"))
+    if 'tenant' not in columns:
+        connection.execute(db.text("ALTER TABLE adaptation_jobs ADD COLUMN tenant VARCHAR(64)"))
+
+def _add_job_custom_variant_column(connection):
+    columns = {column['name'] for column in db.inspect(connection).get_columns('adaptation_jobs')}
+    if 'custom_variant' not in columns:
+        connection.execute(db.text("ALTER TABLE adaptation_jobs ADD COLUMN custom_variant VARCHAR(128)"))
+        # Older custom jobs carry the variant only in their progress. Pending ones are left out:
+        # duplicates among them would break the unique index, and they finish on their own
+        connection.execute(db.text(
+            "UPDATE adaptation_jobs SET custom_variant = (SELECT key FROM json_each(progress) LIMIT 1) "
+            "WHERE status NOT IN ('queued', 'running') AND (SELECT key FROM json_each(progress) LIMIT 1) LIKE :prefix"
+        ), {'prefix': f'{CUSTOM_VARIANT_PREFIX}%'})
+    for index in AdaptationJob.__table__.indexes:
+        index.create(bind=connection, checkfirst=True)
+
+def _index_adaptation_cache_created_at(connection):
+    for index in AdaptationCacheEntry.__table__.indexes:
+        index.create(bind=connection, checkfirst=True)
+
+# Forward-only migrations, applied in order; the applied version lives in SQLite's user_version
+MIGRATIONS = [
+    (1, 'Create missing tables and the search index', _create_missing_tables),
+    (2, 'Move legacy per-disability columns into content_variants', _move_legacy_variant_columns),
+    (3, 'Index existing content for full-text search', rebuild_search_documents),
+    (4, 'Create the translation memory table', _create_table(TranslationMemoryEntry)),
+    (5, 'Create the custom profile table', _create_table(CustomProfileEntry)),
+    (6, 'Create the adaptation lease table', _create_table(AdaptationLease)),
+    (7, 'Record the LLM priority and tenant of adaptation jobs', _add_job_scheduling_columns),
+    (8, 'Allow one pending adaptation job per record and custom profile', _add_job_custom_variant_column),
+    (9, 'Index adaptation cache rows by creation time', _index_adaptation_cache_created_at)
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def migrate_schema() -> int:
+    """
+    Bring the database up to SCHEMA_VERSION and return how many migrations ran.
+    An up-to-date database costs one PRAGMA read. Each migration commits together
+    with its version bump, so an interrupted upgrade resumes where it stopped.
+    """
+    with db.engine.connect() as connection:
+        current = connection.execute(db.text('PRAGMA user_version')).scalar()
+    applied = 0
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"🔧 Migrating schema to v{version}: {description}")
+        with db.engine.begin() as connection:
+            migrate(connection)
+            connection.execute(db.text(f'PRAGMA user_version = {int(version)}'))
+        applied += 1
+    return applied
+
 # ------------------------
 # DB init CLI (simple)
 # ------------------------
+# Columns the schema check expects; adaptive variants are rows in content_variants,
+# so new variant keys need no schema change
+REQUIRED_SCHEMA = {
+    'hotels': ['id', 'created_at', 'updated_at', 'original_content'],
+    'tours': ['id', 'created_at', 'updated_at', 'original_content'],
+    'care_services': ['id', 'created_at', 'updated_at', 'original_content'],
+    'content_variants': ['id', 'entity_type', 'entity_id', 'variant_key', 'content']
+}
+
 @app.cli.command("init-db")
-def init_db():  # pragma: no cover
-    """Initialize database with correct schema"""
-    print("🔄 Initializing database with correct schema...")
-    
-    # Drop all existing tables
-    db.drop_all()
-    print("🗑️  Dropped existing tables")
+@click.option('--reset', is_flag=True, help='Drop all tables first (deletes all content)')
+def init_db(reset):  # pragma: no cover
+    """Initialize the database or upgrade it to the current schema"""
+    if reset:
+        db.drop_all()
+        with db.engine.begin() as connection:
+            connection.execute(db.text('PRAGMA user_version = 0'))
+        print("🗑️  Dropped existing tables")
     
-    # Create all tables with new schema
-    db.create_all()
-    print("✅ Database initialized with new schema")
+    applied = migrate_schema()
+    print(f"✅ Database schema at v{SCHEMA_VERSION} ({applied} migrations applied)")
     
     # Verify table structure
     try:
         inspector = db.inspect(db.engine)
-        for table_name in ['hotels', 'tours', 'care_services']:
+        for table_name, required_columns in REQUIRED_SCHEMA.items():
             columns = [col['name'] for col in inspector.get_columns(table_name)]
             print(f"📋 {table_name} columns: {columns}")
             
             # Verify required columns exist
-            required_columns = [
-                'id', 'created_at', 'updated_at', 'original_content',
-                'wheelchair_user_content', 'dyslexia_content', 
-                'cognitive_impairment_content', 'anxiety_travel_fear_content', 
-                'low_vision_content'
-            ]
             
             missing_columns = [col for col in required_columns if col not in columns]
             if missing_columns:
@@ -870,42 +3526,42 @@ def init_db():  # pragma: no cover
     
     print("🎉 Database initialization complete!")
 
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index():  # pragma: no cover
+    """Rebuild the full-text search index from all stored content"""
+    print("🔄 Rebuilding search index...")
+    with db.engine.begin() as connection:
+        count = rebuild_search_documents(connection)
+    print(f"✅ Indexed {count} documents")
+
+@app.cli.command("import-ndjson")
+@click.argument('content_type', type=click.Choice(list(CONTENT_TYPES)))
+@click.argument('source', type=click.File('rb'))
+@click.option('--adapt', type=click.Choice(IMPORT_ADAPT_MODES), default='sync', help='When to generate adaptive content')
+@click.option('--chunk-size', type=int, default=None, help='Documents per transaction')
+def import_ndjson_command(content_type, source, adapt, chunk_size):  # pragma: no cover
+    """Bulk import NDJSON content (use - to read from stdin)"""
+    print(f"📥 Importing {content_type} documents from {source.name} (adapt={adapt})...")
+    
+    with scheduling('backfill', 'cli'):
+        for result in import_ndjson(content_type, source, adapt, chunk_size):
+            if 'summary' in result:
+                summary = result['summary']
+                print(f"🎉 Imported {summary['imported']} of {summary['lines']} lines, {summary['failed']} failed")
+            elif not result['success']:
+                print(f"❌ Line {result['line']}: {result['error']}")
+    
+    if adapt == 'async':
+        print("ℹ️  Adaptation jobs are queued and will be processed by the server's job workers")
+
 if __name__ == '__main__':
     with app.app_context():
-        # Force reset database to ensure correct schema
-        print("🔄 Initializing database with correct schema...")
-        
-        # Drop all existing tables
-        db.drop_all()
-        print("🗑️  Dropped existing tables")
-        
-        # Create all tables with new schema
-        db.create_all()
-        print("✅ Database initialized with new schema")
-        
-        # Verify table structure
-        try:
-            inspector = db.inspect(db.engine)
-            for table_name in ['hotels', 'tours', 'care_services']:
-                columns = [col['name'] for col in inspector.get_columns(table_name)]
-                print(f"📋 {table_name} columns: {columns}")
-                
-                # Verify required columns exist
-                required_columns = [
-                    'id', 'created_at', 'updated_at', 'original_content',
-                    'wheelchair_user_content', 'dyslexia_content', 
-                    'cognitive_impairment_content', 'anxiety_travel_fear_content', 
-                    'low_vision_content'
-                ]
-                
-                missing_columns = [col for col in required_columns if col not in columns]
-                if missing_columns:
-                    print(f"❌ Missing columns in {table_name}: {missing_columns}")
-                else:
-                    print(f"✅ {table_name} schema is correct")
-                    
-        except Exception as e:
-            print(f"⚠️  Schema verification failed: {e}")
+        # Cheap version check; only pending forward migrations run, data is kept
+        migrate_schema()
+    
+    # Resume queued adaptation jobs; with the reloader only the serving child process runs workers
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        adaptation_jobs.start()
     
     print("🚀 Starting Flask server...")
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,234 @@
+"""
+Opt-in per-request profiling for the CMS backend.
+
+``RequestProfiler`` is WSGI middleware that profiles only the requests that ask
+for it (``X-Profile: 1`` header or ``?profile=1``). It is installed only when
+profiling is enabled, so there is no per-request overhead otherwise. Two modes:
+
+- ``sampling`` (default): a background thread samples the Python stack of the
+  request thread, and of the threads working for it (tasks wrapped with
+  ``profiled_thread``), every few milliseconds.
+  It writes a speedscope file (open at https://www.speedscope.app), a
+  collapsed-stack file for flamegraph.pl and a top-N text summary.
+- ``cprofile``: deterministic cProfile of the request thread only. It writes
+  a ``.prof`` file (for snakeviz / gprof2dot) and a pstats top-N summary.
+
+The response body is buffered while profiling so its generation (JSON
+encoding, streamed events) is part of the profile. The report's base name is
+returned in the ``X-Profile-Report`` response header.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+PROFILE_MODES = ('sampling', 'cprofile')
+
+# Ids of the threads currently working for the request being profiled (None when not profiling)
+_request_threads: contextvars.ContextVar = contextvars.ContextVar('profiled_threads', default=None)
+# Set once a sampling RequestProfiler is installed; until then profiled_thread wraps nothing
+_sampler_installed = False
+
+Frame = Tuple[str, str, int]
+
+
+def profiled_thread(function: Callable) -> Callable:
+    """
+    Sample the thread that runs ``function`` with the request being profiled, if any. The
+    wrapper must run in the request's context, e.g. through ``llm_scheduler.in_current_context``.
+    Returns ``function`` itself when no sampling profiler is installed.
+    """
+    if not _sampler_installed:
+        return function
+
+    def run(*args, **kwargs):
+        threads = _request_threads.get()
+        thread_id = threading.get_ident()
+        if threads is None or thread_id in threads:
+            return function(*args, **kwargs)
+        threads.add(thread_id)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            threads.discard(thread_id)
+    return run
+
+
+class StackSampler:
+    """Samples the stacks of a request thread, and of the threads working for it, at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float, threads: Optional[Set[int]] = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Shared with profiled_thread, which adds and removes worker threads while the request runs
+        self.threads = threads if threads is not None else {thread_id}
+        self.samples: Dict[str, List[Tuple[Tuple[Frame, ...], float]]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = (now - last) * 1000, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            sampled = set(self.threads)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id not in sampled:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                label = 'request' if thread_id == self.thread_id else names.get(thread_id, str(thread_id))
+                self.samples.setdefault(label, []).append((tuple(reversed(stack)), weight))
+
+    def speedscope(self, title: str) -> Dict:
+        frames, index = [], {}
+        profiles = []
+        for label, samples in self.samples.items():
+            stacks, weights = [], []
+            for stack, weight in samples:
+                indices = []
+                for frame in stack:
+                    if frame not in index:
+                        index[frame] = len(frames)
+                        frames.append({'name': frame[0], 'file': frame[1], 'line': frame[2]})
+                    indices.append(index[frame])
+                stacks.append(indices)
+                weights.append(round(weight, 3))
+            profiles.append({
+                'type': 'sampled', 'name': label, 'unit': 'milliseconds',
+                'startValue': 0, 'endValue': round(sum(weights), 3),
+                'samples': stacks, 'weights': weights
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': title, 'exporter': 'cms_profiling', 'activeProfileIndex': 0,
+            'shared': {'frames': frames}, 'profiles': profiles
+        }
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, one line per distinct stack, weights in microseconds"""
+        folded = Counter()
+        for label, samples in self.samples.items():
+            for stack, weight in samples:
+                folded[';'.join([label] + [f'{name} ({os.path.basename(file)}:{line})' for name, file, line in stack])] += weight
+        return ''.join(f'{stack} {int(weight * 1000)}\n' for stack, weight in folded.most_common())
+
+    def summary(self, title: str, top: int) -> str:
+        self_time, total_time = Counter(), Counter()
+        sampled = 0.0
+        for samples in self.samples.values():
+            for stack, weight in samples:
+                sampled += weight
+                if stack:
+                    self_time[stack[-1]] += weight
+                for frame in set(stack):
+                    total_time[frame] += weight
+
+        def table(heading: str, counter: Counter) -> List[str]:
+            lines = [heading, f"{'ms':>10}{'%':>7}  function"]
+            for (name, file, line), weight in counter.most_common(top):
+                share = weight / sampled * 100 if sampled else 0
+                lines.append(f'{weight:>10.1f}{share:>6.1f}%  {name} ({file}:{line})')
+            return lines + ['']
+
+        lines = [title, f'wall {self.elapsed * 1000:.1f} ms, {sum(len(s) for s in self.samples.values())} samples '
+                        f'across threads {sorted(self.samples)}', '']
+        lines += table(f'Top {top} by self time', self_time)
+        lines += table(f'Top {top} by total time (including callees)', total_time)
+        return '\n'.join(lines)
+
+
+class RequestProfiler:
+    """WSGI middleware profiling the requests flagged with ``X-Profile: 1`` or ``?profile=1``"""
+
+    def __init__(self, wsgi_app, output_dir: str, mode: str = 'sampling', interval: float = 0.002, top: int = 30):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f'Unknown profiling mode {mode!r}, expected one of {PROFILE_MODES}')
+        global _sampler_installed
+        if mode == 'sampling':
+            _sampler_installed = True
+        self.wsgi_app = wsgi_app
+        self.output_dir = output_dir
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+
+    @staticmethod
+    def wants_profile(environ) -> bool:
+        if environ.get('HTTP_X_PROFILE', '').lower() in ('1', 'true', 'yes'):
+            return True
+        return re.search(r'(?:^|&)profile=(?:1|true|yes)(?:&|$)', environ.get('QUERY_STRING', '')) is not None
+
+    def __call__(self, environ, start_response):
+        if not self.wants_profile(environ):
+            return self.wsgi_app(environ, start_response)
+
+        method, path = environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', '/')
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-') or 'root'
+        base = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{method.lower()}-{slug}"
+        title = f'{method} {path}'
+
+        def profiled_start_response(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Profile-Report', base)], exc_info)
+
+        def run():
+            app_iter = self.wsgi_app(environ, profiled_start_response)
+            try:
+                return b''.join(app_iter)
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        target = os.path.join(self.output_dir, base)
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            body = profiler.runcall(run)
+            elapsed = time.perf_counter() - started
+            profiler.dump_stats(f'{target}.prof')
+            report = io.StringIO()
+            report.write(f'{title}\nwall {elapsed * 1000:.1f} ms\n\n')
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(self.top)
+            with open(f'{target}.txt', 'w') as summary:
+                summary.write(report.getvalue())
+        else:
+            threads = {threading.get_ident()}
+            token = _request_threads.set(threads)
+            try:
+                with StackSampler(threading.get_ident(), self.interval, threads) as sampler:
+                    body = run()
+            finally:
+                _request_threads.reset(token)
+            with open(f'{target}.speedscope.json', 'w') as speedscope:
+                json.dump(sampler.speedscope(title), speedscope)
+            with open(f'{target}.collapsed.txt', 'w') as collapsed:
+                collapsed.write(sampler.collapsed())
+            with open(f'{target}.txt', 'w') as summary:
+                summary.write(sampler.summary(title, self.top))
+
+        print(f"🔬 Profiled {title} -> {target}.*")
+        return [body]
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for the CMS backend (``gunicorn -c gunicorn.conf.py wsgi:app``).
+
+Threaded workers suit this app: requests mostly wait on the LLM provider, and
+SQLite in WAL mode lets readers in every process run while one writer commits.
+The app is imported once in the master (so the schema is created once); each
+worker then drops the inherited connection pool and opens its own connections,
+and starts its own adaptation job workers.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5001')
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+# A full multi-variant generation can take a while
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '180'))
+graceful_timeout = 30
+keepalive = 5
+preload_app = True
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    from cms_backend_v2 import app, db
+    with app.app_context():
+        # SQLite connections must not be shared across fork
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from cms_backend_v2 import adaptation_jobs
+    adaptation_jobs.start()
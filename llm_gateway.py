@@ -0,0 +1,353 @@
+"""
+LLM gateway for the CMS backend.
+
+Wraps every ``chat.completions.create`` call made against the OpenAI-compatible
+provider with:
+
+- one shared client with a keep-alive connection pool
+- a per-attempt timeout and an overall deadline across retries
+- jittered exponential backoff for connection errors, timeouts, 408/429 and 5xx
+- a circuit breaker that fails fast while the provider is down
+- optional admission through an ``LLMScheduler`` (rate limits, priorities)
+- counters and latency figures for each of the above (``stats()``)
+
+The OpenAI SDK is imported when the first request is made. Point ``base_url``
+at a local stub server to exercise the gateway without a real provider.
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when no LLM client is configured"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker. After ``failure_threshold``
+    consecutive failures the circuit opens and calls are rejected for
+    ``reset_timeout`` seconds; then a single trial call is let through, and
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.opened_total = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.opened_total += 1
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give back a half-open trial that was allowed but never made"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class SettlingStream:
+    """
+    A streamed response that passes its usage chunk (the last one, with
+    ``stream_options={'include_usage': True}``) to ``settle`` once it is
+    exhausted or closed. Other attributes come from the wrapped stream.
+    """
+
+    def __init__(self, stream, settle: Callable[[Any], None]):
+        self._stream = stream
+        self._settle = settle
+        self._usage_chunk = None
+        self._settled = False
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    self._usage_chunk = chunk
+                yield chunk
+        finally:
+            self._finish()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+    def close(self):
+        try:
+            if hasattr(self._stream, 'close'):
+                self._stream.close()
+        finally:
+            self._finish()
+
+    def _finish(self):
+        # A stream cut off before its usage chunk keeps the estimate it was admitted with
+        if not self._settled:
+            self._settled = True
+            if self._usage_chunk is not None:
+                self._settle(self._usage_chunk)
+
+
+class LLMGateway:
+    """Resilient, pooled access to an OpenAI-compatible chat completions API"""
+
+    def __init__(self, base_url: str, api_key: Optional[str], *,
+                 request_timeout: float = 60.0, connect_timeout: float = 5.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, scheduler=None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.scheduler = scheduler
+
+        self._client = None
+        self._openai = None
+        self._client_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'attempts': 0, 'successes': 0, 'failures': 0, 'retries': 0,
+            'timeouts': 0, 'circuit_rejections': 0, 'deadline_exceeded': 0, 'rate_limited': 0,
+            'latency_ms_total': 0.0, 'latency_ms_max': 0.0
+        }
+        self._listeners = []
+
+    @property
+    def available(self) -> bool:
+        return self._client is not None or bool(self.api_key)
+
+    @property
+    def client(self):
+        """The shared SDK client, created on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        """Swap in a ready-made client (e.g. a test double)"""
+        self._client = client
+
+    def _build_client(self):
+        if not self.api_key:
+            raise LLMUnavailableError('No LLM API key configured')
+        import openai
+        self._openai = openai
+
+        http_client = None
+        try:
+            import httpx
+            http_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                timeout=httpx.Timeout(self.request_timeout, connect=self.connect_timeout)
+            )
+        except ImportError:  # SDK built on another HTTP stack: keep its default keep-alive pool
+            pass
+
+        return openai.OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            timeout=self.request_timeout,
+            # Retries are handled here so the deadline and breaker see every attempt
+            max_retries=0,
+            **({'http_client': http_client} if http_client is not None else {})
+        )
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register ``listener(event, details)`` for 'success' / 'failure' / 'retry' / 'rejected' events"""
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, **details):
+        for listener in self._listeners:
+            try:
+                listener(event, details)
+            except Exception:
+                pass
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _fail(self, kwargs: Dict[str, Any], error: Exception, started: float, attempts: int, **increments):
+        """Count and report a call that gives up with ``error``"""
+        self._count(failures=1, **increments)
+        self._emit('failure', model=kwargs.get('model'), error=error,
+                   latency=time.monotonic() - started, attempts=attempts)
+
+    def _is_retryable(self, error: Exception) -> bool:
+        status = getattr(error, 'status_code', None)
+        if status is not None:
+            return status in (408, 409, 429) or status >= 500
+        if self._openai is not None and isinstance(error, self._openai.APIConnectionError):
+            return True
+        return isinstance(error, (TimeoutError, ConnectionError))
+
+    def _is_timeout(self, error: Exception) -> bool:
+        if self._openai is not None and isinstance(error, self._openai.APITimeoutError):
+            return True
+        return isinstance(error, TimeoutError)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the provider sends one"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        response = getattr(error, 'response', None)
+        retry_after = getattr(response, 'headers', {}).get('retry-after') if response is not None else None
+        try:
+            return max(delay, min(float(retry_after), self.backoff_max)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def chat_completion(self, *, deadline: Optional[float] = None, **kwargs):
+        """
+        Call ``chat.completions.create(**kwargs)`` with retries, returning the SDK response
+        (or stream when ``stream=True``). ``deadline`` caps the total time in seconds across
+        all attempts and backoff; each attempt is also bounded by ``request_timeout``.
+        Raises CircuitOpenError without calling the provider while the circuit is open, and
+        the scheduler's RateLimitedError when no rate-limit budget frees up before the deadline.
+        """
+        self._count(requests=1)
+        if not self.breaker.allow():
+            self._count(circuit_rejections=1)
+            self._emit('rejected', model=kwargs.get('model'))
+            raise CircuitOpenError('LLM provider circuit is open, failing fast')
+        # Allowed while not closed: this call is the half-open trial and must settle it on every exit
+        trial = self.breaker.state != 'closed'
+
+        client = self.client
+        started = time.monotonic()
+        deadline_at = started + deadline if deadline is not None else None
+        attempt = 0
+        while True:
+            estimated_tokens = 0
+            if self.scheduler is not None:
+                # Waiting for budget counts against the deadline
+                try:
+                    estimated_tokens = self.scheduler.admit(
+                        kwargs, timeout=max(0.0, deadline_at - time.monotonic()) if deadline_at is not None else None
+                    )
+                except Exception:
+                    if trial:
+                        self.breaker.release_trial()
+                    self._count(rate_limited=1)
+                    raise
+
+            attempt_timeout = self.request_timeout
+            if deadline_at is not None:
+                attempt_timeout = min(attempt_timeout, deadline_at - time.monotonic())
+                if attempt_timeout <= 0:
+                    error = TimeoutError(f'LLM deadline of {deadline}s exceeded after {attempt} attempts')
+                    # Used up waiting (backoff, rate-limit queue) without calling the provider: not its failure
+                    if trial:
+                        self.breaker.release_trial()
+                    if self.scheduler is not None:
+                        self.scheduler.refund(estimated_tokens)
+                    self._fail(kwargs, error, started, attempt, deadline_exceeded=1)
+                    raise error
+
+            attempt_started = time.monotonic()
+            self._count(attempts=1)
+            try:
+                response = client.chat.completions.create(timeout=attempt_timeout, **kwargs)
+            except Exception as error:
+                if self._is_timeout(error):
+                    self._count(timeouts=1)
+                retryable = self._is_retryable(error)
+                if retryable:
+                    self.breaker.record_failure()
+                elif trial:
+                    # The provider answered (e.g. 400): not an outage, so let the next call be the trial
+                    self.breaker.release_trial()
+                delay = self._backoff(attempt, error)
+                if self.scheduler is not None:
+                    # A failed attempt reports no usage: hand its reservation back before the retry or raise
+                    self.scheduler.refund(estimated_tokens)
+                    if getattr(error, 'status_code', None) == 429:
+                        # Every process sharing the limits backs off, not just this call
+                        self.scheduler.throttle(delay)
+                if not retryable or attempt >= self.max_retries or not self.breaker.allow():
+                    self._fail(kwargs, error, started, attempt + 1)
+                    raise
+                if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+                    self._fail(kwargs, error, started, attempt + 1, deadline_exceeded=1)
+                    raise
+                self._count(retries=1)
+                self._emit('retry', model=kwargs.get('model'), error=error, attempt=attempt + 1)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            latency_ms = (time.monotonic() - attempt_started) * 1000
+            self.breaker.record_success()
+            if self.scheduler is not None:
+                if kwargs.get('stream'):
+                    response = SettlingStream(
+                        response, lambda usage_chunk, estimate=estimated_tokens: self.scheduler.settle(estimate, usage_chunk)
+                    )
+                else:
+                    self.scheduler.settle(estimated_tokens, response)
+            with self._stats_lock:
+                self._stats['successes'] += 1
+                self._stats['latency_ms_total'] += latency_ms
+                self._stats['latency_ms_max'] = max(self._stats['latency_ms_max'], latency_ms)
+            self._emit('success', model=kwargs.get('model'), response=response,
+                       latency=time.monotonic() - started, attempts=attempt + 1)
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['latency_ms_avg'] = round(stats['latency_ms_total'] / stats['successes'], 2) if stats['successes'] else 0.0
+        stats['circuit_state'] = self.breaker.state
+        stats['circuit_opened_total'] = self.breaker.opened_total
+        stats['pool'] = {
+            'max_connections': self.max_connections,
+            'max_keepalive_connections': self.max_keepalive_connections
+        }
+        if self.scheduler is not None:
+            stats['scheduler'] = self.scheduler.stats()
+        return stats
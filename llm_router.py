@@ -0,0 +1,260 @@
+"""
+Latency-aware model routing and hedged requests for LLM calls.
+
+``ModelRouter`` picks the model for each call from a list of candidates. A
+call's size is its estimated tokens, prompt plus expected reply. Models rated
+for smaller calls are skipped; the rest are ranked by their median latency over
+recent calls, scaled to the size of this call. Models without enough samples
+keep their configured order, and a small share of calls explores another model
+so its figures stay current.
+
+With hedging, ``run`` starts the call on the best model and, if it has not
+answered by the time a given percentile of that model's latency has passed,
+sends a backup request to the next model. The first attempt that succeeds
+(i.e. its reply validates) wins and the other is told to stop through its
+cancel event. Only the tail is hedged: at the 95th percentile about one call in
+twenty sends a second request. A primary that fails before the hedge delay fails
+over to the next model at once. Attempts run on a bounded thread pool.
+
+Per-model latency percentiles, outcomes and hedged race win rates are kept
+in ``stats()``.
+"""
+import math
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from llm_scheduler import in_current_context
+
+# Fixed per-call cost in tokens when scaling latency to call size (queueing, time to first token)
+OVERHEAD_TOKENS = 200
+
+
+class HedgeCancelled(RuntimeError):
+    """Raised by an attempt that stopped because the other attempt of its hedged pair won"""
+
+
+def parse_models(spec: str) -> List[Tuple[str, Optional[int]]]:
+    """
+    Parse ``"model-a, model-b@100000"`` into ``[('model-a', None), ('model-b', 100000)]``:
+    candidate models in preference order, each with the largest call (in estimated
+    tokens) it should be given
+    """
+    models = []
+    for entry in spec.split(','):
+        name, _, limit = entry.strip().partition('@')
+        if name:
+            models.append((name, int(limit) if limit else None))
+    if not models:
+        raise ValueError('No LLM models configured')
+    return models
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class ModelStats:
+    """Recent latencies and outcome counters of one model"""
+
+    def __init__(self, window: int):
+        # (call size in tokens, seconds) of recent finished calls
+        self.samples: deque = deque(maxlen=window)
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.backups = 0
+        self.failovers = 0
+        self.races = 0
+        self.race_wins = 0
+
+
+class ModelRouter:
+    """Routes LLM calls to the fastest suitable model and hedges slow calls with a second model"""
+
+    def __init__(self, models: List[Tuple[str, Optional[int]]], *, hedging: bool = True,
+                 hedge_percentile: float = 0.95, hedge_min_delay: float = 2.0, hedge_default_delay: float = 15.0,
+                 window: int = 200, min_samples: int = 10, explore: float = 0.05, max_workers: int = 32):
+        self.models = models
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        # Hedge delay while the primary has too few samples for a percentile
+        self.hedge_default_delay = hedge_default_delay
+        self.min_samples = min_samples
+        self.explore = explore
+        self._stats = {name: ModelStats(window) for name, _ in models}
+        self._lock = threading.Lock()
+        self._hedges = 0
+        self._failovers = 0
+        self._routed = 0
+        # Threads for hedged attempts; at most two per call, so this caps concurrent hedged calls
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='adaptation-hedge')
+
+    @property
+    def default_model(self) -> str:
+        return self.models[0][0]
+
+    def predict(self, model: str, size: int, fraction: float = 0.5) -> Optional[float]:
+        """The ``fraction`` percentile of ``model``'s recent latency, scaled to a call of ``size`` tokens"""
+        with self._lock:
+            samples = list(self._stats[model].samples)
+        if len(samples) < self.min_samples:
+            return None
+        scaled = sorted(latency * (size + OVERHEAD_TOKENS) / (sample_size + OVERHEAD_TOKENS)
+                        for sample_size, latency in samples)
+        return percentile(scaled, fraction)
+
+    def candidates(self, size: int) -> List[str]:
+        """Models rated for a call of ``size`` tokens, best first"""
+        eligible = [name for name, limit in self.models if limit is None or size <= limit]
+        if not eligible:
+            # Nothing is rated for this size: try the model that takes the most
+            return [max(self.models, key=lambda model: model[1])[0]]
+
+        order = {name: index for index, name in enumerate(eligible)}
+        predicted = {name: self.predict(name, size) for name in eligible}
+        ranked = sorted(eligible, key=lambda name: (predicted[name] is None, predicted[name] or 0.0, order[name]))
+        if len(ranked) > 1 and random.random() < self.explore:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+    def hedge_delay(self, model: str, size: int) -> float:
+        delay = self.predict(model, size, self.hedge_percentile)
+        return max(self.hedge_min_delay, delay if delay is not None else self.hedge_default_delay)
+
+    def observe(self, model: str, size: int, latency: Optional[float], outcome: str):
+        """
+        Record a finished call: 'success' and 'cancelled' (a lower bound, which still moves a
+        slow model's figures up) add a latency sample; 'error' only counts
+        """
+        with self._lock:
+            stats = self._stats.setdefault(model, ModelStats(self._stats[self.default_model].samples.maxlen))
+            stats.calls += 1
+            if outcome == 'success':
+                stats.successes += 1
+            elif outcome == 'cancelled':
+                stats.cancelled += 1
+            else:
+                stats.errors += 1
+            if latency is not None and outcome != 'error':
+                stats.samples.append((size, latency))
+
+    def run(self, size: int, attempt: Callable[[str, Optional[threading.Event]], Any],
+            timeout: Optional[float] = None) -> Tuple[Any, str]:
+        """
+        Run ``attempt(model, cancelled)`` on the best model and return ``(result, model)``.
+        ``attempt`` returns only results that are good to use and raises otherwise. When a
+        hedge is possible it runs on a pool thread and gets an Event that is set once the
+        other attempt has won; without one it runs on this thread with ``cancelled=None``.
+        The backup starts early if the primary fails first. If every attempt fails, the
+        primary's error is raised.
+        """
+        candidates = self.candidates(size)
+        primary = candidates[0]
+        with self._lock:
+            self._routed += 1
+        if not self.hedging or len(candidates) < 2:
+            started = time.monotonic()
+            try:
+                result = attempt(primary, None)
+            except Exception:
+                self.observe(primary, size, None, 'error')
+                raise
+            self.observe(primary, size, time.monotonic() - started, 'success')
+            return result, primary
+
+        backup = candidates[1]
+        finished: queue.Queue = queue.Queue()
+        cancel = {primary: threading.Event(), backup: threading.Event()}
+        launched = {}
+
+        def launch(model: str):
+            launched[model] = time.monotonic()
+
+            def run_attempt():
+                # Each attempt records its own outcome: a loser finishes after run() has returned
+                try:
+                    result = attempt(model, cancel[model])
+                except Exception as error:
+                    outcome = 'cancelled' if isinstance(error, HedgeCancelled) else 'error'
+                    self.observe(model, size, time.monotonic() - launched[model], outcome)
+                    finished.put((model, False, error))
+                else:
+                    self.observe(model, size, time.monotonic() - launched[model], 'success')
+                    finished.put((model, True, result))
+            self._executor.submit(in_current_context(run_attempt))
+
+        started = time.monotonic()
+        deadline_at = started + timeout if timeout is not None else None
+        hedge_at = started + self.hedge_delay(primary, size)
+        launch(primary)
+        errors = {}
+        while len(errors) < len(launched):
+            wait = None
+            if backup not in launched:
+                wait = hedge_at - time.monotonic()
+            if deadline_at is not None:
+                wait = min(wait if wait is not None else math.inf, deadline_at - time.monotonic())
+            try:
+                model, succeeded, value = finished.get(timeout=max(0.0, wait) if wait is not None else None)
+            except queue.Empty:
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    for event in cancel.values():
+                        event.set()
+                    raise TimeoutError(f'No model answered within {timeout}s')
+                with self._lock:
+                    self._hedges += 1
+                    self._stats[backup].backups += 1
+                launch(backup)
+                continue
+
+            if not succeeded:
+                errors[model] = value
+                if backup not in launched:
+                    # No point waiting for the hedge delay: fail over now
+                    with self._lock:
+                        self._failovers += 1
+                        self._stats[backup].failovers += 1
+                    launch(backup)
+                continue
+
+            losers = [other for other in launched if other != model and other not in errors]
+            for other in losers:
+                cancel[other].set()
+            if backup in launched:
+                with self._lock:
+                    for name in launched:
+                        self._stats[name].races += 1
+                    self._stats[model].race_wins += 1
+            return value, model
+        raise errors[primary]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {name: (list(stats.samples), dict(vars(stats))) for name, stats in self._stats.items()}
+            routed, hedges, failovers = self._routed, self._hedges, self._failovers
+        report = {}
+        for name, (samples, counters) in models.items():
+            counters.pop('samples')
+            latencies = sorted(latency for _, latency in samples)
+            report[name] = {
+                **counters,
+                'win_rate': round(counters['race_wins'] / counters['races'], 3) if counters['races'] else None,
+                'latency_samples': len(latencies),
+                **{f'latency_p{int(fraction * 100)}': round(percentile(latencies, fraction), 3) if latencies else None
+                   for fraction in (0.5, 0.95, 0.99)}
+            }
+        return {
+            'routed': routed,
+            'hedges': hedges,
+            'hedge_rate': round(hedges / routed, 3) if routed else 0.0,
+            'failovers': failovers,
+            'hedging': self.hedging,
+            'models': report
+        }
@@ -0,0 +1,343 @@
+"""
+Priority-aware admission control for LLM calls.
+
+Every call made through ``LLMGateway`` first asks ``LLMScheduler.admit`` for
+budget. The budget is two token buckets, requests per minute and estimated
+tokens per minute, kept in a small SQLite file so all worker processes on one
+host draw from the same limits (``SharedRateLimiter``).
+
+Calls waiting for budget are admitted in order of priority class
+(``interactive`` > ``create`` > ``backfill``) and, within a class, round-robin
+across tenants, so one editor's bulk import cannot starve another editor.
+Ordering is per process; across processes, lower classes keep a share of each
+bucket in reserve (``PRIORITY_RESERVE``) so interactive calls in any worker
+still find budget.
+
+The priority and tenant of a call come from a context variable, set with
+``scheduling(priority=..., tenant=...)``. Context variables do not follow work
+handed to a thread pool, nor a generator consumed after the caller returns (a
+streamed response body); wrap such work with ``in_current_context`` or
+``iterate_in_current_context``.
+"""
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+PRIORITIES = ('interactive', 'create', 'backfill')
+
+# Share of each bucket a priority class leaves for the classes above it
+PRIORITY_RESERVE = {'interactive': 0.0, 'create': 0.1, 'backfill': 0.3}
+
+DEFAULT_SCHEDULING = ('interactive', 'default')
+
+_scheduling: contextvars.ContextVar = contextvars.ContextVar('llm_scheduling', default=DEFAULT_SCHEDULING)
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when a call could not get rate-limit budget before its deadline"""
+
+
+@contextmanager
+def scheduling(priority: Optional[str] = None, tenant: Optional[str] = None):
+    """Run the block's LLM calls with the given priority class and/or tenant"""
+    current_priority, current_tenant = _scheduling.get()
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f'Unknown priority {priority!r}, expected one of {PRIORITIES}')
+    token = _scheduling.set((priority or current_priority, tenant or current_tenant))
+    try:
+        yield
+    finally:
+        _scheduling.reset(token)
+
+
+def current_scheduling() -> Tuple[str, str]:
+    """``(priority, tenant)`` of LLM calls made from here"""
+    return _scheduling.get()
+
+
+def in_current_context(function: Callable) -> Callable:
+    """Bind ``function`` to the caller's context (priority, tenant) for running in another thread"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so each call gets a copy
+        return context.copy().run(function, *args, **kwargs)
+    return run
+
+
+def iterate_in_current_context(iterable: Iterable) -> Iterator:
+    """Consume ``iterable`` (e.g. a generator) in the caller's context, wherever it is iterated"""
+    context = contextvars.copy_context()
+    iterator = iter(iterable)
+
+    def run():
+        while True:
+            try:
+                item = context.run(next, iterator)
+            except StopIteration:
+                return
+            yield item
+    return run()
+
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """
+    Rough token cost of a chat completion request: the prompt (about four characters
+    per token) plus a reply as long as the prompt, capped at ``max_tokens``
+    """
+    prompt = sum(len(str(message.get('content') or '')) for message in kwargs.get('messages') or ()) // 4 + 1
+    return prompt + min(prompt, kwargs.get('max_tokens') or prompt)
+
+
+class SharedRateLimiter:
+    """
+    Request and token buckets in a SQLite file, shared by every process that opens it.
+    Each bucket holds up to one minute of budget and refills continuously. A limit of
+    0 disables that bucket.
+    """
+
+    def __init__(self, path: str, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.path = path
+        self.limits = {'requests': float(requests_per_minute), 'tokens': float(tokens_per_minute)}
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return any(self.limits.values())
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (connections must not cross a fork)
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL, blocked_until REAL NOT NULL DEFAULT 0)'
+            )
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def _update(self, change: Callable[[Dict[str, list], float], Any]):
+        """Run ``change(buckets, now)`` on the refilled buckets in one write transaction"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            rows = {name: (level, updated, blocked_until)
+                    for name, level, updated, blocked_until in connection.execute('SELECT * FROM buckets')}
+            buckets = {}
+            for name, limit in self.limits.items():
+                level, updated, blocked_until = rows.get(name, (limit, now, 0.0))
+                buckets[name] = [min(limit, level + max(0.0, now - updated) * limit / 60), blocked_until]
+            result = change(buckets, now)
+            connection.executemany(
+                'INSERT OR REPLACE INTO buckets (name, level, updated, blocked_until) VALUES (?, ?, ?, ?)',
+                [(name, level, now, blocked_until) for name, (level, blocked_until) in buckets.items()]
+            )
+            connection.execute('COMMIT')
+            return result
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def try_acquire(self, tokens: int, reserve: float = 0.0) -> float:
+        """
+        Take one request and ``tokens`` if both buckets have them while keeping ``reserve``
+        (a share of each bucket) free. Returns 0 when taken, else the seconds to wait.
+        """
+        if not self.enabled:
+            return 0.0
+
+        def take(buckets, now):
+            wait = 0.0
+            for name, cost in (('requests', 1), ('tokens', tokens)):
+                limit = self.limits[name]
+                if not limit:
+                    continue
+                level, blocked_until = buckets[name]
+                wait = max(wait, blocked_until - now)
+                # A single call bigger than the bucket only needs a full bucket
+                needed = min(limit, cost + reserve * limit)
+                if level < needed:
+                    wait = max(wait, (needed - level) * 60 / limit)
+            if wait <= 0:
+                for name, cost in (('requests', 1), ('tokens', tokens)):
+                    buckets[name][0] -= cost if self.limits[name] else 0
+            return max(0.0, wait)
+        return self._update(take)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once the real usage of an admitted call is known"""
+        if not self.limits['tokens']:
+            return
+
+        def correct(buckets, now):
+            buckets['tokens'][0] -= actual_tokens - estimated_tokens
+        self._update(correct)
+
+    def block(self, seconds: float):
+        """Hold every process back for ``seconds``, e.g. after the provider answered 429"""
+        if not self.enabled:
+            return
+
+        def hold(buckets, now):
+            for bucket in buckets.values():
+                bucket[1] = max(bucket[1], now + seconds)
+        self._update(hold)
+
+
+class Ticket:
+    __slots__ = ('priority', 'tenant', 'tokens')
+
+    def __init__(self, priority: str, tenant: str, tokens: int):
+        self.priority = priority
+        self.tenant = tenant
+        self.tokens = tokens
+
+
+class LLMScheduler:
+    """Admits LLM calls against a ``SharedRateLimiter`` by priority, round-robin across tenants"""
+
+    def __init__(self, limiter: SharedRateLimiter, max_wait: float = 1.0):
+        self.limiter = limiter
+        # Longest sleep between budget checks (refills from other processes are not signalled)
+        self.max_wait = max_wait
+        self._queues: Dict[str, 'OrderedDict[str, deque]'] = {priority: OrderedDict() for priority in PRIORITIES}
+        self._condition = threading.Condition()
+        self._stats = {
+            'admitted': {priority: 0 for priority in PRIORITIES},
+            'rate_limited': {priority: 0 for priority in PRIORITIES},
+            'wait_seconds_total': {priority: 0.0 for priority in PRIORITIES},
+            'throttled': 0,
+            'limiter_errors': 0
+        }
+        self._listeners = []
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register ``listener(event, details)`` for 'admitted' / 'rate_limited' events"""
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, **details):
+        for listener in self._listeners:
+            try:
+                listener(event, details)
+            except Exception:
+                pass
+
+    def _limiter(self, method: str, *args, default=None):
+        """Call the shared limiter, failing open: a broken bucket file must not stop all LLM calls"""
+        try:
+            return getattr(self.limiter, method)(*args)
+        except sqlite3.Error as error:
+            with self._condition:
+                self._stats['limiter_errors'] += 1
+            print(f"⚠️ LLM rate limiter unavailable ({error}), not limiting")
+            return default
+
+    def _head(self) -> Optional[Ticket]:
+        for priority in PRIORITIES:
+            tenants = self._queues[priority]
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def _remove(self, ticket: Ticket, served: bool):
+        tenants = self._queues[ticket.priority]
+        tickets = tenants[ticket.tenant]
+        tickets.remove(ticket)
+        if not tickets:
+            del tenants[ticket.tenant]
+        elif served:
+            # After being served a tenant goes to the back of its class
+            tenants.move_to_end(ticket.tenant)
+
+    def admit(self, kwargs: Dict[str, Any], timeout: Optional[float] = None) -> int:
+        """
+        Block until the call described by ``kwargs`` may be made; returns its estimated
+        token cost. Raises RateLimitedError if that takes longer than ``timeout`` seconds.
+        """
+        priority, tenant = current_scheduling()
+        tokens = estimate_tokens(kwargs)
+        if not self.limiter.enabled:
+            with self._condition:
+                self._stats['admitted'][priority] += 1
+            return tokens
+
+        started = time.monotonic()
+        ticket = Ticket(priority, tenant, tokens)
+        with self._condition:
+            self._queues[priority].setdefault(tenant, deque()).append(ticket)
+        served = False
+        try:
+            while True:
+                with self._condition:
+                    at_head = self._head() is ticket
+                wait = None
+                if at_head:
+                    # The bucket transaction can wait on other processes: never hold the lock over it
+                    wait = self._limiter('try_acquire', tokens, PRIORITY_RESERVE[priority], default=0.0)
+                    if wait <= 0:
+                        served = True
+                        break
+                remaining = None if timeout is None else started + timeout - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    with self._condition:
+                        self._stats['rate_limited'][priority] += 1
+                    self._emit('rate_limited', priority=priority, tenant=tenant, waited=time.monotonic() - started)
+                    raise RateLimitedError(f'No LLM rate-limit budget within {timeout:.1f}s ({priority} queue)')
+                with self._condition:
+                    # Reached the head since the check above: its notify came before this wait
+                    if not at_head and self._head() is ticket:
+                        continue
+                    self._condition.wait(min(wait or self.max_wait, self.max_wait, remaining or self.max_wait))
+        finally:
+            with self._condition:
+                self._remove(ticket, served)
+                self._condition.notify_all()
+        waited = time.monotonic() - started
+        with self._condition:
+            self._stats['admitted'][priority] += 1
+            self._stats['wait_seconds_total'][priority] += waited
+        self._emit('admitted', priority=priority, tenant=tenant, waited=waited)
+        return tokens
+
+    def settle(self, estimated_tokens: int, response):
+        """Replace the estimate with the reported usage of a finished call"""
+        usage = getattr(response, 'usage', None)
+        total = getattr(usage, 'total_tokens', None) if usage is not None else None
+        if total:
+            self._limiter('settle', estimated_tokens, total)
+
+    def refund(self, estimated_tokens: int):
+        """Give back the estimate of an admitted call that failed without reporting usage"""
+        if estimated_tokens:
+            self._limiter('settle', estimated_tokens, 0)
+
+    def throttle(self, seconds: float):
+        """The provider rate-limited us: pause admissions in every process"""
+        with self._condition:
+            self._stats['throttled'] += 1
+        self._limiter('block', seconds)
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._condition:
+            return {priority: sum(len(tickets) for tickets in self._queues[priority].values()) for priority in PRIORITIES}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            stats = {key: dict(value) if isinstance(value, dict) else value for key, value in self._stats.items()}
+        stats['queued'] = self.queue_depth()
+        stats['limits'] = {
+            'requests_per_minute': self.limiter.limits['requests'],
+            'tokens_per_minute': self.limiter.limits['tokens']
+        }
+        return stats
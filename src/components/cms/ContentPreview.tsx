@@ -79,6 +79,7 @@ const ContentPreview = () => {
   const [apiDisabilityTypes, setApiDisabilityTypes] = useState<{ [key: string]: string }>({});
   const [isLoading, setIsLoading] = useState(false);
   const [isRegenerating, setIsRegenerating] = useState(false);
+  const [regenerationProgress, setRegenerationProgress] = useState<{ completed: number; total: number } | null>(null);
 
   // Load available disability types
   useEffect(() => {
@@ -100,10 +101,8 @@ const ContentPreview = () => {
     const loadAvailableContent = async () => {
       try {
         if (selectedContentType === 'hotel') {
-          const response = await cmsApi.getHotels();
-          if (response.success) {
-            setAvailableContent(response.hotels);
-          }
+          // A single page holds at most 100 hotels by default, so fetch them all
+          setAvailableContent(await cmsApi.getAllHotels(['name', 'location']));
         }
         // Add similar logic for tours and care services when you have list endpoints
       } catch (error) {
@@ -156,11 +155,17 @@ const ContentPreview = () => {
     if (!selectedContentId || !selectedDisabilityType) return;
     
     setIsRegenerating(true);
+    setRegenerationProgress(null);
     try {
-      const response = await cmsApi.regenerateAdaptiveContent(
+      const response = await cmsApi.regenerateAdaptiveContentStream(
         selectedContentType,
         selectedContentId,
-        selectedDisabilityType
+        selectedDisabilityType,
+        (event) => {
+          if (event.type === 'field') {
+            setRegenerationProgress({ completed: event.data.completed, total: event.data.total });
+          }
+        }
       );
       
       if (response.success) {
@@ -180,6 +185,7 @@ const ContentPreview = () => {
       });
     } finally {
       setIsRegenerating(false);
+      setRegenerationProgress(null);
     }
   };
 
@@ -491,7 +497,11 @@ const ContentPreview = () => {
                 ) : (
                   <Bot className="h-4 w-4 mr-2" />
                 )}
-                {isRegenerating ? 'Regenerating...' : 'Regenerate AI'}
+                {isRegenerating
+                  ? regenerationProgress
+                    ? `Regenerating... ${regenerationProgress.completed}/${regenerationProgress.total}`
+                    : 'Regenerating...'
+                  : 'Regenerate AI'}
               </Button>
             </div>
           </div>
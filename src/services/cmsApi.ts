@@ -53,6 +53,31 @@ export interface ApiResponse<T> {
   [key: string]: any;
 }
 
+export interface ListPageParams {
+  limit?: number;
+  afterId?: number;
+  fields?: string[];
+}
+
+// Largest page the list endpoints serve (LIST_MAX_LIMIT on the backend)
+const LIST_MAX_LIMIT = 500;
+
+const listQuery = ({ limit, afterId, fields }: ListPageParams): string => {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (afterId) params.set('after_id', String(afterId));
+  if (fields?.length) params.set('fields', fields.join(','));
+  const query = params.toString();
+  return query ? `?${query}` : '';
+};
+
+export type RegenerationStreamEvent =
+  | { type: 'start'; data: { content_id: number; disability_type: string; content_structure: string } }
+  | { type: 'token'; data: { text: string } }
+  | { type: 'field'; data: { field: string; completed: number; total: number } }
+  | { type: 'result'; data: ApiResponse<{ content: any }> }
+  | { type: 'error'; data: { success: false; error: string } };
+
 class CMSApiService {
   private async request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
     const url = `${API_BASE_URL}${endpoint}`;
@@ -88,15 +113,34 @@ class CMSApiService {
     });
   }
 
-  async getHotels(): Promise<ApiResponse<{ hotels: any[] }>> {
-    return this.request('/hotels');
+  async getHotels(page: ListPageParams = {}): Promise<ApiResponse<{ hotels: any[]; has_more: boolean; next_after_id: number | null }>> {
+    return this.request(`/hotels${listQuery(page)}`);
+  }
+
+  // All hotels, following next_after_id page by page
+  async getAllHotels(fields?: string[]): Promise<any[]> {
+    const hotels: any[] = [];
+    let afterId: number | undefined;
+    do {
+      const response = await this.getHotels({ limit: LIST_MAX_LIMIT, afterId, fields });
+      hotels.push(...response.hotels);
+      afterId = response.has_more && response.next_after_id !== null ? response.next_after_id : undefined;
+    } while (afterId !== undefined);
+    return hotels;
   }
 
   async getHotel(hotelId: number, disabilityType?: string): Promise<ApiResponse<{ hotel: any }>> {
-    const params = disabilityType ? `?disability_type=${disabilityType}` : '';
+    const params = disabilityType ? `?disability_type=${encodeURIComponent(disabilityType)}` : '';
     return this.request(`/hotels/${hotelId}${params}`);
   }
 
+  async updateHotel(hotelId: number, changes: Partial<HotelContent>): Promise<ApiResponse<{ hotel_id: number; changed_fields: string[] }>> {
+    return this.request(`/hotels/${hotelId}`, {
+      method: 'PATCH',
+      body: JSON.stringify(changes),
+    });
+  }
+
   // Tour APIs
   async createTour(tourData: TourContent): Promise<ApiResponse<{ tour_id: number }>> {
     return this.request('/tours', {
@@ -106,10 +150,17 @@ class CMSApiService {
   }
 
   async getTour(tourId: number, disabilityType?: string): Promise<ApiResponse<{ tour: any }>> {
-    const params = disabilityType ? `?disability_type=${disabilityType}` : '';
+    const params = disabilityType ? `?disability_type=${encodeURIComponent(disabilityType)}` : '';
     return this.request(`/tours/${tourId}${params}`);
   }
 
+  async updateTour(tourId: number, changes: Partial<TourContent>): Promise<ApiResponse<{ tour_id: number; changed_fields: string[] }>> {
+    return this.request(`/tours/${tourId}`, {
+      method: 'PATCH',
+      body: JSON.stringify(changes),
+    });
+  }
+
   // Care Service APIs
   async createCareService(serviceData: CareServiceContent): Promise<ApiResponse<{ service_id: number }>> {
     return this.request('/care-services', {
@@ -119,10 +170,17 @@ class CMSApiService {
   }
 
   async getCareService(serviceId: number, disabilityType?: string): Promise<ApiResponse<{ service: any }>> {
-    const params = disabilityType ? `?disability_type=${disabilityType}` : '';
+    const params = disabilityType ? `?disability_type=${encodeURIComponent(disabilityType)}` : '';
     return this.request(`/care-services/${serviceId}${params}`);
   }
 
+  async updateCareService(serviceId: number, changes: Partial<CareServiceContent>): Promise<ApiResponse<{ service_id: number; changed_fields: string[] }>> {
+    return this.request(`/care-services/${serviceId}`, {
+      method: 'PATCH',
+      body: JSON.stringify(changes),
+    });
+  }
+
   // Utility APIs
   async getDisabilityTypes(): Promise<ApiResponse<{ disability_types: string[]; descriptions: Record<string, string> }>> {
     return this.request('/disability-types');
@@ -139,6 +197,21 @@ class CMSApiService {
     });
   }
 
+  async searchContent(
+    query: string,
+    options: { contentType?: string; disabilityType?: string; limit?: number } = {}
+  ): Promise<ApiResponse<{ results: any[] }>> {
+    const params = new URLSearchParams({ q: query });
+    if (options.contentType) params.set('type', options.contentType);
+    if (options.disabilityType) params.set('disability_type', options.disabilityType);
+    if (options.limit) params.set('limit', String(options.limit));
+    return this.request(`/search?${params.toString()}`);
+  }
+
+  async getJob(jobId: number): Promise<ApiResponse<{ job: any }>> {
+    return this.request(`/jobs/${jobId}`);
+  }
+
   async regenerateAdaptiveContent(
     contentType: string, 
     contentId: number, 
@@ -149,6 +222,59 @@ class CMSApiService {
       body: JSON.stringify({ disability_type: disabilityType }),
     });
   }
+
+  // Streams the regeneration as Server-Sent Events (token, field, result, error)
+  async regenerateAdaptiveContentStream(
+    contentType: string,
+    contentId: number,
+    disabilityType: string,
+    onEvent: (event: RegenerationStreamEvent) => void
+  ): Promise<ApiResponse<{ content: any }>> {
+    const url = `${API_BASE_URL}/regenerate-content/${contentType}/${contentId}?stream=1`;
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+      },
+      body: JSON.stringify({ disability_type: disabilityType }),
+    });
+
+    if (!response.ok || !response.body) {
+      const data = await response.json().catch(() => ({}));
+      throw new Error(data.error || `HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result: ApiResponse<{ content: any }> | null = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const message = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const type = message.match(/^event: (.*)$/m)?.[1];
+        const data = message.match(/^data: (.*)$/m)?.[1];
+        if (!type || !data) continue;
+
+        const event = { type, data: JSON.parse(data) } as RegenerationStreamEvent;
+        onEvent(event);
+        if (event.type === 'result') result = event.data;
+        if (event.type === 'error') throw new Error(event.data.error || 'Regeneration failed');
+      }
+    }
+
+    if (!result) throw new Error('Stream ended before a result was received');
+    return result;
+  }
 }
 
 // Enhanced AI prompts addressing specific accessibility pain points
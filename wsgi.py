@@ -0,0 +1,18 @@
+"""
+Production entry point for the CMS backend.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Defaults to the production serving profile (SQLite WAL, tuned pragmas, pooled
+connections; see CMS_ENV in cms_backend_v2.py). Pending schema migrations run
+on start-up (a single version check when the schema is current); existing data
+is never dropped.
+"""
+import os
+
+os.environ.setdefault('CMS_ENV', 'production')
+
+from cms_backend_v2 import app, migrate_schema  # noqa: E402
+
+with app.app_context():
+    migrate_schema()